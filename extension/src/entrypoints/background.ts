@@ -17,10 +17,10 @@ import {
   Workflow,
 } from "../lib/workflow-types";
 import {
+  HttpDomSnapshotEvent,
   HttpEvent,
   HttpRecordingStartedEvent,
   HttpRecordingStoppedEvent,
-  HttpWorkflowUpdateEvent,
 } from "../lib/message-bus-types";
 
 export default defineBackground(() => {
@@ -31,36 +31,100 @@ export default defineBackground(() => {
   const tabInfo: { [tabId: number]: { url?: string; title?: string } } = {};
 
   let isRecordingEnabled = true; // Default to disabled (OFF)
-  let lastWorkflowHash: string | null = null; // Cache for the last logged workflow hash
+  const sentSnapshotHashes = new Set<string>(); // DOM snapshots already sent to the Python server
+  let recordingStartedAt = new Date();
+
+  // Workflow state the Python server has, as JSON per step (null until the whole workflow is sent)
+  let sentSteps: string[] | null = null;
+  let sentMetadata: string | null = null;
+  let lastSeq = 0; // Sequence number of the last workflow event
+  let lastFullUpdateSeq = 0; // Sequence number of the last WORKFLOW_UPDATE
+  let sendQueue: Promise<void> = Promise.resolve();
 
   const PYTHON_SERVER_ENDPOINT = "http://127.0.0.1:7331/event";
 
-  // Hashing function using SubtleCrypto (SHA-256)
-  async function calculateSHA256(str: string): Promise<string> {
-    const encoder = new TextEncoder();
-    const data = encoder.encode(str);
-    const hashBuffer = await crypto.subtle.digest("SHA-256", data);
-    const hashArray = Array.from(new Uint8Array(hashBuffer));
-    const hashHex = hashArray
-      .map((b) => b.toString(16).padStart(2, "0"))
-      .join("");
-    return hashHex;
+  // Helper function to send data to the Python server. Events are posted one at a time so
+  // the server receives the sequenced workflow events in order.
+  function sendEventToServer(eventData: HttpEvent) {
+    // Only events sent after the last whole workflow can make the server state stale
+    const needsResync = () =>
+      "seq" in eventData && eventData.seq >= lastFullUpdateSeq;
+    sendQueue = sendQueue.then(async () => {
+      try {
+        const response = await fetch(PYTHON_SERVER_ENDPOINT, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify(eventData),
+        });
+        const result = response.ok ? await response.json() : null;
+        if (result?.status === "resync" && needsResync()) {
+          // The server lost an event, send it the whole workflow now
+          sentSteps = null;
+          broadcastWorkflowDataUpdate();
+        } else if (!response.ok && needsResync()) {
+          sentSteps = null; // Resend the whole workflow with the next update
+        }
+      } catch (error) {
+        console.warn(
+          `Failed to send event to Python server at ${PYTHON_SERVER_ENDPOINT}:`,
+          error
+        );
+        if (needsResync()) {
+          sentSteps = null;
+        }
+      }
+    });
   }
 
-  // Helper function to send data to the Python server
-  async function sendEventToServer(eventData: HttpEvent) {
-    try {
-      await fetch(PYTHON_SERVER_ENDPOINT, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(eventData),
+  // Send the server only what changed since the last update: new steps, replaced steps
+  // (e.g. keystrokes merged into an input step) and a patch for metadata or removed steps
+  function sendWorkflowChanges(workflowData: Workflow) {
+    const { steps, ...metadata } = workflowData;
+    const stepStrings = steps.map((step) => JSON.stringify(step));
+    const metadataString = JSON.stringify(metadata);
+    const previousSteps = sentSteps;
+
+    if (previousSteps === null) {
+      if (steps.length === 0) return; // The server only accepts workflows with steps
+      lastFullUpdateSeq = ++lastSeq;
+      sendEventToServer({
+        type: "WORKFLOW_UPDATE",
+        timestamp: Date.now(),
+        seq: lastFullUpdateSeq,
+        payload: workflowData,
+      });
+    } else {
+      if (
+        metadataString !== sentMetadata ||
+        stepStrings.length < previousSteps.length
+      ) {
+        sendEventToServer({
+          type: "WORKFLOW_PATCH",
+          timestamp: Date.now(),
+          seq: ++lastSeq,
+          payload: { ...metadata, step_count: steps.length },
+        });
+      }
+      stepStrings.forEach((stepString, index) => {
+        if (index >= previousSteps.length) {
+          sendEventToServer({
+            type: "STEP_APPEND",
+            timestamp: Date.now(),
+            seq: ++lastSeq,
+            payload: steps[index],
+          });
+        } else if (stepString !== previousSteps[index]) {
+          sendEventToServer({
+            type: "STEP_REPLACE",
+            timestamp: Date.now(),
+            seq: ++lastSeq,
+            payload: { index, step: steps[index] },
+          });
+        }
       });
-    } catch (error) {
-      console.warn(
-        `Failed to send event to Python server at ${PYTHON_SERVER_ENDPOINT}:`,
-        error
-      );
     }
+    sentSteps = stepStrings;
+    sentMetadata = metadataString;
   }
 
   // Function to broadcast workflow data updates to the console bus
@@ -73,36 +137,17 @@ export default defineBackground(() => {
       })
       .sort((a, b) => a.timestamp - b.timestamp); // Sort chronologically
 
-    // Create the workflowData object *after* sorting steps, but hash only steps
+    // Create the workflowData object *after* sorting steps
     const workflowData: Workflow = {
       name: "Recorded Workflow",
-      description: `Recorded on ${new Date().toLocaleString()}`,
+      description: `Recorded on ${recordingStartedAt.toLocaleString()}`,
       version: "1.0.0",
       input_schema: [],
       steps: allSteps, // allSteps is used here
     };
 
-    const allStepsString = JSON.stringify(allSteps); // Hash based on allSteps
-    const currentWorkflowHash = await calculateSHA256(allStepsString);
-
-    // console.log("[DEBUG] broadcastWorkflowDataUpdate: Current steps hash:", currentWorkflowHash, "Last steps hash:", lastWorkflowHash); // Optional
-
-    // Condition to skip logging if the hash of steps is the same
-    if (lastWorkflowHash !== null && currentWorkflowHash === lastWorkflowHash) {
-      // console.log("[DEBUG] broadcastWorkflowDataUpdate: Steps unchanged, skipping log."); // Optional
-      return workflowData;
-    }
-
-    lastWorkflowHash = currentWorkflowHash;
-    // console.log("[DEBUG] broadcastWorkflowDataUpdate: Steps changed, workflowData object:", JSON.parse(JSON.stringify(workflowData))); // Optional
-
-    // Send workflow update to Python server
-    const eventToSend: HttpWorkflowUpdateEvent = {
-      type: "WORKFLOW_UPDATE",
-      timestamp: Date.now(),
-      payload: workflowData,
-    };
-    sendEventToServer(eventToSend);
+    // Send the changes to the Python server (nothing when the steps are unchanged)
+    sendWorkflowChanges(workflowData);
     return workflowData;
   }
 
@@ -234,6 +279,8 @@ export default defineBackground(() => {
               frameUrl: clickEvent.frameUrl,
               xpath: clickEvent.xpath,
               cssSelector: clickEvent.cssSelector,
+              fallbackSelectors: clickEvent.fallbackSelectors,
+              domSnapshot: clickEvent.domSnapshot,
               elementTag: clickEvent.elementTag,
               elementText: clickEvent.elementText,
               screenshot: clickEvent.screenshot,
@@ -270,6 +317,8 @@ export default defineBackground(() => {
               (lastStep as InputStep).value = inputEvent.value;
               lastStep.timestamp = inputEvent.timestamp; // Update to latest timestamp
               (lastStep as InputStep).screenshot = inputEvent.screenshot; // Update to latest screenshot
+              // Later keystrokes carry no snapshot, keep the one taken before the first
+              (lastStep as InputStep).domSnapshot ??= inputEvent.domSnapshot;
             } else {
               // Add a new input step
               const newStep: InputStep = {
@@ -280,6 +329,8 @@ export default defineBackground(() => {
                 frameUrl: inputEvent.frameUrl,
                 xpath: inputEvent.xpath,
                 cssSelector: inputEvent.cssSelector,
+                fallbackSelectors: inputEvent.fallbackSelectors,
+                domSnapshot: inputEvent.domSnapshot,
                 elementTag: inputEvent.elementTag,
                 value: inputEvent.value,
                 screenshot: inputEvent.screenshot,
@@ -306,6 +357,8 @@ export default defineBackground(() => {
               key: keyEvent.key,
               xpath: keyEvent.xpath,
               cssSelector: keyEvent.cssSelector,
+              fallbackSelectors: keyEvent.fallbackSelectors,
+              domSnapshot: keyEvent.domSnapshot,
               elementTag: keyEvent.elementTag,
               screenshot: keyEvent.screenshot,
             };
@@ -427,8 +480,23 @@ export default defineBackground(() => {
           tabInfo[tabId].title = sender.tab.title;
         }
 
+        // Snapshots are content-addressed: send each one once, steps only keep the hash
+        const domSnapshot = eventPayload.domSnapshot as
+          | { hash: string; data?: string }
+          | undefined;
+        if (domSnapshot?.data && !sentSnapshotHashes.has(domSnapshot.hash)) {
+          sentSnapshotHashes.add(domSnapshot.hash);
+          const snapshotEvent: HttpDomSnapshotEvent = {
+            type: "DOM_SNAPSHOT",
+            timestamp: Date.now(),
+            payload: { hash: domSnapshot.hash, data: domSnapshot.data },
+          };
+          sendEventToServer(snapshotEvent);
+        }
+
         const eventWithMeta = {
           ...eventPayload,
+          domSnapshot: domSnapshot?.hash,
           tabId: tabId,
           messageType: message.type,
           screenshot: screenshotDataUrl,
@@ -491,6 +559,9 @@ export default defineBackground(() => {
         (key) => delete sessionLogs[parseInt(key)]
       );
       Object.keys(tabInfo).forEach((key) => delete tabInfo[parseInt(key)]);
+      sentSnapshotHashes.clear();
+      sentSteps = null; // The new recording starts with the whole workflow
+      recordingStartedAt = new Date();
       console.log("Cleared previous recording data.");
 
       // Start recording
@@ -111,6 +111,202 @@ function getEnhancedCSSSelector(element: HTMLElement, xpath: string): string {
   }
 }
 
+// --- Helper function to generate a minimal unique CSS Selector ---
+// Attributes that identify an element independently of its styling, most stable first
+const MINIMAL_SELECTOR_ATTRIBUTES = [
+  "data-testid",
+  "data-test",
+  "data-qa",
+  "data-cy",
+  "data-id",
+  "name",
+  "aria-label",
+  "placeholder",
+  "title",
+  "alt",
+  "for",
+  "href",
+];
+const MAX_ATTRIBUTE_VALUE_LENGTH = 80;
+const MAX_ANCESTOR_DEPTH = 4;
+
+// Generated ids (React useId, Radix, Ember, long numbers...) change between page loads
+function isStableId(id: string): boolean {
+  return (
+    /^[A-Za-z][\w-]*$/.test(id) &&
+    !/\d{4,}/.test(id) &&
+    !/^(ember|react|radix|headlessui|mui|rc_|:r)/i.test(id)
+  );
+}
+
+function isUniqueMatch(selector: string, element: Element): boolean {
+  try {
+    const matches = document.querySelectorAll(selector);
+    return matches.length === 1 && matches[0] === element;
+  } catch (e) {
+    return false; // Not a valid selector
+  }
+}
+
+// Selectors identifying the element on its own, in order of preference
+function ownSelectorCandidates(element: Element): string[] {
+  const tag = element.tagName.toLowerCase();
+  const candidates: string[] = [];
+  if (element.id && isStableId(element.id)) {
+    candidates.push(`#${CSS.escape(element.id)}`);
+  }
+  for (const attr of MINIMAL_SELECTOR_ATTRIBUTES) {
+    const value = element.getAttribute(attr);
+    if (!value || value.length > MAX_ATTRIBUTE_VALUE_LENGTH) continue;
+    const attrSelector = `[${attr}="${CSS.escape(value)}"]`;
+    candidates.push(attrSelector, `${tag}${attrSelector}`);
+  }
+  const type = element.getAttribute("type");
+  const name = element.getAttribute("name");
+  if (type && name) {
+    candidates.push(
+      `${tag}[type="${CSS.escape(type)}"][name="${CSS.escape(name)}"]`
+    );
+  }
+  return candidates;
+}
+
+function nthOfType(element: Element): string {
+  const tag = element.tagName.toLowerCase();
+  const parent = element.parentElement;
+  if (!parent) return tag;
+  const sameTag = Array.from(parent.children).filter(
+    (sibling) => sibling.tagName === element.tagName
+  );
+  return sameTag.length === 1
+    ? tag
+    : `${tag}:nth-of-type(${sameTag.indexOf(element) + 1})`;
+}
+
+// Short selector matching only *element* in the current document, or null when
+// neither the element nor one of its close ancestors has a stable identifying attribute
+function getMinimalCSSSelector(element: Element): string | null {
+  try {
+    for (const candidate of ownSelectorCandidates(element)) {
+      if (isUniqueMatch(candidate, element)) return candidate;
+    }
+    // Anchor a short structural path on the closest uniquely identifiable ancestor
+    let path = nthOfType(element);
+    let ancestor = element.parentElement;
+    for (
+      let depth = 0;
+      ancestor && ancestor !== document.body && depth < MAX_ANCESTOR_DEPTH;
+      depth++
+    ) {
+      for (const anchor of ownSelectorCandidates(ancestor)) {
+        if (!isUniqueMatch(anchor, ancestor)) continue;
+        const candidate = `${anchor} > ${path}`;
+        if (isUniqueMatch(candidate, element)) return candidate;
+      }
+      path = `${nthOfType(ancestor)} > ${path}`;
+      ancestor = ancestor.parentElement;
+    }
+  } catch (error) {
+    console.error("Error generating minimal CSS selector:", error);
+  }
+  return null;
+}
+
+// Recorded selector plus the full attribute/class selector it replaces, kept as a fallback
+function getSelectors(
+  element: HTMLElement,
+  xpath: string
+): { cssSelector: string; fallbackSelectors?: string[] } {
+  const enhanced = getEnhancedCSSSelector(element, xpath);
+  const minimal = getMinimalCSSSelector(element);
+  if (!minimal || minimal === enhanced) {
+    return { cssSelector: enhanced };
+  }
+  return { cssSelector: minimal, fallbackSelectors: [enhanced] };
+}
+// --- End Minimal CSS Selector Helper ---
+
+// --- DOM Snapshot Capture ---
+// Snapshots let recorded selectors be validated offline. They are content-addressed
+// (SHA-256 of the HTML), gzipped, and only sent the first time a hash is seen.
+const SNAPSHOT_EMPTIED_TAGS = "script, style, noscript, template";
+let domDirty = true;
+let lastSnapshotHash: string | null = null;
+let lastInputTarget: EventTarget | null = null;
+const domObserver = new MutationObserver(() => {
+  domDirty = true;
+});
+// Custom events are sent in order, even though encoding a snapshot is async
+let customEventQueue: Promise<void> = Promise.resolve();
+
+// Serialize the DOM as it is right now (before the event's default action changes it),
+// or return null when it did not change since the last snapshot
+function takeDomSnapshot(): string | null {
+  if (!domDirty && lastSnapshotHash !== null) return null;
+  domDirty = false;
+  const clone = document.documentElement.cloneNode(true) as HTMLElement;
+  clone
+    .querySelectorAll(SNAPSHOT_EMPTIED_TAGS)
+    .forEach((element) => element.replaceChildren());
+  return `<!DOCTYPE html>${clone.outerHTML}`;
+}
+
+async function sha256Hex(text: string): Promise<string> {
+  const digest = await crypto.subtle.digest(
+    "SHA-256",
+    new TextEncoder().encode(text)
+  );
+  return Array.from(new Uint8Array(digest))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+}
+
+async function gzipBase64(text: string): Promise<string> {
+  const stream = new Blob([text])
+    .stream()
+    .pipeThrough(new CompressionStream("gzip"));
+  const bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+  let binary = "";
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+  }
+  return btoa(binary);
+}
+
+async function encodeDomSnapshot(
+  html: string | null
+): Promise<{ hash: string; data?: string } | undefined> {
+  if (html === null) {
+    return lastSnapshotHash ? { hash: lastSnapshotHash } : undefined;
+  }
+  const hash = await sha256Hex(html);
+  if (hash === lastSnapshotHash) return { hash };
+  lastSnapshotHash = hash;
+  return { hash, data: await gzipBase64(html) };
+}
+
+// *html* is the result of takeDomSnapshot(), undefined to send the event without a snapshot
+function sendCustomEvent(
+  type: string,
+  payload: Record<string, unknown>,
+  html?: string | null
+) {
+  if (type !== "CUSTOM_INPUT_EVENT") lastInputTarget = null;
+  customEventQueue = customEventQueue.then(async () => {
+    let domSnapshot: { hash: string; data?: string } | undefined = undefined;
+    if (html !== undefined) {
+      try {
+        domSnapshot = await encodeDomSnapshot(html);
+      } catch (error) {
+        console.error("Error encoding DOM snapshot:", error);
+      }
+    }
+    console.log(`Sending ${type}:`, payload);
+    chrome.runtime.sendMessage({ type, payload: { ...payload, domSnapshot } });
+  });
+}
+// --- End DOM Snapshot Capture ---
+
 function startRecorder() {
   if (stopRecording) {
     console.log("Recorder already running.");
@@ -118,6 +314,13 @@ function startRecorder() {
   }
   console.log("Starting rrweb recorder for:", window.location.href);
   isRecordingActive = true;
+  domDirty = true;
+  domObserver.observe(document.documentElement, {
+    subtree: true,
+    childList: true,
+    attributes: true,
+    characterData: true,
+  });
   stopRecording = rrweb.record({
     emit(event) {
       if (!isRecordingActive) return;
@@ -219,6 +422,7 @@ function stopRecorder() {
     stopRecording();
     stopRecording = undefined;
     isRecordingActive = false;
+    domObserver.disconnect();
     (window as any).rrwebStop = undefined; // Clean up window property
     // Remove custom listeners when recording stops
     document.removeEventListener("click", handleCustomClick, true);
@@ -247,15 +451,11 @@ function handleCustomClick(event: MouseEvent) {
       url: document.location.href, // Use document.location for main page URL
       frameUrl: window.location.href, // URL of the frame where the event occurred
       xpath: xpath,
-      cssSelector: getEnhancedCSSSelector(targetElement, xpath),
+      ...getSelectors(targetElement, xpath),
       elementTag: targetElement.tagName,
       elementText: targetElement.textContent?.trim().slice(0, 200) || "",
     };
-    console.log("Sending CUSTOM_CLICK_EVENT:", clickData);
-    chrome.runtime.sendMessage({
-      type: "CUSTOM_CLICK_EVENT",
-      payload: clickData,
-    });
+    sendCustomEvent("CUSTOM_CLICK_EVENT", clickData, takeDomSnapshot());
   } catch (error) {
     console.error("Error capturing click data:", error);
   }
@@ -276,15 +476,15 @@ function handleInput(event: Event) {
       url: document.location.href,
       frameUrl: window.location.href,
       xpath: xpath,
-      cssSelector: getEnhancedCSSSelector(targetElement, xpath),
+      ...getSelectors(targetElement, xpath),
       elementTag: targetElement.tagName,
       value: isPassword ? "********" : targetElement.value,
     };
-    console.log("Sending CUSTOM_INPUT_EVENT:", inputData);
-    chrome.runtime.sendMessage({
-      type: "CUSTOM_INPUT_EVENT",
-      payload: inputData,
-    });
+    // Keystrokes on the same field are merged into one step, only the first one needs a snapshot
+    const html =
+      targetElement === lastInputTarget ? undefined : takeDomSnapshot();
+    lastInputTarget = targetElement;
+    sendCustomEvent("CUSTOM_INPUT_EVENT", inputData, html);
   } catch (error) {
     console.error("Error capturing input data:", error);
   }
@@ -306,16 +506,12 @@ function handleSelectChange(event: Event) {
       url: document.location.href,
       frameUrl: window.location.href,
       xpath: xpath,
-      cssSelector: getEnhancedCSSSelector(targetElement, xpath),
+      ...getSelectors(targetElement, xpath),
       elementTag: targetElement.tagName,
       selectedValue: targetElement.value,
       selectedText: selectedOption ? selectedOption.text : "", // Get selected option text
     };
-    console.log("Sending CUSTOM_SELECT_EVENT:", selectData);
-    chrome.runtime.sendMessage({
-      type: "CUSTOM_SELECT_EVENT",
-      payload: selectData,
-    });
+    sendCustomEvent("CUSTOM_SELECT_EVENT", selectData, takeDomSnapshot());
   } catch (error) {
     console.error("Error capturing select change data:", error);
   }
@@ -366,11 +562,15 @@ function handleKeydown(event: KeyboardEvent) {
     const targetElement = event.target as HTMLElement;
     let xpath = "";
     let cssSelector = "";
+    let fallbackSelectors: string[] | undefined = undefined;
     let elementTag = "document"; // Default if target is not an element
     if (targetElement && typeof targetElement.tagName === "string") {
       try {
         xpath = getXPath(targetElement);
-        cssSelector = getEnhancedCSSSelector(targetElement, xpath);
+        ({ cssSelector, fallbackSelectors } = getSelectors(
+          targetElement,
+          xpath
+        ));
         elementTag = targetElement.tagName;
       } catch (e) {
         console.error("Error getting selector for keydown target:", e);
@@ -385,13 +585,10 @@ function handleKeydown(event: KeyboardEvent) {
         key: keyToLog, // The key or combination pressed
         xpath: xpath, // XPath of the element in focus (if any)
         cssSelector: cssSelector, // CSS selector of the element in focus (if any)
+        fallbackSelectors: fallbackSelectors, // Full selector replaced by the minimal one (if any)
         elementTag: elementTag, // Tag name of the element in focus
       };
-      console.log("Sending CUSTOM_KEY_EVENT:", keyData);
-      chrome.runtime.sendMessage({
-        type: "CUSTOM_KEY_EVENT",
-        payload: keyData,
-      });
+      sendCustomEvent("CUSTOM_KEY_EVENT", keyData, takeDomSnapshot());
     } catch (error) {
       console.error("Error capturing keydown data:", error);
     }
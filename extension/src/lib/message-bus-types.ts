@@ -1,13 +1,52 @@
-import { Workflow } from "./workflow-types"; // Assuming Workflow is in this path
+import { Step, Workflow } from "./workflow-types"; // Assuming Workflow is in this path
 
 // Types for events sent via HTTP to the Python server
 
+// The whole workflow, sent to start the sequence and whenever the server lost an event
 export interface HttpWorkflowUpdateEvent {
   type: "WORKFLOW_UPDATE";
   timestamp: number;
+  seq: number;
   payload: Workflow;
 }
 
+// Step events carry consecutive sequence numbers so the server can detect lost events
+export interface HttpStepAppendEvent {
+  type: "STEP_APPEND";
+  timestamp: number;
+  seq: number;
+  payload: Step;
+}
+
+export interface HttpStepReplaceEvent {
+  type: "STEP_REPLACE";
+  timestamp: number;
+  seq: number;
+  payload: {
+    index: number;
+    step: Step;
+  };
+}
+
+export interface HttpWorkflowPatchEvent {
+  type: "WORKFLOW_PATCH";
+  timestamp: number;
+  seq: number;
+  payload: Partial<Omit<Workflow, "steps">> & {
+    step_count?: number; // Steps from this index on were removed
+  };
+}
+
+// Sent once per distinct DOM snapshot, steps reference it by hash
+export interface HttpDomSnapshotEvent {
+  type: "DOM_SNAPSHOT";
+  timestamp: number;
+  payload: {
+    hash: string; // SHA-256 of the snapshot HTML
+    data: string; // Base64 of the gzipped snapshot HTML
+  };
+}
+
 export interface HttpRecordingStartedEvent {
   type: "RECORDING_STARTED";
   timestamp: number;
@@ -33,8 +72,15 @@ export interface HttpRecordingStoppedEvent {
 //   };
 // }
 
-export type HttpEvent =
+export type HttpWorkflowChangeEvent =
   | HttpWorkflowUpdateEvent
+  | HttpStepAppendEvent
+  | HttpStepReplaceEvent
+  | HttpWorkflowPatchEvent;
+
+export type HttpEvent =
+  | HttpWorkflowChangeEvent
+  | HttpDomSnapshotEvent
   | HttpRecordingStartedEvent
   | HttpRecordingStoppedEvent;
 // | HttpTerminateCommandEvent; // Add other event types to the union if defined
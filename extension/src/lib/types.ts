@@ -4,6 +4,8 @@ export interface StoredCustomClickEvent {
   frameUrl: string;
   xpath: string;
   cssSelector?: string;
+  fallbackSelectors?: string[];
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the event happened
   elementTag: string;
   elementText: string;
   tabId: number;
@@ -17,6 +19,8 @@ export interface StoredCustomInputEvent {
   frameUrl: string;
   xpath: string;
   cssSelector?: string;
+  fallbackSelectors?: string[];
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the event happened
   elementTag: string;
   value: string;
   tabId: number;
@@ -30,6 +34,8 @@ export interface StoredCustomSelectEvent {
   frameUrl: string;
   xpath: string;
   cssSelector?: string;
+  fallbackSelectors?: string[];
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the event happened
   elementTag: string;
   selectedValue: string;
   selectedText: string;
@@ -45,6 +51,8 @@ export interface StoredCustomKeyEvent {
   key: string;
   xpath?: string; // XPath of focused element
   cssSelector?: string;
+  fallbackSelectors?: string[];
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the event happened
   elementTag?: string;
   tabId: number;
   messageType: "CUSTOM_KEY_EVENT";
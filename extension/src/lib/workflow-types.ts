@@ -35,6 +35,8 @@ export interface ClickStep extends BaseStep {
   frameUrl: string;
   xpath: string;
   cssSelector?: string; // Optional in source
+  fallbackSelectors?: string[]; // Full selector the minimal cssSelector replaced
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the step was recorded
   elementTag: string;
   elementText: string;
   screenshot?: string; // Optional in source
@@ -46,6 +48,8 @@ export interface InputStep extends BaseStep {
   frameUrl: string;
   xpath: string;
   cssSelector?: string; // Optional in source
+  fallbackSelectors?: string[]; // Full selector the minimal cssSelector replaced
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the step was recorded
   elementTag: string;
   value: string;
   screenshot?: string; // Optional in source
@@ -58,6 +62,8 @@ export interface KeyPressStep extends BaseStep {
   key: string;
   xpath?: string; // Optional in source
   cssSelector?: string; // Optional in source
+  fallbackSelectors?: string[]; // Full selector the minimal cssSelector replaced
+  domSnapshot?: string; // Content hash of the DOM snapshot taken when the step was recorded
   elementTag?: string; // Optional in source
   screenshot?: string; // Optional in source
 }
@@ -1,10 +1,20 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers import router
+from .routers import get_service, router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	yield
+	# Shut down pooled browsers together with the server
+	await get_service().close()
+
 
-app = FastAPI(title='Workflow Execution Service')
+app = FastAPI(title='Workflow Execution Service', lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -1,5 +1,6 @@
 import asyncio
 import uuid
+from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException
 
@@ -19,7 +20,9 @@ from .views import (
 router = APIRouter(prefix='/api/workflows')
 
 
+@lru_cache(maxsize=1)
 def get_service() -> WorkflowService:
+	# A single service instance keeps task tracking and the browser pool shared across requests
 	return WorkflowService()
 
 
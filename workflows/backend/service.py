@@ -1,14 +1,16 @@
 import asyncio
 import json
+import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import aiofiles
-from browser_use.browser.browser import Browser
 from langchain_openai import ChatOpenAI
 
 from workflow_use.controller.service import WorkflowController
+from workflow_use.pool.service import BrowserPool
+from workflow_use.pool.views import BrowserPoolConfig
 from workflow_use.workflow.service import Workflow
 
 from .views import (
@@ -38,7 +40,13 @@ class WorkflowService:
 			print(f'Error initializing LLM: {exc}. Ensure OPENAI_API_KEY is set.')
 			self.llm_instance = None
 
-		self.browser_instance = Browser()
+		# Concurrent executions each lease an isolated browser context from the pool
+		self.browser_pool = BrowserPool(
+			BrowserPoolConfig(
+				size=int(os.getenv('WORKFLOW_BROWSER_POOL_SIZE', '2')),
+				max_runs_per_browser=int(os.getenv('WORKFLOW_BROWSER_MAX_RUNS', '25')),
+			)
+		)
 		self.controller_instance = WorkflowController()
 
 		# In‑memory task tracking
@@ -46,6 +54,9 @@ class WorkflowService:
 		self.workflow_tasks: Dict[str, asyncio.Task] = {}
 		self.cancel_events: Dict[str, asyncio.Event] = {}
 
+	async def close(self) -> None:
+		await self.browser_pool.close()
+
 	async def _log_file_position(self) -> int:
 		log_file = self.log_dir / 'backend.log'
 		if not log_file.exists():
@@ -153,8 +164,11 @@ class WorkflowService:
 
 			workflow_path = self.tmp_dir / workflow_name
 			try:
-				self.workflow_obj = Workflow.load_from_file(
-					str(workflow_path), llm=self.llm_instance, browser=self.browser_instance, controller=self.controller_instance
+				workflow_obj = Workflow.load_from_file(
+					str(workflow_path),
+					llm=self.llm_instance,
+					controller=self.controller_instance,
+					browser_pool=self.browser_pool,
 				)
 			except Exception as e:
 				print(f'Error loading workflow: {e}')
@@ -167,7 +181,7 @@ class WorkflowService:
 				self.active_tasks[task_id].status = 'cancelled'
 				return
 
-			result = await self.workflow_obj.run(inputs, close_browser_at_end=True, cancel_event=cancel_event)
+			result = await workflow_obj.run(inputs, cancel_event=cancel_event)
 
 			if cancel_event.is_set():
 				await self._write_log(log_file, f'[{ts}] Workflow execution was cancelled\n')
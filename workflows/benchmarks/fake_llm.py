@@ -0,0 +1,63 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeChatModel(BaseChatModel):
+	"""
+	Deterministic chat model for offline benchmarks.
+
+	Answers with the first entry of ``responses`` whose key occurs in the prompt,
+	otherwise with a small JSON document derived from the prompt hash, after an
+	optional simulated latency.
+	"""
+
+	responses: Dict[str, str] = {}
+	latency_ms: float = 0.0
+	calls: int = 0
+
+	@property
+	def _llm_type(self) -> str:
+		return 'fake-benchmark'
+
+	@property
+	def _identifying_params(self) -> Dict[str, Any]:
+		return {'model_name': 'fake-benchmark', 'latency_ms': self.latency_ms}
+
+	def get_num_tokens(self, text: str) -> int:
+		return max(1, len(text) // 4)
+
+	def _respond(self, messages: List[BaseMessage]) -> str:
+		self.calls += 1
+		prompt = '\n'.join(str(message.content) for message in messages)
+		for key, response in self.responses.items():
+			if key in prompt:
+				return response
+		digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]
+		return json.dumps({'digest': digest, 'prompt_chars': len(prompt)})
+
+	def _generate(
+		self,
+		messages: List[BaseMessage],
+		stop: Optional[List[str]] = None,
+		run_manager: Optional[CallbackManagerForLLMRun] = None,
+		**kwargs: Any,
+	) -> ChatResult:
+		return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._respond(messages)))])
+
+	async def _agenerate(
+		self,
+		messages: List[BaseMessage],
+		stop: Optional[List[str]] = None,
+		run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+		**kwargs: Any,
+	) -> ChatResult:
+		if self.latency_ms:
+			await asyncio.sleep(self.latency_ms / 1000)
+		return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._respond(messages)))])
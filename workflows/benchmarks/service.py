@@ -0,0 +1,313 @@
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import psutil
+from browser_use.browser.profile import BrowserProfile
+
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.views import BenchmarkCase, BenchmarkReport, CaseResult, MetricChange
+from workflow_use.controller.service import WorkflowController
+from workflow_use.pool.service import BrowserPool
+from workflow_use.pool.views import BrowserPoolConfig
+from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.tracing.service import Tracer, use_tracer
+from workflow_use.workflow.service import Workflow
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+FORM_INPUTS = {
+	'first_name': 'Ada',
+	'middle_name': 'K',
+	'last_name': 'Lovelace',
+	'social_security_last4': '1234',
+}
+
+BENCHMARK_CASES: Dict[str, BenchmarkCase] = {
+	case.name: case
+	for case in (
+		BenchmarkCase(name='form', workflow_file='form.workflow.json', inputs=FORM_INPUTS),
+		# Same form, recorded against an older version of the page: every lookup needs a fallback selector
+		BenchmarkCase(name='form_stale_selectors', workflow_file='form_stale_selectors.workflow.json', inputs=FORM_INPUTS),
+		BenchmarkCase(name='extract', workflow_file='extract.workflow.json'),
+	)
+}
+
+# Metrics compared between reports, and whether a higher value is better
+COMPARED_METRICS: Dict[str, bool] = {
+	'mean_run_s': False,
+	'steps_per_s': True,
+	'selector_p50_ms': False,
+	'selector_p95_ms': False,
+	'selector_fallback_rate': False,
+	'agent_fallback_rate': False,
+	'peak_rss_mb': False,
+}
+
+
+# How often the memory of the benchmark process and its browser processes is sampled while a case runs
+RSS_SAMPLE_INTERVAL_S = 0.1
+
+
+def get_default_benchmark_dir() -> Path:
+	return Path('./tmp/benchmarks')
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+	def log_message(self, format: str, *args: Any) -> None:
+		pass
+
+
+@contextmanager
+def serve_fixtures(directory: Path = FIXTURES_DIR) -> Iterator[str]:
+	"""Serve the fixture pages from a local HTTP server on a free port and yield its base URL."""
+	server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=str(directory)))
+	thread = threading.Thread(target=server.serve_forever, name='benchmark-fixtures', daemon=True)
+	thread.start()
+	try:
+		yield f'http://127.0.0.1:{server.server_address[1]}'
+	finally:
+		server.shutdown()
+		server.server_close()
+
+
+def _percentile(values: Sequence[float], percentile: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+	return ordered[index]
+
+
+class RssSampler:
+	"""Samples the RSS of this process and of its child processes (the playwright driver and Chromium) in a thread.
+
+	The peaks only cover the time between :py:meth:`start` and :py:meth:`stop`, so every case reports its own.
+	"""
+
+	def __init__(self, interval_s: float = RSS_SAMPLE_INTERVAL_S) -> None:
+		self.interval_s = interval_s
+		self.peak_python_mb = 0.0
+		self.peak_browser_mb = 0.0
+		self.peak_total_mb = 0.0
+		self._process = psutil.Process()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def sample(self) -> None:
+		python_mb = self._process.memory_info().rss / (1024 * 1024)
+		browser_mb = 0.0
+		for child in self._process.children(recursive=True):
+			try:
+				browser_mb += child.memory_info().rss / (1024 * 1024)
+			except psutil.Error:
+				pass  # The process exited since it was listed
+		self.peak_python_mb = max(self.peak_python_mb, python_mb)
+		self.peak_browser_mb = max(self.peak_browser_mb, browser_mb)
+		self.peak_total_mb = max(self.peak_total_mb, python_mb + browser_mb)
+
+	def _run(self) -> None:
+		while not self._stop.wait(self.interval_s):
+			self.sample()
+
+	def start(self) -> None:
+		self.sample()
+		self._thread = threading.Thread(target=self._run, name='benchmark-rss', daemon=True)
+		self._thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+		self.sample()
+
+
+def _git_commit() -> Optional[str]:
+	try:
+		return subprocess.run(
+			['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+		).stdout.strip()
+	except Exception:
+		return None
+
+
+def summarize_case(
+	case: str,
+	tracers: List[Tracer],
+	run_times_s: List[float],
+	failed_runs: int,
+	llm_calls: int,
+	rss: Optional[RssSampler] = None,
+) -> CaseResult:
+	"""Compute the metrics of one case from the traces of its runs and the memory sampled while they ran."""
+	step_spans = [span for tracer in tracers for span in tracer.spans if span.category == 'step']
+	# A fused form fill covers several steps, one that fell back to per-step execution covers none
+	steps = sum(span.args.get('fused_steps', 1) for span in step_spans)
+	failed_steps = sum(1 for span in step_spans if 'error' in span.args)
+	probes = [span for tracer in tracers for span in tracer.spans if span.name == 'selector probe']
+	probe_ms = [span.duration_us / 1000 for span in probes]
+	# The recorded selector is always the first candidate (unless the selector cache promoted another one)
+	fallbacks = [span for span in probes if span.args.get('index') != 0]
+
+	total_time = sum(run_times_s)
+	return CaseResult(
+		case=case,
+		runs=len(run_times_s),
+		failed_runs=failed_runs,
+		steps=steps,
+		failed_steps=failed_steps,
+		run_times_s=[round(run_time, 4) for run_time in run_times_s],
+		mean_run_s=round(total_time / len(run_times_s), 4) if run_times_s else 0.0,
+		steps_per_s=round(steps / total_time, 3) if total_time else 0.0,
+		selector_lookups=len(probes),
+		selector_p50_ms=round(_percentile(probe_ms, 50), 3),
+		selector_p95_ms=round(_percentile(probe_ms, 95), 3),
+		selector_fallback_rate=round(len(fallbacks) / len(probes), 4) if probes else 0.0,
+		agent_fallback_rate=round(failed_steps / steps, 4) if steps else 0.0,
+		llm_calls=llm_calls,
+		peak_rss_mb=round(rss.peak_total_mb, 1) if rss else 0.0,
+		peak_python_rss_mb=round(rss.peak_python_mb, 1) if rss else 0.0,
+		peak_browser_rss_mb=round(rss.peak_browser_mb, 1) if rss else 0.0,
+	)
+
+
+class BenchmarkRunner:
+	"""
+	Runs the fixture workflows against a local HTTP server with a deterministic fake LLM,
+	so timings only depend on the engine (and the browser), not on the network or a model.
+
+	Agent fallbacks are disabled: the fake LLM cannot drive an agent, a step that would have
+	needed one fails its run and is reported in ``agent_fallback_rate`` instead.
+	"""
+
+	def __init__(self, runs: int = 3, cases: Sequence[str] | None = None, headless: bool = True) -> None:
+		unknown = [case for case in cases or [] if case not in BENCHMARK_CASES]
+		if unknown:
+			raise ValueError(f'Unknown benchmark case(s): {", ".join(unknown)}. Available: {", ".join(BENCHMARK_CASES)}')
+		self.runs = runs
+		self.cases = [BENCHMARK_CASES[case] for case in cases] if cases else list(BENCHMARK_CASES.values())
+		self.headless = headless
+
+	async def _run_case(self, case: BenchmarkCase, base_url: str, pool: BrowserPool) -> CaseResult:
+		schema = WorkflowDefinitionSchema.load_from_json(str(FIXTURES_DIR / case.workflow_file))
+		llm = FakeChatModel()
+		inputs = {**case.inputs, 'base_url': base_url}
+
+		tracers: List[Tracer] = []
+		run_times_s: List[float] = []
+		failed_runs = 0
+		rss = RssSampler()
+		rss.start()
+		try:
+			for run_index in range(self.runs):
+				workflow = Workflow(
+					schema,
+					# Caches would turn every run after the first one into a cache benchmark
+					controller=WorkflowController(use_selector_cache=False, use_extraction_cache=False),
+					llm=llm,
+					page_extraction_llm=llm,
+					fallback_to_agent=False,
+					browser_pool=pool,
+					self_heal='off',
+				)
+				tracer = Tracer(f'benchmark {case.name}')
+				start = time.perf_counter()
+				with use_tracer(tracer):
+					try:
+						await workflow.run(inputs)
+					except Exception as e:
+						failed_runs += 1
+						logger.warning(f'Benchmark case {case.name} run {run_index + 1} failed: {e}')
+				run_times_s.append(time.perf_counter() - start)
+				tracers.append(tracer)
+		finally:
+			rss.stop()
+
+		return summarize_case(case.name, tracers, run_times_s, failed_runs, llm.calls, rss)
+
+	async def run(self) -> BenchmarkReport:
+		pool = BrowserPool(BrowserPoolConfig(size=1), BrowserProfile(headless=self.headless))
+		results: List[CaseResult] = []
+		try:
+			with serve_fixtures() as base_url:
+				# Warm up the browser so the first case does not pay for launching Chromium
+				async with pool.lease():
+					pass
+				for case in self.cases:
+					logger.info(f'Running benchmark case {case.name} ({self.runs} runs)')
+					results.append(await self._run_case(case, base_url, pool))
+		finally:
+			await pool.close()
+
+		return BenchmarkReport(
+			created_at=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+			git_commit=_git_commit(),
+			python_version=platform.python_version(),
+			platform=platform.platform(),
+			runs_per_case=self.runs,
+			cases=results,
+		)
+
+
+def run_benchmarks(runs: int = 3, cases: Sequence[str] | None = None, headless: bool = True) -> BenchmarkReport:
+	return asyncio.run(BenchmarkRunner(runs=runs, cases=cases, headless=headless).run())
+
+
+def save_report(report: BenchmarkReport, path: str | Path | None = None) -> Path:
+	"""Write *report* as JSON, by default to ``./tmp/benchmarks/<timestamp>-<commit>.json``."""
+	if path is None:
+		stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+		path = get_default_benchmark_dir() / f'{stamp}-{report.git_commit or "nogit"}.json'
+	path = Path(path)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_text(report.model_dump_json(indent=2), encoding='utf-8')
+	return path
+
+
+def load_report(path: str | Path) -> BenchmarkReport:
+	return BenchmarkReport.model_validate(json.loads(Path(path).read_text(encoding='utf-8')))
+
+
+def compare_reports(baseline: BenchmarkReport, current: BenchmarkReport, threshold: float = 0.1) -> List[MetricChange]:
+	"""Compare the metrics of the cases present in both reports.
+
+	A change is flagged as a regression when the metric got worse by more than *threshold* (relative).
+	"""
+	baseline_cases = {case.case: case for case in baseline.cases}
+	changes: List[MetricChange] = []
+	for case in current.cases:
+		previous = baseline_cases.get(case.case)
+		if previous is None:
+			continue
+		for metric, higher_is_better in COMPARED_METRICS.items():
+			old, new = getattr(previous, metric), getattr(case, metric)
+			if old == new:
+				change = 0.0
+			elif old == 0:
+				change = float('inf') if new > old else float('-inf')
+			else:
+				change = (new - old) / abs(old)
+			worse = -change if higher_is_better else change
+			changes.append(
+				MetricChange(
+					case=case.case,
+					metric=metric,
+					baseline=old,
+					current=new,
+					change_pct=round(change * 100, 1) if abs(change) != float('inf') else change,
+					regression=worse > threshold,
+				)
+			)
+	return changes
@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BenchmarkCase(BaseModel):
+	"""A fixture workflow and the inputs it is run with (``{base_url}`` is filled in by the runner)."""
+
+	name: str
+	workflow_file: str
+	inputs: Dict[str, Any] = Field(default_factory=dict)
+
+
+class CaseResult(BaseModel):
+	case: str
+	runs: int
+	failed_runs: int = 0
+	steps: int = Field(default=0, description='Steps executed over all runs (including failed ones).')
+	failed_steps: int = 0
+	run_times_s: List[float] = Field(default_factory=list)
+	mean_run_s: float = 0.0
+	steps_per_s: float = 0.0
+	selector_lookups: int = 0
+	selector_p50_ms: float = 0.0
+	selector_p95_ms: float = 0.0
+	selector_fallback_rate: float = Field(default=0.0, description='Share of lookups not resolved by the recorded selector.')
+	agent_fallback_rate: float = Field(
+		default=0.0,
+		description='Share of steps that failed deterministically and would have needed the agent '
+		'(the fake LLM cannot drive an agent, so fallbacks are disabled and counted instead).',
+	)
+	llm_calls: int = 0
+	peak_rss_mb: float = Field(
+		default=0.0, description='Peak RSS of the benchmark process plus its browser processes, sampled while this case ran.'
+	)
+	peak_python_rss_mb: float = Field(default=0.0, description='Peak RSS of the benchmark (Python) process while this case ran.')
+	peak_browser_rss_mb: float = Field(
+		default=0.0, description='Peak summed RSS of the child processes (playwright driver and Chromium) while this case ran.'
+	)
+
+
+class BenchmarkReport(BaseModel):
+	created_at: str
+	git_commit: Optional[str] = None
+	python_version: str
+	platform: str
+	runs_per_case: int
+	cases: List[CaseResult]
+
+
+class MetricChange(BaseModel):
+	case: str
+	metric: str
+	baseline: float
+	current: float
+	change_pct: float
+	regression: bool
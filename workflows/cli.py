@@ -8,15 +8,25 @@ from pathlib import Path
 
 import typer
 from browser_use import Browser
+from browser_use.browser.profile import BrowserProfile
 
 # Assuming OPENAI_API_KEY is set in the environment
 from langchain_openai import ChatOpenAI
 from patchright.async_api import async_playwright as patchright_async_playwright
 
+from workflow_use.batch.service import BatchRunner, load_batch_inputs
 from workflow_use.builder.service import BuilderService
+from workflow_use.cache.service import BuildCache
+from workflow_use.checkpoint.service import CheckpointStore
 from workflow_use.controller.service import WorkflowController
+from workflow_use.controller.utils import truncate_selector
+from workflow_use.daemon.service import BrowserDaemon, daemon_browser_pool, stop_daemon
+from workflow_use.healing.service import PatchStore, apply_stored_patches
 from workflow_use.mcp.service import get_mcp_server
+from workflow_use.optimizer.service import AGGRESSIVE_RULES, DEFAULT_RULES, optimize_workflow
 from workflow_use.recorder.service import RecordingService  # Added import
+from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.snapshot.service import SnapshotStore, validate_workflow_selectors
 from workflow_use.workflow.service import Workflow
 
 # Placeholder for recorder functionality
@@ -62,6 +72,11 @@ def _build_and_save_workflow_from_recording(
 	recording_path: Path,
 	default_save_dir: Path,
 	is_temp_recording: bool = False,  # To adjust messages if it's from a live recording
+	compile_extractions: bool = False,
+	segmented: bool = False,
+	prebuild: bool = True,
+	use_cache: bool = False,
+	optimize: bool = True,
 ) -> Path | None:
 	"""Builds a workflow from a recording file, prompts for details, and saves it."""
 	if not builder_service:
@@ -71,6 +86,9 @@ def _build_and_save_workflow_from_recording(
 		)
 		return None
 
+	# The build cache stores the recorded values, it is only used when asked for
+	builder_service.build_cache = BuildCache() if use_cache else None
+
 	prompt_subject = 'recorded' if is_temp_recording else 'provided'
 	typer.echo()  # Add space
 	description: str = typer.prompt(typer.style(f'What is the purpose of this {prompt_subject} workflow?', bold=True))
@@ -95,6 +113,11 @@ def _build_and_save_workflow_from_recording(
 			builder_service.build_workflow_from_path(
 				recording_path,
 				description,
+				compile_extractions=compile_extractions,
+				segmented=segmented,
+				prebuild=prebuild,
+				use_cache=use_cache,
+				optimize=optimize,
 			)
 		)
 	except FileNotFoundError:
@@ -147,7 +170,31 @@ def _build_and_save_workflow_from_recording(
 	name='create-workflow',
 	help='Records a new browser interaction and then builds a workflow definition.',
 )
-def create_workflow():
+def create_workflow(
+	compile_extractions: bool = typer.Option(
+		False,
+		'--compile-extractions',
+		help='Compile page extraction steps into CSS selector extractions (no LLM at run time) using the recorded DOM.',
+	),
+	segmented: bool = typer.Option(
+		False, '--segmented', help='Split long recordings at navigations and build the parts concurrently.'
+	),
+	prebuild: bool = typer.Option(
+		True,
+		'--prebuild/--no-prebuild',
+		help='Convert recorded steps by rules and only ask the LLM for inputs and agent steps (--no-prebuild regenerates every step).',
+	),
+	use_cache: bool = typer.Option(
+		False,
+		'--cache/--no-cache',
+		help='Store builds in ./tmp/cache/builds.sqlite (recorded values included) and reuse the build of an unchanged recording, goal and settings.',
+	),
+	optimize: bool = typer.Option(
+		True,
+		'--optimize/--no-optimize',
+		help='Drop redundant steps (focus clicks, duplicate key presses, scroll noise...) from the recording and the built workflow.',
+	),
+):
 	"""
 	Guides the user through recording browser actions, then uses the helper
 	to build and save the workflow definition.
@@ -195,7 +242,16 @@ def create_workflow():
 			temp_recording_path = Path(tmp_file.name)
 
 		# Use the helper function to build and save
-		saved_path = _build_and_save_workflow_from_recording(temp_recording_path, default_tmp_dir, is_temp_recording=True)
+		saved_path = _build_and_save_workflow_from_recording(
+			temp_recording_path,
+			default_tmp_dir,
+			is_temp_recording=True,
+			compile_extractions=compile_extractions,
+			segmented=segmented,
+			prebuild=prebuild,
+			use_cache=use_cache,
+			optimize=optimize,
+		)
 		if not saved_path:
 			typer.secho(
 				'Failed to complete workflow creation after recording.',
@@ -222,6 +278,29 @@ def build_from_recording_command(
 		resolve_path=True,
 		help='Path to the existing recording JSON file.',
 	),
+	compile_extractions: bool = typer.Option(
+		False,
+		'--compile-extractions',
+		help='Compile page extraction steps into CSS selector extractions (no LLM at run time) using the recorded DOM.',
+	),
+	segmented: bool = typer.Option(
+		False, '--segmented', help='Split long recordings at navigations and build the parts concurrently.'
+	),
+	prebuild: bool = typer.Option(
+		True,
+		'--prebuild/--no-prebuild',
+		help='Convert recorded steps by rules and only ask the LLM for inputs and agent steps (--no-prebuild regenerates every step).',
+	),
+	use_cache: bool = typer.Option(
+		False,
+		'--cache/--no-cache',
+		help='Store builds in ./tmp/cache/builds.sqlite (recorded values included) and reuse the build of an unchanged recording, goal and settings.',
+	),
+	optimize: bool = typer.Option(
+		True,
+		'--optimize/--no-optimize',
+		help='Drop redundant steps (focus clicks, duplicate key presses, scroll noise...) from the recording and the built workflow.',
+	),
 ):
 	"""
 	Takes a path to a recording JSON file, prompts for workflow details,
@@ -236,7 +315,16 @@ def build_from_recording_command(
 	)
 	typer.echo()  # Add space
 
-	saved_path = _build_and_save_workflow_from_recording(recording_path, default_save_dir, is_temp_recording=False)
+	saved_path = _build_and_save_workflow_from_recording(
+		recording_path,
+		default_save_dir,
+		is_temp_recording=False,
+		compile_extractions=compile_extractions,
+		segmented=segmented,
+		prebuild=prebuild,
+		use_cache=use_cache,
+		optimize=optimize,
+	)
 	if not saved_path:
 		typer.secho(f'Failed to build workflow from {recording_path.name}.', fg=typer.colors.RED)
 		raise typer.Exit(code=1)
@@ -263,6 +351,9 @@ def run_as_tool_command(
 		help='Prompt for the LLM to reason about and execute the workflow.',
 		prompt=True,  # Prompts interactively if not provided
 	),
+	use_daemon: bool = typer.Option(
+		True, '--daemon/--no-daemon', help='Attach to a running browser-daemon instead of launching a browser.'
+	),
 ):
 	"""
 	Run the workflow and automatically parse the required variables from the input/prompt that the user provides.
@@ -279,9 +370,15 @@ def run_as_tool_command(
 	)
 	typer.echo()  # Add space
 
+	browser_pool = daemon_browser_pool() if use_daemon else None
+	if browser_pool is not None:
+		typer.echo(f'Attaching to browser daemon at {typer.style(browser_pool.cdp_url, fg=typer.colors.CYAN)}')
+
 	try:
 		# Pass llm_instance to ensure the workflow can use it if needed for as_tool() or run_with_prompt()
-		workflow_obj = Workflow.load_from_file(str(workflow_path), llm=llm_instance, page_extraction_llm=page_extraction_llm)
+		workflow_obj = Workflow.load_from_file(
+			str(workflow_path), llm=llm_instance, page_extraction_llm=page_extraction_llm, browser_pool=browser_pool
+		)
 	except Exception as e:
 		typer.secho(f'Error loading workflow: {e}', fg=typer.colors.RED)
 		raise typer.Exit(code=1)
@@ -290,8 +387,15 @@ def run_as_tool_command(
 	typer.echo()  # Add space
 	typer.echo(typer.style(f'Running workflow as tool with prompt: "{prompt}"', bold=True))
 
+	async def _run_as_tool() -> str:
+		try:
+			return await workflow_obj.run_as_tool(prompt)
+		finally:
+			if browser_pool is not None:
+				await browser_pool.close()
+
 	try:
-		result = asyncio.run(workflow_obj.run_as_tool(prompt))
+		result = asyncio.run(_run_as_tool())
 		typer.secho('\nWorkflow execution completed!', fg=typer.colors.GREEN, bold=True)
 		typer.echo(typer.style('Result:', bold=True))
 		# Ensure result is JSON serializable for consistent output
@@ -315,10 +419,47 @@ def run_workflow_command(
 		help='Path to the .workflow.json file.',
 		show_default=False,
 	),
+	self_heal: str = typer.Option(
+		'off',
+		'--self-heal',
+		help="What to do with successful agent fallbacks: 'off', 'propose' (store a patch) or 'apply' (also use stored patches).",
+	),
+	checkpoint: bool = typer.Option(
+		False,
+		'--checkpoint',
+		help='Save the run state after every step so a failed run can be continued with resume-workflow.',
+	),
+	trace: Path | None = typer.Option(
+		None,
+		'--trace',
+		help='Write timing spans of the run to this file as Chrome trace-event JSON (open it in https://ui.perfetto.dev).',
+	),
+	use_daemon: bool = typer.Option(
+		True, '--daemon/--no-daemon', help='Attach to a running browser-daemon instead of launching a browser.'
+	),
+	fuse_fills: bool = typer.Option(
+		False,
+		'--fuse-fills/--no-fuse-fills',
+		help='Fill runs of consecutive input/select steps in one in-page operation (script-set values, untrusted events).',
+	),
+	selector_cache: bool = typer.Option(
+		False,
+		'--selector-cache',
+		help='Remember which selector resolved each step in ./tmp/cache/selectors.sqlite and try it first next time.',
+	),
+	extraction_cache: bool = typer.Option(
+		False,
+		'--extraction-cache',
+		help='Store extract_page_content responses (page data included) in ./tmp/cache/extractions.sqlite for 7 days.',
+	),
 ):
 	"""
 	Loads and executes a workflow, prompting the user for required inputs.
 	"""
+	if self_heal not in ('off', 'propose', 'apply'):
+		typer.secho(f"Invalid --self-heal value: {self_heal!r} (expected 'off', 'propose' or 'apply')", fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+	browser_pool = daemon_browser_pool() if use_daemon else None
 
 	async def _run_workflow():
 		typer.echo(
@@ -329,16 +470,23 @@ def run_workflow_command(
 		try:
 			# Instantiate Browser and WorkflowController for the Workflow instance
 			# Pass llm_instance for potential agent fallbacks or agentic steps
-			playwright = await patchright_async_playwright().start()
-
-			browser = Browser(playwright=playwright)
-			controller_instance = WorkflowController()  # Add any necessary config if required
+			browser = None
+			if browser_pool is not None:
+				typer.echo(f'Attaching to browser daemon at {typer.style(browser_pool.cdp_url, fg=typer.colors.CYAN)}')
+			else:
+				playwright = await patchright_async_playwright().start()
+				browser = Browser(playwright=playwright)
+			controller_instance = WorkflowController(use_selector_cache=selector_cache, use_extraction_cache=extraction_cache)
 			workflow_obj = Workflow.load_from_file(
 				str(workflow_path),
 				browser=browser,
 				llm=llm_instance,
 				controller=controller_instance,
 				page_extraction_llm=page_extraction_llm,
+				self_heal=self_heal,  # type: ignore[arg-type]
+				checkpoint_store=CheckpointStore() if checkpoint else None,
+				browser_pool=browser_pool,
+				fuse_form_fills=fuse_fills,
 			)
 		except Exception as e:
 			typer.secho(f'Error loading workflow: {e}', fg=typer.colors.RED)
@@ -394,7 +542,7 @@ def run_workflow_command(
 		try:
 			# Call run on the Workflow instance
 			# close_browser_at_end=True is the default for Workflow.run, but explicit for clarity
-			result = await workflow_obj.run(inputs=inputs, close_browser_at_end=True)
+			result = await workflow_obj.run(inputs=inputs, close_browser_at_end=True, trace_path=trace)
 
 			typer.secho('\nWorkflow execution completed!', fg=typer.colors.GREEN, bold=True)
 			typer.echo(typer.style('Result:', bold=True))
@@ -406,11 +554,390 @@ def run_workflow_command(
 
 		except Exception as e:
 			typer.secho(f'Error running workflow: {e}', fg=typer.colors.RED)
+			if workflow_obj.run_id:
+				typer.echo(
+					f'Continue from the failed step with: {typer.style(f"python cli.py resume-workflow {workflow_path} {workflow_obj.run_id}", fg=typer.colors.CYAN)}'
+				)
 			raise typer.Exit(code=1)
+		finally:
+			if browser_pool is not None:
+				await browser_pool.close()
 
 	return asyncio.run(_run_workflow())
 
 
+@app.command(name='resume-workflow', help='Continues a checkpointed workflow run from its first incomplete step.')
+def resume_workflow_command(
+	workflow_path: Path = typer.Argument(
+		...,
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Path to the .workflow.json file the run was started from.',
+		show_default=False,
+	),
+	run_id: str = typer.Argument(..., help='Id of the run, printed when a checkpointed run fails.', show_default=False),
+	trace: Path | None = typer.Option(
+		None,
+		'--trace',
+		help='Write timing spans of the resumed run to this file as Chrome trace-event JSON.',
+	),
+	use_daemon: bool = typer.Option(
+		True, '--daemon/--no-daemon', help='Attach to a running browser-daemon instead of launching a browser.'
+	),
+):
+	"""
+	Restores inputs, context, step results and browser storage of a run and executes its remaining steps.
+	"""
+	browser_pool = daemon_browser_pool() if use_daemon else None
+
+	async def _resume_workflow():
+		browser = None
+		if browser_pool is not None:
+			typer.echo(f'Attaching to browser daemon at {typer.style(browser_pool.cdp_url, fg=typer.colors.CYAN)}')
+		else:
+			playwright = await patchright_async_playwright().start()
+			browser = Browser(playwright=playwright)
+		workflow_obj = Workflow.load_from_file(
+			str(workflow_path),
+			browser=browser,
+			llm=llm_instance,
+			controller=WorkflowController(),
+			page_extraction_llm=page_extraction_llm,
+			checkpoint_store=CheckpointStore(),
+			browser_pool=browser_pool,
+		)
+		try:
+			return await workflow_obj.resume(run_id, close_browser_at_end=True, trace_path=trace)
+		finally:
+			if browser_pool is not None:
+				await browser_pool.close()
+
+	typer.echo(typer.style(f'Resuming run {run_id}...', bold=True))
+	try:
+		result = asyncio.run(_resume_workflow())
+	except Exception as e:
+		typer.secho(f'Error resuming workflow: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	typer.secho('\nWorkflow execution completed!', fg=typer.colors.GREEN, bold=True)
+	typer.echo(f'{typer.style(str(len(result.step_results)), bold=True)} steps executed.')
+
+
+@app.command(name='run-batch', help='Runs an existing workflow once per row of a CSV/JSONL inputs file.')
+def run_batch_command(
+	workflow_path: Path = typer.Argument(
+		...,
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Path to the .workflow.json file.',
+		show_default=False,
+	),
+	inputs_path: Path = typer.Option(
+		...,
+		'--inputs',
+		'-i',
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='CSV (with header row) or JSONL file, one workflow input set per row.',
+	),
+	output_path: Path | None = typer.Option(
+		None,
+		'--output',
+		'-o',
+		help='JSONL file the per-row results are streamed to. Defaults to ./tmp/<workflow>.results.jsonl',
+	),
+	concurrency: int = typer.Option(4, '--concurrency', '-c', min=1, help='Number of parallel browser contexts.'),
+	retries: int = typer.Option(1, '--retries', '-r', min=0, help='How many times a failed row is retried.'),
+):
+	"""
+	Runs the workflow over every input row with bounded concurrency and streams the results to a JSONL file.
+	"""
+	try:
+		rows = load_batch_inputs(inputs_path)
+		runner = BatchRunner.load_from_file(
+			workflow_path,
+			concurrency=concurrency,
+			max_retries=retries,
+			llm=llm_instance,
+			page_extraction_llm=page_extraction_llm,
+		)
+	except Exception as e:
+		typer.secho(f'Error loading batch: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	if output_path is None:
+		output_path = get_default_save_dir() / f'{workflow_path.name.split(".")[0]}.results.jsonl'
+
+	typer.echo(
+		typer.style(f'Running {len(rows)} rows with concurrency {concurrency}...', bold=True)
+		+ f' Results: {typer.style(str(output_path.resolve()), fg=typer.colors.CYAN)}'
+	)
+
+	try:
+		summary = asyncio.run(runner.run(rows, output_path))
+	except Exception as e:
+		typer.secho(f'Error running batch: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	typer.secho('\nBatch execution completed!', fg=typer.colors.GREEN, bold=True)
+	typer.echo(
+		f'{typer.style(str(summary.succeeded), fg=typer.colors.GREEN, bold=True)} succeeded, '
+		f'{typer.style(str(summary.failed), fg=typer.colors.RED, bold=True)} failed, '
+		f'{typer.style(str(summary.invalid), fg=typer.colors.YELLOW, bold=True)} invalid '
+		f'({summary.retries} retries) in {summary.elapsed_s:.1f}s - {summary.rows_per_minute:.1f} rows/min'
+	)
+	if summary.failed or summary.invalid:
+		raise typer.Exit(code=1)
+
+
+@app.command(name='apply-patches', help='Applies the self-healing patches stored for a workflow to its JSON file.')
+def apply_patches_command(
+	workflow_path: Path = typer.Argument(
+		...,
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Path to the .workflow.json file.',
+		show_default=False,
+	),
+	output_path: Path | None = typer.Option(
+		None,
+		'--output',
+		'-o',
+		help='Where to write the patched workflow. Defaults to overwriting the workflow file.',
+	),
+):
+	"""
+	Replaces steps that needed an agent fallback with the deterministic steps the agent used.
+	"""
+	store = PatchStore()
+	try:
+		with open(workflow_path, 'r', encoding='utf-8') as f:
+			schema = WorkflowDefinitionSchema.model_validate_json(f.read())
+		patches = store.load(schema.name, schema.version).patches
+		patched_schema, applied = apply_stored_patches(schema, store)
+	except Exception as e:
+		typer.secho(f'Error loading patches: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	if not patches:
+		typer.echo(f'No self-healing patches stored for {typer.style(schema.name, fg=typer.colors.MAGENTA)}.')
+		return
+
+	for patch in patches:
+		typer.echo(
+			f'Step {patch.step_index + 1} ({patch.original_step.type}) -> '
+			+ ', '.join(step.type for step in patch.replacement_steps)
+			+ f' (agent needed {patch.agent_steps} steps)'
+		)
+
+	output_path = output_path or workflow_path
+	with open(output_path, 'w', encoding='utf-8') as f:
+		json.dump(patched_schema.model_dump(mode='json'), f, indent=2)
+	store.clear(schema.name, schema.version)
+
+	typer.secho(
+		f'\nApplied {applied}/{len(patches)} patches, workflow saved to {output_path.resolve()}',
+		fg=typer.colors.GREEN,
+		bold=True,
+	)
+
+
+@app.command(name='optimize-workflow', help='Removes redundant steps (focus clicks, duplicate key presses, scroll noise...).')
+def optimize_workflow_command(
+	workflow_path: Path = typer.Argument(
+		...,
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Path to the .workflow.json file.',
+		show_default=False,
+	),
+	output_path: Path | None = typer.Option(
+		None,
+		'--output',
+		'-o',
+		help='Where to write the optimized workflow. Defaults to overwriting the workflow file.',
+	),
+	aggressive: bool = typer.Option(
+		False,
+		'--aggressive',
+		help='Also drop scrolls right before a step on an element (breaks pages that lazy-load content on scroll).',
+	),
+	dry_run: bool = typer.Option(False, '--dry-run', help='Only print the report, do not write the workflow.'),
+):
+	"""
+	Applies safe rewrite rules to the workflow steps and prints which steps were removed.
+	"""
+	try:
+		with open(workflow_path, 'r', encoding='utf-8') as f:
+			schema = WorkflowDefinitionSchema.model_validate_json(f.read())
+	except Exception as e:
+		typer.secho(f'Error loading workflow: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	optimized_schema, report = optimize_workflow(schema, AGGRESSIVE_RULES if aggressive else DEFAULT_RULES)
+	for change in report.changes:
+		verb = 'merged' if change.action == 'merge' else 'dropped'
+		typer.echo(
+			f'Step {change.step_index + 1} ({change.step_type}) {verb} by {typer.style(change.rule, fg=typer.colors.CYAN)}: '
+			f'{change.detail} (~{change.estimated_saved_ms} ms)'
+		)
+
+	if not report.changes:
+		typer.echo(report.summary())
+		return
+	if dry_run:
+		typer.secho(f'\n{report.summary()}', bold=True)
+		return
+
+	output_path = output_path or workflow_path
+	with open(output_path, 'w', encoding='utf-8') as f:
+		json.dump(optimized_schema.model_dump(mode='json'), f, indent=2)
+	typer.secho(f'\n{report.summary()} Saved to {output_path.resolve()}', fg=typer.colors.GREEN, bold=True)
+
+
+@app.command(
+	name='validate-selectors', help='Checks every step selector against the DOM snapshots recorded with it, without a browser.'
+)
+def validate_selectors_command(
+	workflow_path: Path = typer.Argument(
+		...,
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Path to the .workflow.json file.',
+		show_default=False,
+	),
+	snapshot_dir: Path | None = typer.Option(
+		None, '--snapshot-dir', help='Directory of the recorded DOM snapshots (default ./tmp/snapshots).'
+	),
+):
+	"""
+	Flags selectors that match several elements or nothing at all in the page the step was recorded on.
+	"""
+	try:
+		with open(workflow_path, 'r', encoding='utf-8') as f:
+			schema = WorkflowDefinitionSchema.model_validate_json(f.read())
+	except Exception as e:
+		typer.secho(f'Error loading workflow: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+	report = validate_workflow_selectors(schema, SnapshotStore(snapshot_dir))
+	colors = {
+		'ok': typer.colors.GREEN,
+		'fallback': typer.colors.YELLOW,
+		'ambiguous': typer.colors.RED,
+		'broken': typer.colors.RED,
+	}
+	for check in report.steps:
+		status = typer.style(check.status, fg=colors.get(check.status, typer.colors.BRIGHT_BLACK))
+		line = f'Step {check.step_index + 1} ({check.step_type}) {status}: {truncate_selector(check.selector)}'
+		if check.status == 'fallback' and check.resolved_by:
+			line += f' -> {truncate_selector(check.resolved_by)}'
+		elif check.status == 'ambiguous':
+			line += f' matches {check.candidates[0].matches} elements'
+		typer.echo(line)
+
+	typer.echo(
+		f'\n{len(report.steps)} selectors checked in {report.elapsed_ms:.1f} ms: {len(report.errors)} error(s), '
+		f'{len(report.warnings)} resolved by a fallback, {len(report.unchecked)} without snapshot or templated.'
+	)
+	if report.errors:
+		raise typer.Exit(code=1)
+
+
+@app.command(name='browser-daemon', help='Keeps a browser running that later run-workflow/run-as-tool calls attach to.')
+def browser_daemon_command(
+	port: int = typer.Option(0, '--port', help='DevTools (CDP) port, a free port is picked by default.'),
+	headless: bool = typer.Option(False, '--headless', help='Run the browser without a window.'),
+	stop: bool = typer.Option(False, '--stop', help='Stop the running daemon instead of starting one.'),
+):
+	"""
+	Launches Chromium once and keeps it alive. Every later invocation attaches over CDP and runs
+	in a fresh, isolated browser context, skipping the browser launch.
+	"""
+	if stop:
+		info = stop_daemon()
+		if info is None:
+			typer.echo('No browser daemon is running.')
+		else:
+			typer.secho(f'Stopped browser daemon (pid {info.pid}).', fg=typer.colors.GREEN)
+		return
+
+	daemon = BrowserDaemon(BrowserProfile(headless=headless), port=port)
+	typer.echo(typer.style('Starting browser daemon...', bold=True) + ' Stop it with Ctrl+C or browser-daemon --stop')
+	try:
+		asyncio.run(daemon.serve())
+	except KeyboardInterrupt:
+		pass
+	except Exception as e:
+		typer.secho(f'Error running browser daemon: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+
+
+@app.command(name='benchmark', help='Runs the offline benchmark suite against local fixture pages.')
+def benchmark_command(
+	output_path: Path | None = typer.Option(
+		None,
+		'--output',
+		'-o',
+		help='Where to write the JSON report. Defaults to ./tmp/benchmarks/<timestamp>-<commit>.json',
+	),
+	runs: int = typer.Option(3, '--runs', '-n', min=1, help='Runs per benchmark case.'),
+	cases: list[str] | None = typer.Option(None, '--case', help='Only run this case (can be repeated).'),
+	baseline_path: Path | None = typer.Option(
+		None,
+		'--baseline',
+		exists=True,
+		file_okay=True,
+		dir_okay=False,
+		readable=True,
+		help='Earlier report to compare the results with.',
+	),
+):
+	"""
+	Measures steps/sec, selector resolution latency, end-to-end time, fallback rates and memory
+	with a deterministic fake LLM, so reports of different commits can be compared.
+	"""
+	from benchmarks.service import compare_reports, load_report, run_benchmarks, save_report
+
+	try:
+		report = run_benchmarks(runs=runs, cases=cases or None)
+	except Exception as e:
+		typer.secho(f'Error running benchmarks: {e}', fg=typer.colors.RED)
+		raise typer.Exit(code=1)
+	report_path = save_report(report, output_path)
+
+	for case in report.cases:
+		typer.echo(
+			f'{typer.style(case.case, fg=typer.colors.MAGENTA, bold=True)}: '
+			f'{case.mean_run_s:.2f}s/run, {case.steps_per_s:.2f} steps/s, '
+			f'selector p50 {case.selector_p50_ms:.1f}ms p95 {case.selector_p95_ms:.1f}ms, '
+			f'selector fallbacks {case.selector_fallback_rate:.0%}, agent fallbacks {case.agent_fallback_rate:.0%}, '
+			f'{case.failed_runs}/{case.runs} runs failed, peak RSS {case.peak_rss_mb:.0f}MB (browser {case.peak_browser_rss_mb:.0f}MB)'
+		)
+	typer.echo(f'Report saved to {typer.style(str(report_path.resolve()), fg=typer.colors.CYAN)}')
+
+	if baseline_path is not None:
+		baseline = load_report(baseline_path)
+		typer.secho(f'\nCompared to {baseline.git_commit or baseline_path.name}:', bold=True)
+		for change in compare_reports(baseline, report):
+			color = typer.colors.RED if change.regression else None
+			typer.secho(
+				f'  {change.case} {change.metric}: {change.baseline} -> {change.current} ({change.change_pct:+}%)', fg=color
+			)
+
+
 @app.command(name='mcp-server', help='Starts the MCP server which expose all the created workflows as tools.')
 def mcp_server_command(
 	port: int = typer.Option(
@@ -0,0 +1,241 @@
+import asyncio
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiofiles
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from workflow_use.batch.views import BatchRowResult, BatchRunSummary
+from workflow_use.controller.service import WorkflowController
+from workflow_use.pool.service import BrowserPool
+from workflow_use.pool.views import BrowserPoolConfig
+from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.workflow.service import Workflow
+from workflow_use.workflow.views import WorkflowRunOutput
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_LOG_INTERVAL_S = 10
+
+
+def load_batch_inputs(path: str | Path) -> List[Dict[str, Any]]:
+	"""Read input rows from a ``.csv`` (header row required) or ``.jsonl`` file."""
+	path = Path(path)
+	if path.suffix.lower() == '.csv':
+		with open(path, 'r', encoding='utf-8', newline='') as f:
+			# Empty cells count as missing values so required inputs are reported as invalid rows
+			return [{key: value for key, value in row.items() if value != ''} for row in csv.DictReader(f)]
+	if path.suffix.lower() in ('.jsonl', '.ndjson'):
+		rows = []
+		with open(path, 'r', encoding='utf-8') as f:
+			for line_no, line in enumerate(f, start=1):
+				if not line.strip():
+					continue
+				row = json.loads(line)
+				if not isinstance(row, dict):
+					raise ValueError(f'Line {line_no} of {path} is not a JSON object')
+				rows.append(row)
+		return rows
+	raise ValueError(f'Unsupported batch input format: {path.suffix!r} (expected .csv or .jsonl)')
+
+
+def _coerce_number(raw: Any, value: float) -> Any:
+	# The input model parses numbers as floats, which would render '02139' as '2139.0' in placeholders: text that
+	# already is a valid number is kept as written, other integral values are passed as int
+	if isinstance(raw, str):
+		return raw.strip()
+	return int(value) if value.is_integer() else value
+
+
+def _serialize_run_output(result: WorkflowRunOutput) -> Dict[str, Any]:
+	return {
+		'step_results': [json.loads(step_result.model_dump_json()) for step_result in result.step_results],
+		'output_model': result.output_model.model_dump(mode='json') if result.output_model is not None else None,
+	}
+
+
+class BatchRunner:
+	"""
+	Runs one workflow over many input rows with bounded concurrency.
+
+	Rows are validated against the workflow's input schema before a browser is
+	leased for them, spread over ``concurrency`` isolated browser contexts and
+	streamed to a JSONL sink as soon as each row finishes. Failed rows are
+	retried up to ``max_retries`` times.
+	"""
+
+	def __init__(
+		self,
+		workflow_schema: WorkflowDefinitionSchema,
+		*,
+		concurrency: int = 4,
+		max_retries: int = 1,
+		controller: WorkflowController | None = None,
+		llm: BaseChatModel | None = None,
+		page_extraction_llm: BaseChatModel | None = None,
+		fallback_to_agent: bool = True,
+		browser_pool: BrowserPool | None = None,
+	) -> None:
+		if concurrency < 1:
+			raise ValueError('concurrency must be at least 1')
+
+		self.schema = workflow_schema
+		self.concurrency = concurrency
+		self.max_retries = max_retries
+		self.controller = controller or WorkflowController()
+		self.llm = llm
+		self.page_extraction_llm = page_extraction_llm
+		self.fallback_to_agent = fallback_to_agent
+
+		self.browser_pool = browser_pool
+
+		# Template instance used for input validation only, never run
+		self._validator = self._new_workflow(None)
+
+	@classmethod
+	def load_from_file(cls, file_path: str | Path, **kwargs: Any) -> 'BatchRunner':
+		"""Create a BatchRunner for a workflow JSON file."""
+		return cls(WorkflowDefinitionSchema.load_from_json(str(file_path)), **kwargs)
+
+	def _new_workflow(self, browser_pool: BrowserPool | None) -> Workflow:
+		return Workflow(
+			workflow_schema=self.schema,
+			controller=self.controller,
+			llm=self.llm,
+			page_extraction_llm=self.page_extraction_llm,
+			fallback_to_agent=self.fallback_to_agent,
+			browser_pool=browser_pool,
+		)
+
+	def _prepare_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+		"""Validate a raw row and coerce declared inputs to their schema types (e.g. CSV strings to numbers)."""
+		self._validator._validate_inputs(row)
+		if not self._validator.inputs_def:
+			return dict(row)
+
+		typed = self._validator._input_model(**row).model_dump()
+		for key, value in typed.items():
+			if value is None:
+				# Missing optional inputs are passed as empty strings, same as Workflow.as_tool
+				typed[key] = ''
+			elif isinstance(value, float):
+				typed[key] = _coerce_number(row.get(key), value)
+		return {**row, **typed}
+
+	async def run(self, rows: Iterable[Dict[str, Any]], output_path: str | Path) -> BatchRunSummary:
+		"""Run the workflow for every row and append one BatchRowResult per row to *output_path* (JSONL)."""
+		output_path = Path(output_path)
+		output_path.parent.mkdir(parents=True, exist_ok=True)
+
+		rows = list(rows)
+		# Without a shared pool the batch gets its own, sized to the requested concurrency
+		pool = self.browser_pool or BrowserPool(BrowserPoolConfig(size=self.concurrency))
+		summary = BatchRunSummary(total=len(rows), output_path=str(output_path))
+		# None tells a worker to stop, it is only queued once every row has finished (including its retries)
+		queue: asyncio.Queue[Optional[Tuple[int, Dict[str, Any], int]]] = asyncio.Queue()
+		write_lock = asyncio.Lock()
+		start = time.perf_counter()
+
+		async with aiofiles.open(output_path, 'w', encoding='utf-8') as sink:
+
+			async def write_result(row_result: BatchRowResult) -> None:
+				async with write_lock:
+					await sink.write(row_result.model_dump_json() + '\n')
+					await sink.flush()
+				if row_result.status == 'success':
+					summary.succeeded += 1
+				elif row_result.status == 'failed':
+					summary.failed += 1
+				else:
+					summary.invalid += 1
+
+			# 1. Validate every row up-front so invalid rows never cost a browser
+			for row_index, row in enumerate(rows):
+				try:
+					queue.put_nowait((row_index, self._prepare_row(row), 1))
+				except ValueError as e:
+					await write_result(BatchRowResult(row_index=row_index, status='invalid', inputs=row, error=str(e)))
+
+			logger.info(f'Batch: {queue.qsize()} valid rows, {summary.invalid} invalid, concurrency={self.concurrency}')
+
+			# 2. Workers pull rows from the queue, each run leases its own browser context
+			async def worker() -> None:
+				while True:
+					item = await queue.get()
+					if item is None:
+						queue.task_done()
+						return
+					try:
+						await run_row(*item)
+					finally:
+						queue.task_done()
+
+			async def run_row(row_index: int, inputs: Dict[str, Any], attempt: int) -> None:
+				row_start = time.perf_counter()
+				try:
+					result = await self._new_workflow(pool).run(inputs)
+					await write_result(
+						BatchRowResult(
+							row_index=row_index,
+							status='success',
+							attempts=attempt,
+							inputs=inputs,
+							duration_s=time.perf_counter() - row_start,
+							output=_serialize_run_output(result),
+						)
+					)
+				except Exception as e:
+					if attempt <= self.max_retries:
+						logger.warning(f'Batch row {row_index} failed (attempt {attempt}), retrying: {e}')
+						summary.retries += 1
+						queue.put_nowait((row_index, inputs, attempt + 1))
+					else:
+						logger.error(f'Batch row {row_index} failed after {attempt} attempts: {e}')
+						await write_result(
+							BatchRowResult(
+								row_index=row_index,
+								status='failed',
+								attempts=attempt,
+								inputs=inputs,
+								duration_s=time.perf_counter() - row_start,
+								error=str(e),
+							)
+						)
+
+			async def report_progress() -> None:
+				while True:
+					await asyncio.sleep(PROGRESS_LOG_INTERVAL_S)
+					done = summary.succeeded + summary.failed
+					elapsed_min = (time.perf_counter() - start) / 60
+					logger.info(
+						f'Batch progress: {done}/{summary.total - summary.invalid} rows done '
+						f'({done / elapsed_min:.1f} rows/min, {summary.failed} failed, {summary.retries} retries)'
+					)
+
+			progress_task = asyncio.create_task(report_progress())
+			workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+			try:
+				# Failed rows are queued again before task_done, so join() waits for their retries as well
+				await queue.join()
+				for _ in workers:
+					queue.put_nowait(None)
+				await asyncio.gather(*workers)
+			finally:
+				progress_task.cancel()
+				for task in workers:
+					task.cancel()
+				if pool is not self.browser_pool:
+					await pool.close()
+
+		summary.elapsed_s = time.perf_counter() - start
+		processed = summary.succeeded + summary.failed
+		summary.rows_per_minute = processed / (summary.elapsed_s / 60) if summary.elapsed_s > 0 else 0.0
+		logger.info(
+			f'Batch finished: {summary.succeeded} succeeded, {summary.failed} failed, {summary.invalid} invalid '
+			f'in {summary.elapsed_s:.1f}s ({summary.rows_per_minute:.1f} rows/min)'
+		)
+		return summary
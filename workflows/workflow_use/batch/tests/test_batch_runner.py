@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from workflow_use.batch.service import BatchRunner
+from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.workflow.views import WorkflowRunOutput
+
+
+def _runner(**kwargs) -> BatchRunner:
+	schema = WorkflowDefinitionSchema.model_validate(
+		{
+			'name': 'lookup',
+			'description': '',
+			'version': '1.0',
+			'input_schema': [
+				{'name': 'zip', 'type': 'number', 'required': True},
+				{'name': 'count', 'type': 'number', 'required': False},
+			],
+			'steps': [{'type': 'navigation', 'url': 'https://x/{zip}'}],
+		}
+	)
+	return BatchRunner(schema, **kwargs)
+
+
+def test_number_inputs_keep_their_csv_text_and_integral_values_stay_int():
+	runner = _runner()
+
+	assert runner._prepare_row({'zip': '02139'}) == {'zip': '02139', 'count': ''}
+	assert runner._prepare_row({'zip': 2139.0, 'count': 2.5}) == {'zip': 2139, 'count': 2.5}
+
+
+class _FlakyWorkflow:
+	"""Fails the first attempt of every row and tracks how many retries overlap."""
+
+	attempts: dict = {}
+	retrying = 0
+	max_retrying = 0
+
+	async def run(self, inputs):
+		cls = _FlakyWorkflow
+		cls.attempts[inputs['zip']] = cls.attempts.get(inputs['zip'], 0) + 1
+		if cls.attempts[inputs['zip']] == 1:
+			await asyncio.sleep(0.01)
+			raise RuntimeError('flaky')
+		cls.retrying += 1
+		cls.max_retrying = max(cls.max_retrying, cls.retrying)
+		try:
+			await asyncio.sleep(0.05)
+			return WorkflowRunOutput(step_results=[])
+		finally:
+			cls.retrying -= 1
+
+
+def test_retries_run_with_full_concurrency(tmp_path, monkeypatch):
+	runner = _runner(concurrency=3, max_retries=1)
+	monkeypatch.setattr(runner, '_new_workflow', lambda pool: _FlakyWorkflow())
+	rows = [{'zip': str(index)} for index in range(6)]
+
+	summary = asyncio.run(runner.run(rows, tmp_path / 'results.jsonl'))
+
+	assert (summary.succeeded, summary.failed, summary.retries) == (6, 0, 6)
+	assert _FlakyWorkflow.max_retrying == 3
+	results = [json.loads(line) for line in (tmp_path / 'results.jsonl').read_text().splitlines()]
+	assert sorted(result['attempts'] for result in results) == [2] * 6
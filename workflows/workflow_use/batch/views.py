@@ -0,0 +1,28 @@
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchRowResult(BaseModel):
+	"""Outcome of running the workflow for a single input row (one line of the JSONL sink)."""
+
+	row_index: int
+	status: Literal['success', 'failed', 'invalid']
+	attempts: int = 0
+	inputs: Dict[str, Any] = Field(default_factory=dict)
+	duration_s: float = 0.0
+	output: Optional[Dict[str, Any]] = Field(default=None, description='Serialized WorkflowRunOutput of the successful attempt.')
+	error: Optional[str] = None
+
+
+class BatchRunSummary(BaseModel):
+	"""Aggregate statistics of a batch run."""
+
+	total: int
+	succeeded: int = 0
+	failed: int = 0
+	invalid: int = 0
+	retries: int = 0
+	elapsed_s: float = 0.0
+	rows_per_minute: float = 0.0
+	output_path: Optional[str] = None
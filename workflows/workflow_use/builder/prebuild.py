@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, quote_plus, urlsplit, urlunsplit
+
+from workflow_use.builder.segments import SELECTOR_NAME_PATTERN, check_input_schema
+from workflow_use.builder.views import BuildPatch
+from workflow_use.controller.utils import truncate_selector
+from workflow_use.schema.views import (
+	AgentTaskWorkflowStep,
+	PageExtractionStep,
+	WorkflowDefinitionSchema,
+	WorkflowInputSchemaDefinition,
+	WorkflowStep,
+)
+
+# Recorded fields that only make the prompt bigger, the pre-built steps keep everything else
+PREBUILD_DROPPED_FIELDS = {'screenshot'}
+# Step fields a workflow input can be substituted into. In URLs only whole path segments and query values are
+# replaced, in their recorded or URL-encoded form
+PATCHABLE_FIELDS = ('value', 'selectedText')
+MAX_LABEL_CHARS = 60
+
+
+def _label(step: WorkflowStep) -> str:
+	text = ' '.join((getattr(step, 'elementText', None) or '').split())
+	if text:
+		return f"'{text[:MAX_LABEL_CHARS]}'"
+	match = SELECTOR_NAME_PATTERN.search(getattr(step, 'cssSelector', '') or '')
+	if match:
+		return f"'{match.group(1) or match.group(2)}'"
+	return getattr(step, 'elementTag', None) or 'element'
+
+
+def describe_step(step: WorkflowStep) -> str:
+	"""Short description of what a recorded step does, e.g. "Click 'Search'"."""
+	if step.type == 'navigation':
+		return f'Navigate to {step.url}'
+	if step.type == 'click':
+		return f'Click {_label(step)}'
+	if step.type == 'input':
+		return f'Enter the value into {_label(step)}'
+	if step.type == 'select_change':
+		return f"Select '{step.selectedText}' in {_label(step)}"
+	if step.type == 'key_press':
+		return f"Press '{step.key}' on {_label(step)}"
+	if step.type == 'scroll':
+		return 'Scroll the page'
+	return step.description or step.type
+
+
+def prebuild_workflow(steps: Sequence[WorkflowStep], name: str = 'Recorded workflow') -> WorkflowDefinitionSchema:
+	"""Convert recorded steps into a replayable workflow without an LLM: same steps, no screenshots, generated descriptions."""
+	workflow_steps: List[Dict[str, Any]] = []
+	for step in steps:
+		step_dict = step.model_dump(mode='json', exclude_none=True, exclude=PREBUILD_DROPPED_FIELDS)
+		step_dict.setdefault('description', describe_step(step))
+		workflow_steps.append(step_dict)
+	return WorkflowDefinitionSchema.model_validate(
+		{'name': name, 'description': '', 'version': '1.0', 'input_schema': [], 'steps': workflow_steps}
+	)
+
+
+def format_steps_for_patch(steps: Sequence[WorkflowStep]) -> str:
+	"""One line per step with the values the patch LLM decides on, instead of every step's JSON."""
+	lines = []
+	for index, step in enumerate(steps):
+		if step.type == 'navigation':
+			detail = f'url={step.url}'
+		elif step.type == 'input':
+			detail = f'{truncate_selector(step.cssSelector)} value={step.value!r}'
+		elif step.type == 'select_change':
+			detail = f'{truncate_selector(step.cssSelector)} option={step.selectedText!r}'
+		elif step.type == 'key_press':
+			detail = f'{truncate_selector(step.cssSelector)} key={step.key!r}'
+		elif step.type == 'click':
+			detail = f'{truncate_selector(step.cssSelector)} text={_label(step)}'
+		elif step.type == 'scroll':
+			detail = f'x={step.scrollX} y={step.scrollY}'
+		else:
+			detail = step.description or ''
+		lines.append(f'{index}. {step.type} {detail}'.rstrip())
+	return '\n'.join(lines)
+
+
+def _substitute_url(url: str, recorded_value: str, placeholder: str) -> Optional[str]:
+	"""*url* with the path segments and query values equal to *recorded_value* replaced, None if there are none."""
+	if not recorded_value:
+		return None
+	forms = {recorded_value, quote(recorded_value, safe=''), quote_plus(recorded_value)}
+	parts = urlsplit(url)
+	segments = [placeholder if segment in forms else segment for segment in parts.path.split('/')]
+	params = []
+	for param in parts.query.split('&') if parts.query else []:
+		key, sep, value = param.partition('=')
+		params.append(f'{key}={placeholder}' if sep and value in forms else param)
+	substituted = urlunsplit(parts._replace(path='/'.join(segments), query='&'.join(params)))
+	return substituted if substituted != url else None
+
+
+def _substitute(step: WorkflowStep, recorded_value: str, placeholder: str) -> Tuple[WorkflowStep, bool]:
+	update: Dict[str, str] = {}
+	for field in PATCHABLE_FIELDS:
+		if getattr(step, field, None) == recorded_value:
+			update[field] = placeholder
+	url = getattr(step, 'url', None)
+	if step.type == 'navigation' and url:
+		substituted_url = _substitute_url(url, recorded_value, placeholder)
+		if substituted_url is not None:
+			update['url'] = substituted_url
+	if not update:
+		return step, False
+	return step.model_copy(update=update), True
+
+
+def apply_build_patch(prebuilt: WorkflowDefinitionSchema, patch: BuildPatch) -> Tuple[WorkflowDefinitionSchema, List[str]]:
+	"""Apply the builder LLM's *patch* to a pre-built workflow.
+
+	Recorded values become ``{input}`` placeholders, step ranges are replaced by agent steps and extractions are
+	inserted. Out of range or overlapping entries are skipped, and input_schema is checked against the placeholders
+	the steps use. Returns the workflow and the problems found in the patch.
+	"""
+	steps = list(prebuilt.steps)
+	issues: List[str] = []
+
+	def in_range(index: int, what: str) -> bool:
+		if 0 <= index < len(steps):
+			return True
+		issues.append(f'{what} refers to step {index}, the workflow has {len(steps)} steps')
+		return False
+
+	input_schema: List[WorkflowInputSchemaDefinition] = []
+	for patch_input in patch.inputs:
+		placeholder = f'{{{patch_input.name}}}'
+		substituted = False
+		for index in patch_input.step_indexes:
+			if not in_range(index, f'Input {patch_input.name!r}'):
+				continue
+			steps[index], changed = _substitute(steps[index], patch_input.recorded_value, placeholder)
+			substituted = substituted or changed
+		if not substituted:
+			issues.append(f'Input {patch_input.name!r}: {patch_input.recorded_value!r} not found in its steps')
+		input_schema.append(
+			WorkflowInputSchemaDefinition(name=patch_input.name, type=patch_input.type, required=patch_input.required or None)
+		)
+
+	agents: Dict[int, AgentTaskWorkflowStep] = {}
+	replaced: set[int] = set()
+	for agent in sorted(patch.agent_steps, key=lambda agent: agent.first_step):
+		if not (in_range(agent.first_step, 'Agent step') and in_range(agent.last_step, 'Agent step')):
+			continue
+		covered = set(range(agent.first_step, agent.last_step + 1))
+		if not covered or covered & replaced:
+			issues.append(f'Agent step for steps {agent.first_step}-{agent.last_step} is empty or overlaps another one')
+			continue
+		replaced |= covered
+		agents[agent.first_step] = AgentTaskWorkflowStep(
+			type='agent', task=agent.task, description=agent.description or None, max_steps=agent.max_steps
+		)
+
+	extractions: Dict[int, List[PageExtractionStep]] = {}
+	for extraction in patch.extractions:
+		if in_range(extraction.after_step, 'Extraction'):
+			extractions.setdefault(extraction.after_step, []).append(
+				PageExtractionStep(
+					type='extract_page_content', goal=extraction.goal, output=extraction.output, description=extraction.goal
+				)
+			)
+
+	dropped = {index for index in patch.drop_steps if in_range(index, 'Dropped step')}
+	patched: List[WorkflowStep] = []
+	for index, step in enumerate(steps):
+		if index in agents:
+			patched.append(agents[index])
+		if index not in replaced and index not in dropped:
+			patched.append(step)
+		patched.extend(extractions.get(index, []))
+	if not patched:
+		issues.append('The patch removes every step, keeping the recorded steps')
+		patched = steps
+
+	workflow = prebuilt.model_copy(
+		update={'name': patch.name, 'description': patch.description, 'steps': patched, 'input_schema': input_schema}
+	)
+	workflow, schema_issues = check_input_schema(workflow)
+	return workflow, issues + schema_issues
@@ -1,3 +1,5 @@
+import hashlib
+
 WORKFLOW_BUILDER_PROMPT_TEMPLATE = """\
 You are a senior software engineer working with the *browser-use* open-source library.
 Your task is to convert a JSON recording of browser events (provided in subsequent messages) into an
@@ -59,3 +61,44 @@ Available actions:
 
 Input session events will follow one-by-one in subsequent messages.
 """
+
+SEGMENT_CONTEXT_TEMPLATE = """\
+The recording is long, so it is converted in parts that are built separately and concatenated afterwards.
+The events that follow are part {index} of {count} (starting at recorded event {first_event}).
+- Only cover the events of this part, do not add steps for the rest of the goal.
+- The workflow's inputs are shared by all parts. Use these input names for values that correspond to them
+  (and declare the ones you use as inputs): {input_names}
+- Name and describe the workflow after the overall goal, not this part.
+"""
+
+PATCH_BUILDER_PROMPT_TEMPLATE = """\
+You are a senior software engineer working with the *browser-use* open-source library.
+A recorded browser session has already been converted into the numbered workflow steps below, they replay exactly
+what the user did. Do not repeat the steps, only return the decisions that need judgment as a compact patch:
+
+1. "inputs": recorded values that must become workflow inputs so the workflow can be re-run with other values
+   (search terms, form values, options that depend on the task...). Give each a snake_case "name", a "type"
+   ("string", "number" or "bool"), "required", the "recorded_value" exactly as it appears in the steps and the
+   "step_indexes" of every step that uses it, including navigation URLs that contain it. Aim for at least one input
+   unless the workflow is static.
+2. "agent_steps": ranges of steps ("first_step" to "last_step", inclusive) that must be replaced by an agent because
+   they interact with content that changes between runs, e.g. choosing an item from search results or a date from
+   a calendar. Give a "task" from the user's perspective (it may reference inputs as {{input_name}}), a short
+   "description" of why an agent is needed and optionally "max_steps". Never use agents for simple data extraction.
+3. "extractions": data the goal asks to extract, as "after_step" (index), "goal" and an "output" name.
+4. "drop_steps": indexes of steps that are a side effect of another step (e.g. a navigation caused by the click
+   before it).
+5. "name" and "description" of the workflow.
+Leave lists empty when nothing applies.
+
+High-level task description provided by the user (may be empty):
+{goal}
+
+Steps:
+{steps}
+"""
+
+# Part of the build cache key: cached builds are invalidated whenever one of the prompts changes
+BUILDER_PROMPT_VERSION = hashlib.sha256(
+	'\0'.join((WORKFLOW_BUILDER_PROMPT_TEMPLATE, SEGMENT_CONTEXT_TEMPLATE, PATCH_BUILDER_PROMPT_TEMPLATE)).encode('utf-8')
+).hexdigest()[:16]
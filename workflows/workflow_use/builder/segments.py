@@ -0,0 +1,128 @@
+import re
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from workflow_use.plan.service import CompiledTemplate
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowInputSchemaDefinition, WorkflowStep
+
+# Segments shorter than this are merged into the previous one, a few steps alone give the LLM too little context
+DEFAULT_MIN_SEGMENT_STEPS = 4
+# Selector attributes an input's name can be read from, in order of preference
+SELECTOR_NAME_PATTERN = re.compile(
+	r'\[(?:name|id|aria-label|placeholder|data-testid)=["\']?([^"\'\]]+)["\']?\]|#([A-Za-z][\w-]*)'
+)
+
+
+def split_at_navigations(
+	steps: Sequence[WorkflowStep], min_segment_steps: int = DEFAULT_MIN_SEGMENT_STEPS
+) -> List[List[WorkflowStep]]:
+	"""Split recorded steps into segments that each start with a navigation."""
+	segments: List[List[WorkflowStep]] = []
+	for step in steps:
+		if not segments or (step.type == 'navigation' and len(segments[-1]) >= min_segment_steps):
+			segments.append([step])
+		else:
+			segments[-1].append(step)
+	if len(segments) > 1 and len(segments[-1]) < min_segment_steps:
+		tail = segments.pop()
+		segments[-1].extend(tail)
+	return segments
+
+
+def _snake_case(text: str) -> str:
+	text = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', text)
+	return re.sub(r'[^0-9a-zA-Z]+', '_', text).strip('_').lower()
+
+
+def suggest_input_names(steps: Sequence[WorkflowStep]) -> List[str]:
+	"""Guess input names from the fields the recording fills (e.g. ``input[name="firstName"]`` -> ``first_name``)."""
+	names: List[str] = []
+	for step in steps:
+		if step.type not in ('input', 'select_change'):
+			continue
+		match = SELECTOR_NAME_PATTERN.search(getattr(step, 'cssSelector', ''))
+		name = _snake_case(match.group(1) or match.group(2)) if match else ''
+		if name and not name[0].isdigit() and name not in names:
+			names.append(name)
+	return names
+
+
+def _collect_template_names(value: Any, names: Set[str]) -> None:
+	if isinstance(value, str):
+		template = CompiledTemplate.parse(value)
+		if template is not None:
+			names.update(template.names)
+	elif isinstance(value, dict):
+		for item in value.values():
+			_collect_template_names(item, names)
+	elif isinstance(value, list):
+		for item in value:
+			_collect_template_names(item, names)
+
+
+def referenced_inputs(workflow: WorkflowDefinitionSchema) -> Set[str]:
+	"""Placeholders used by the steps that are not the output of an earlier step."""
+	names: Set[str] = set()
+	outputs: Set[str] = set()
+	for step in workflow.steps:
+		step_names: Set[str] = set()
+		_collect_template_names(step.model_dump(exclude={'description', 'output'}), step_names)
+		names.update(step_names - outputs)
+		if step.output:
+			outputs.add(step.output)
+	return names
+
+
+def check_input_schema(workflow: WorkflowDefinitionSchema) -> Tuple[WorkflowDefinitionSchema, List[str]]:
+	"""Declare inputs the steps use but input_schema lacks and drop declared inputs no step uses.
+
+	Returns the fixed workflow and a description of every fix.
+	"""
+	used = referenced_inputs(workflow)
+	declared = {definition.name for definition in workflow.input_schema}
+	issues: List[str] = []
+	input_schema = []
+	for definition in workflow.input_schema:
+		if definition.name in used:
+			input_schema.append(definition)
+		else:
+			issues.append(f'Input {definition.name!r} is not used by any step, dropped it')
+	for name in sorted(used - declared):
+		issues.append(f'Placeholder {{{name}}} is not declared in input_schema, added it as a required string')
+		input_schema.append(WorkflowInputSchemaDefinition(name=name, type='string', required=True))
+	if not issues:
+		return workflow, issues
+	return workflow.model_copy(update={'input_schema': input_schema}), issues
+
+
+def merge_segment_workflows(parts: Sequence[WorkflowDefinitionSchema]) -> Tuple[WorkflowDefinitionSchema, List[str]]:
+	"""Concatenate workflows built from consecutive segments of one recording.
+
+	Inputs declared by several segments are unified (conflicting types become strings, an input is required if
+	any segment requires it) and the merged input_schema is checked against the placeholders of all steps.
+	Returns the merged workflow and the issues that were fixed.
+	"""
+	if not parts:
+		raise ValueError('No segment workflows to merge.')
+	issues: List[str] = []
+	inputs: Dict[str, WorkflowInputSchemaDefinition] = {}
+	for part in parts:
+		for definition in part.input_schema:
+			existing = inputs.get(definition.name)
+			if existing is None:
+				inputs[definition.name] = definition.model_copy()
+				continue
+			if existing.type != definition.type:
+				issues.append(f'Input {definition.name!r} is a {existing.type} and a {definition.type}, using string')
+				existing.type = 'string'
+			existing.required = existing.required or definition.required
+
+	analyses = [part.workflow_analysis for part in parts if part.workflow_analysis]
+	merged = parts[0].model_copy(
+		update={
+			'steps': [step for part in parts for step in part.steps],
+			'input_schema': list(inputs.values()),
+			'workflow_analysis': '\n\n'.join(analyses) if analyses else None,
+		}
+	)
+	merged, schema_issues = check_input_schema(merged)
+	return merged, issues + schema_issues
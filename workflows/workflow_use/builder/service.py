@@ -1,9 +1,11 @@
-import base64
+import asyncio
+import hashlib
 import json
 import logging
+import math
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Sequence, cast
 
 from langchain_core.exceptions import OutputParserException
 from langchain_core.language_models import BaseChatModel
@@ -11,12 +13,96 @@ from langchain_core.messages import HumanMessage
 from langchain_core.prompts import PromptTemplate
 from pydantic import ValidationError
 
-from workflow_use.builder.prompts import WORKFLOW_BUILDER_PROMPT_TEMPLATE
+from workflow_use.builder.prebuild import apply_build_patch, format_steps_for_patch, prebuild_workflow
+from workflow_use.builder.prompts import (
+	BUILDER_PROMPT_VERSION,
+	PATCH_BUILDER_PROMPT_TEMPLATE,
+	SEGMENT_CONTEXT_TEMPLATE,
+	WORKFLOW_BUILDER_PROMPT_TEMPLATE,
+)
+from workflow_use.builder.segments import merge_segment_workflows, split_at_navigations, suggest_input_names
+from workflow_use.builder.views import BuildPatch
+from workflow_use.cache.service import BuildCache
 from workflow_use.controller.service import WorkflowController
-from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.extraction.service import compile_record_extraction, parse_json_response
+from workflow_use.optimizer.service import optimize_workflow
+from workflow_use.schema.views import PageExtractionStep, RecordExtractionStep, WorkflowDefinitionSchema, WorkflowStep
+from workflow_use.screenshots.service import ScreenshotPreprocessor
+from workflow_use.screenshots.views import PreparedScreenshot, ScreenshotConfig
+from workflow_use.snapshot.service import SnapshotStore
+from workflow_use.tracing.service import trace_span
 
 logger = logging.getLogger(__name__)
 
+# Recorded step fields the LLM does not need to see or tends to leave out, copied back onto the generated steps
+RECORDED_STEP_FIELDS = ('fallbackSelectors', 'domSnapshot')
+# Actions the LLM is not offered, extract_records selectors are compiled against the recorded DOM instead
+HIDDEN_BUILDER_ACTIONS = ('extract_records',)
+# Fields left out of the schema the LLM fills in: recorded ones are copied back, resource blocking is set by hand
+BUILDER_HIDDEN_FIELDS = (*RECORDED_STEP_FIELDS, 'resource_blocking')
+# Step types left out of that schema, extract_records steps are only produced by compile_extractions
+BUILDER_HIDDEN_STEP_TYPES = ('RecordExtractionStep',)
+# Part of the build cache key, bump when the rules that turn recordings into workflows change
+BUILD_CACHE_VERSION = '1'
+# Recorded fields that differ between recordings of the same actions
+VOLATILE_STEP_FIELDS = {'timestamp', 'tabId'}
+
+
+def builder_output_schema() -> Dict[str, Any]:
+	"""JSON schema of WorkflowDefinitionSchema without the fields and step types the builder LLM never has to fill in."""
+	schema = WorkflowDefinitionSchema.model_json_schema()
+	hidden_refs = {f'#/$defs/{name}' for name in BUILDER_HIDDEN_STEP_TYPES}
+	items = schema['properties']['steps']['items']
+	items['anyOf'] = [option for option in items['anyOf'] if option.get('$ref') not in hidden_refs]
+	for model in [schema, *schema['$defs'].values()]:
+		for field in BUILDER_HIDDEN_FIELDS:
+			model.get('properties', {}).pop(field, None)
+	# Drop the definitions only the removed fields and step types referenced (ResourceBlockingProfile, ExtractionField...)
+	defs = schema.pop('$defs')
+	used: Dict[str, Any] = {}
+	pending = [schema]
+	while pending:
+		text = json.dumps(pending.pop())
+		for name in re.findall(r'"#/\$defs/([^"]+)"', text):
+			if name not in used and f'#/$defs/{name}' not in hidden_refs:
+				used[name] = defs[name]
+				pending.append(defs[name])
+	schema['$defs'] = used
+	return schema
+
+
+def normalize_recording(steps: Sequence[WorkflowStep], include_screenshots: bool) -> str:
+	"""Canonical JSON of recorded steps for the build cache key, screenshots are represented by their hash."""
+	normalized = []
+	for step in steps:
+		step_dict = step.model_dump(mode='json', exclude_none=True, exclude=VOLATILE_STEP_FIELDS)
+		screenshot = step_dict.pop('screenshot', None)
+		if include_screenshots and isinstance(screenshot, str):
+			step_dict['screenshot'] = hashlib.sha256(screenshot.encode('utf-8')).hexdigest()
+		normalized.append(step_dict)
+	return json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+
+
+def snapshot_after_step(steps: Sequence[WorkflowStep], index: int) -> Optional[str]:
+	"""Hash of the DOM snapshot showing the page right after step *index*, None if none was recorded.
+
+	Snapshots are taken before a step's action, so the page after *index* is the snapshot of the first later step
+	recorded on the same tab. The snapshot of an earlier step shows the page before e.g. the click that loaded the
+	data to extract.
+	"""
+	tab_id = next(
+		(getattr(step, 'tabId', None) for step in reversed(steps[: index + 1]) if getattr(step, 'tabId', None) is not None),
+		None,
+	)
+	for step in steps[index + 1 :]:
+		step_tab_id = getattr(step, 'tabId', None)
+		if tab_id is not None and step_tab_id is not None and step_tab_id != tab_id:
+			continue
+		snapshot = getattr(step, 'domSnapshot', None)
+		if snapshot:
+			return snapshot
+	return None
+
 
 class BuilderService:
 	"""
@@ -24,28 +110,52 @@ class BuilderService:
 	from recorded browser session events using an LLM.
 	"""
 
-	def __init__(self, llm: BaseChatModel):
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		snapshot_store: SnapshotStore | None = None,
+		screenshot_config: ScreenshotConfig | None = None,
+		use_build_cache: bool = False,
+		build_cache: BuildCache | None = None,
+	):
 		"""
 		Initializes the BuilderService.
 
 		Args:
 		    llm: A LangChain BaseChatModel instance configured for use.
 		         It should ideally support vision capabilities if screenshots are used.
+		    snapshot_store: Where the recorded DOM snapshots are read from when compiling extractions.
+		    screenshot_config: Resolution, encoding and deduplication of the screenshots attached to the prompt.
+		    use_build_cache: Opt-in: store built workflows in ./tmp/cache/builds.sqlite and reuse them for identical
+		                     inputs. The entries contain the recorded values (anything typed during recording).
+		                     Segments are only cached and reused on their own in segmented builds.
+		    build_cache: Cache to use instead of the default one in the cache directory.
 		"""
 		if llm is None:
 			raise ValueError('A BaseChatModel instance must be provided.')
+		self.llm = llm
+		self.snapshot_store = snapshot_store or SnapshotStore()
+		self.screenshot_preprocessor = ScreenshotPreprocessor(screenshot_config)
+		# Rebuilding an unchanged recording (or segment) with the same goal and settings skips the LLM
+		self.build_cache = build_cache or (BuildCache() if use_build_cache else None)
 
 		# Configure the LLM to return structured output based on the Pydantic model
 		try:
 			# Specify method="function_calling" for better compatibility
-			self.llm_structured = llm.with_structured_output(WorkflowDefinitionSchema, method='function_calling')
+			# The schema is returned as a dict and validated against WorkflowDefinitionSchema in _generate_workflow
+			self.llm_structured = llm.with_structured_output(builder_output_schema(), method='function_calling')
 		except NotImplementedError:
 			logger.warning('LLM does not support structured output natively. Falling back.')
 			# Basic LLM call if structured output is not supported
 			# Output parsing will be handled manually later
 			self.llm_structured = llm  # Store the original llm
+		try:
+			self.llm_patch = llm.with_structured_output(BuildPatch, method='function_calling')
+		except NotImplementedError:
+			self.llm_patch = llm
 
 		self.prompt_template = PromptTemplate.from_template(WORKFLOW_BUILDER_PROMPT_TEMPLATE)
+		self.patch_prompt_template = PromptTemplate.from_template(PATCH_BUILDER_PROMPT_TEMPLATE)
 		self.actions_markdown = self._get_available_actions_markdown()
 		logger.info('BuilderService initialized.')
 
@@ -54,6 +164,8 @@ class BuilderService:
 		controller = WorkflowController()
 		lines: List[str] = []
 		for action in controller.registry.registry.actions.values():
+			if action.name in HIDDEN_BUILDER_ACTIONS:
+				continue
 			# Only include deterministic actions relevant for building from recordings
 			# Exclude agent-specific or meta-actions if necessary
 			# Based on schema/views.py, the recorder types seem to map directly
@@ -137,12 +249,271 @@ class BuilderService:
 			logger.debug(f'Content attempted parsing:\n{content_to_parse}')
 			raise ValueError(f'LLM output could not be parsed into a valid Workflow schema. Error: {e}') from e
 
+	@staticmethod
+	def _restore_recorded_fields(
+		recording: WorkflowDefinitionSchema, workflow: WorkflowDefinitionSchema
+	) -> WorkflowDefinitionSchema:
+		"""Copy recorded fallback selectors and snapshot hashes back onto the generated steps with the same cssSelector."""
+		recorded: Dict[str, Dict[str, Any]] = {}
+		for step in recording.steps:
+			selector = getattr(step, 'cssSelector', None)
+			fields = {name: getattr(step, name, None) for name in RECORDED_STEP_FIELDS if getattr(step, name, None)}
+			if selector and fields:
+				recorded.setdefault(selector, fields)
+		if not recorded:
+			return workflow
+		steps = []
+		for step in workflow.steps:
+			fields = recorded.get(getattr(step, 'cssSelector', None) or '', {})
+			update = {
+				name: value for name, value in fields.items() if name in type(step).model_fields and not getattr(step, name)
+			}
+			steps.append(step.model_copy(update=update) if update else step)
+		return workflow.model_copy(update={'steps': steps})
+
+	async def compile_extractions(self, workflow: WorkflowDefinitionSchema) -> WorkflowDefinitionSchema:
+		"""
+		Replace extract_page_content steps by extract_records steps where the LLM can express the goal as selectors.
+
+		Each goal is compiled once against the page as it was at the extraction (see ``snapshot_after_step``) and
+		only kept if the selectors extract data from that snapshot, so replays of compiled steps need no LLM at all.
+		"""
+		steps = list(workflow.steps)
+		compiled = 0
+		for index, step in enumerate(steps):
+			if not isinstance(step, PageExtractionStep):
+				continue
+			snapshot = snapshot_after_step(steps, index)
+			if snapshot is None:
+				logger.info(f'No DOM snapshot recorded after extraction {step.goal!r}, keeping the LLM extraction')
+				continue
+			html = self.snapshot_store.get(snapshot)
+			if html is None:
+				continue
+			spec = await compile_record_extraction(self.llm, html, step.goal)
+			if spec is None:
+				continue
+			steps[index] = RecordExtractionStep(
+				type='extract_records',
+				description=step.description or step.goal,
+				output=step.output,
+				timestamp=step.timestamp,
+				tabId=step.tabId,
+				resource_blocking=step.resource_blocking,
+				**spec.model_dump(),
+			)
+			compiled += 1
+			logger.info(f'Compiled extraction {step.goal!r} into selectors: {spec.record_selector}')
+		if not compiled:
+			return workflow
+		return workflow.model_copy(update={'steps': steps})
+
+	async def _prepare_screenshots(self, steps: Sequence[WorkflowStep], max_images: int) -> Dict[int, PreparedScreenshot]:
+		"""Screenshots by step index, downscaled, re-encoded and deduplicated before they count against max_images."""
+		recorded = [
+			(index, cast(str, getattr(step, 'screenshot')))
+			for index, step in enumerate(steps)
+			if step.type != 'input' and isinstance(getattr(step, 'screenshot', None), str)  # Don't attach for inputs
+		]
+		if not recorded:
+			return {}
+		prepared, report = await asyncio.to_thread(self.screenshot_preprocessor.prepare, recorded, max_images)
+		logger.info(report.summary())
+		return {screenshot.step_index: screenshot for screenshot in prepared}
+
+	async def _generate_workflow(
+		self,
+		steps: Sequence[WorkflowStep],
+		prompt_parts: List[str],
+		use_screenshots: bool = False,
+		max_images: int = 20,
+	) -> WorkflowDefinitionSchema:
+		"""Prompt the LLM with *prompt_parts* followed by the recorded *steps* and parse the workflow it returns."""
+		# Prepare the vision messages list
+		vision_messages: List[Dict[str, Any]] = [{'type': 'text', 'text': part} for part in prompt_parts]
+
+		screenshots = await self._prepare_screenshots(steps, max_images) if use_screenshots else {}
+
+		for index, step in enumerate(steps):
+			step_messages: List[Dict[str, Any]] = []  # Messages for this specific step
+
+			# 1. Text representation (JSON dump)
+			step_dict = step.model_dump(mode='json', exclude_none=True)
+			step_dict.pop('screenshot', None)  # Attached as an image below
+			step_dict.pop('domSnapshot', None)  # Only a hash, restored onto the generated steps afterwards
+			step_messages.append({'type': 'text', 'text': json.dumps(step_dict, indent=2)})
+
+			# 2. Optional screenshot
+			screenshot = screenshots.get(index)
+			if screenshot is not None:
+				step_messages.append({'type': 'text', 'text': f"<Screenshot for event type '{step.type}'>"})
+				step_messages.append({'type': 'image_url', 'image_url': {'url': screenshot.data_url}})
+
+			# Add the messages for this step to the main list
+			vision_messages.extend(step_messages)
+
+		logger.info(f'Prepared {len(vision_messages)} total message parts, including {len(screenshots)} images.')
+
+		# Invoke the LLM (structured output preferred)
+		try:
+			# Need to handle cases where structured output isn't truly supported
+			if hasattr(self.llm_structured, 'output_schema'):  # Check if it seems like structured output model
+				llm_response = await self.llm_structured.ainvoke([HumanMessage(content=cast(Any, vision_messages))])
+				# If structured output worked, llm_response is the Pydantic object
+				if isinstance(llm_response, WorkflowDefinitionSchema):
+					return llm_response
+				if isinstance(llm_response, dict):
+					return WorkflowDefinitionSchema.model_validate(llm_response)
+				# It might have returned a message or dict, try parsing its content
+				content = getattr(llm_response, 'content', str(llm_response))
+				return self._parse_llm_output_to_workflow(str(content))
+			# Fallback to basic LLM call and manual parsing
+			llm_response = await self.llm_structured.ainvoke([HumanMessage(content=cast(Any, vision_messages))])
+			llm_content = str(getattr(llm_response, 'content', llm_response))  # Get string content
+			return self._parse_llm_output_to_workflow(llm_content)
+
+		except OutputParserException as ope:
+			logger.error(f'LLM output parsing failed (OutputParserException): {ope}')
+			# Try to parse the raw output as a fallback
+			raw_output = getattr(ope, 'llm_output', str(ope))
+			logger.info('Attempting to parse raw output as fallback...')
+			try:
+				return self._parse_llm_output_to_workflow(raw_output)
+			except ValueError as ve_fallback:
+				raise ValueError(
+					f'LLM structured output failed, and fallback parsing also failed. Error: {ve_fallback}'
+				) from ve_fallback
+		except Exception as e:
+			logger.exception(f'An error occurred during LLM invocation or processing: {e}')
+			raise  # Re-raise other unexpected errors
+
+	async def _generate_patched_workflow(
+		self,
+		steps: Sequence[WorkflowStep],
+		goal: str,
+		context_parts: List[str],
+		use_screenshots: bool = False,
+		max_images: int = 20,
+	) -> WorkflowDefinitionSchema:
+		"""Convert *steps* by rules and only ask the LLM for a patch with inputs, agent steps and extractions."""
+		prebuilt = prebuild_workflow(steps)
+		prompt = self.patch_prompt_template.format(goal=goal, steps=format_steps_for_patch(prebuilt.steps))
+		messages: List[Dict[str, Any]] = [{'type': 'text', 'text': part} for part in [prompt, *context_parts]]
+		screenshots = await self._prepare_screenshots(steps, max_images) if use_screenshots else {}
+		for index, screenshot in screenshots.items():
+			messages.append({'type': 'text', 'text': f'<Screenshot for step {index}>'})
+			messages.append({'type': 'image_url', 'image_url': {'url': screenshot.data_url}})
+
+		response = await self.llm_patch.ainvoke([HumanMessage(content=cast(Any, messages))])
+		if isinstance(response, BuildPatch):
+			patch = response
+		else:
+			# LLMs without structured output answer with the patch as JSON text
+			content = getattr(response, 'content', response)
+			parsed = parse_json_response(content) if isinstance(content, str) else content
+			try:
+				patch = BuildPatch.model_validate(parsed)
+			except ValidationError as e:
+				raise ValueError(f'LLM output could not be parsed into a build patch. Error: {e}') from e
+
+		workflow, issues = apply_build_patch(prebuilt, patch)
+		for issue in issues:
+			logger.warning(f'Applying build patch: {issue}')
+		logger.info(
+			f'Build patch: {len(patch.inputs)} input(s), {len(patch.agent_steps)} agent step(s), '
+			f'{len(patch.extractions)} extraction(s), {len(patch.drop_steps)} dropped step(s)'
+		)
+		return workflow
+
+	def _cached_workflow(self, key: str) -> Optional[WorkflowDefinitionSchema]:
+		cached = self.build_cache.get(key) if self.build_cache is not None else None
+		if cached is None:
+			return None
+		try:
+			return WorkflowDefinitionSchema.model_validate_json(cached)
+		except ValidationError as e:
+			# Written by an older schema, rebuilt and overwritten
+			logger.debug(f'Ignoring invalid build cache entry: {e}')
+			return None
+
+	async def _generate_segmented_workflow(
+		self,
+		segments: List[List[WorkflowStep]],
+		goal: str,
+		prompt_str: str,
+		use_screenshots: bool,
+		max_images: int,
+		max_concurrency: int,
+		prebuild: bool,
+		cache_settings: str,
+		use_cache: bool,
+	) -> WorkflowDefinitionSchema:
+		"""Build every segment concurrently and merge the results into one workflow.
+
+		Segment outputs are also cached on their own (*cache_settings* being the generation settings part of the key),
+		so after editing a recording only the segments that changed are built again. Without *use_cache* every
+		segment is rebuilt and the cached outputs are refreshed.
+		"""
+		# Input names are guessed from the whole recording up front so all segments agree on them
+		input_names = suggest_input_names([step for segment in segments for step in segment])
+		images_per_segment = math.ceil(max_images / len(segments))
+		semaphore = asyncio.Semaphore(max_concurrency)
+
+		async def build_segment(index: int, first_event: int, steps: List[WorkflowStep]) -> WorkflowDefinitionSchema:
+			context = SEGMENT_CONTEXT_TEMPLATE.format(
+				index=index + 1,
+				count=len(segments),
+				first_event=first_event + 1,
+				input_names=', '.join(input_names) or 'none found yet, choose descriptive snake_case names',
+			)
+			cache_key = None
+			if self.build_cache is not None:
+				cache_key = self.build_cache.make_key(
+					self.llm,
+					BUILD_CACHE_VERSION,
+					'segment',
+					cache_settings,
+					goal,
+					','.join(input_names),
+					normalize_recording(steps, use_screenshots),
+				)
+				cached = self._cached_workflow(cache_key) if use_cache else None
+				if cached is not None:
+					logger.info(f'Segment {index + 1}/{len(segments)} served from build cache')
+					return cached
+
+			async with semaphore:
+				with trace_span(f'build segment {index + 1}/{len(segments)}', 'llm', steps=len(steps)):
+					if prebuild:
+						part = await self._generate_patched_workflow(steps, goal, [context], use_screenshots, images_per_segment)
+					else:
+						part = await self._generate_workflow(steps, [prompt_str, context], use_screenshots, images_per_segment)
+			if cache_key is not None and self.build_cache is not None:
+				self.build_cache.set(cache_key, part.model_dump_json())
+			return part
+
+		starts = [sum(len(segment) for segment in segments[:index]) for index in range(len(segments))]
+		logger.info(f'Building {len(segments)} segments of {[len(segment) for segment in segments]} steps concurrently')
+		parts = await asyncio.gather(
+			*(build_segment(index, start, segment) for index, (start, segment) in enumerate(zip(starts, segments)))
+		)
+		workflow, issues = merge_segment_workflows(parts)
+		for issue in issues:
+			logger.warning(f'Merging segments: {issue}')
+		return workflow
+
 	async def build_workflow(
 		self,
 		input_workflow: WorkflowDefinitionSchema,
 		user_goal: str,
 		use_screenshots: bool = False,
 		max_images: int = 20,
+		optimize: bool = False,
+		compile_extractions: bool = False,
+		segmented: bool = False,
+		max_concurrency: int = 4,
+		prebuild: bool = False,
+		use_cache: bool = True,
 	) -> WorkflowDefinitionSchema:
 		"""
 		Generates an enhanced Workflow definition from an input workflow object using an LLM.
@@ -152,7 +523,21 @@ class BuilderService:
 		    user_goal: Optional high-level description of the workflow's purpose.
 		               If None, the user might be prompted interactively.
 		    use_screenshots: Whether to include screenshots as visual context for the LLM (if available in steps).
-		    max_images: Maximum number of screenshots to include (to manage cost/tokens).
+		    max_images: Maximum number of screenshots to include (to manage cost/tokens), counted after near-duplicates
+		                of the previous screenshot are dropped.
+		    optimize: Opt-in: drop redundant recorded steps (focus clicks, duplicate key presses, scroll noise...)
+		              before prompting the LLM, and the same kind of steps from the generated workflow.
+		    compile_extractions: Whether to compile extract_page_content steps into selector based
+		                         extract_records steps using the recorded DOM snapshots (see compile_extractions).
+		    segmented: Whether to split long recordings at navigations and build the segments concurrently
+		               (one LLM call per segment instead of one for the whole recording).
+		    max_concurrency: How many segments are built at the same time.
+		    prebuild: Opt-in: convert the recorded steps by rules and only ask the LLM for a compact patch
+		              (inputs, agent steps, extractions) instead of having it regenerate every step.
+		    use_cache: Whether to return the cached workflow when the recording, goal, model, prompts and settings are
+		               unchanged since an earlier build. The result is cached either way. Only applies when the service
+		               has a build cache (``use_build_cache=True``); unchanged segments of an edited recording are only
+		               reused with ``segmented=True``.
 
 		Returns:
 		    A new WorkflowDefinitionSchema object generated by the LLM.
@@ -174,108 +559,98 @@ class BuilderService:
 				goal = ''
 		goal = goal or 'Automate the recorded browser actions.'  # Default goal if empty
 
+		# Everything besides the recording and the goal that changes what the LLM is asked
+		cache_settings = json.dumps(
+			{
+				'prompt_version': BUILDER_PROMPT_VERSION,
+				'actions': self.actions_markdown,
+				'prebuild': prebuild,
+				'use_screenshots': use_screenshots,
+				'max_images': max_images,
+				'screenshots': self.screenshot_preprocessor.config.model_dump(mode='json') if use_screenshots else None,
+			},
+			sort_keys=True,
+		)
+		cache_key = None
+		if self.build_cache is not None:
+			cache_key = self.build_cache.make_key(
+				self.llm,
+				BUILD_CACHE_VERSION,
+				'workflow',
+				cache_settings,
+				json.dumps({'optimize': optimize, 'compile_extractions': compile_extractions, 'segmented': segmented}),
+				goal,
+				normalize_recording(input_workflow.steps, use_screenshots),
+			)
+			cached = self._cached_workflow(cache_key) if use_cache else None
+			if cached is not None:
+				logger.info('Workflow served from build cache (pass use_cache=False / --no-cache to rebuild)')
+				return cached
+
+		# Noise removed from the recording costs neither prompt tokens nor replay time
+		if optimize:
+			input_workflow, _ = optimize_workflow(input_workflow)
+
 		# Format the main instruction prompt
 		prompt_str = self.prompt_template.format(
 			actions=self.actions_markdown,
 			goal=goal,
 		)
 
-		# Prepare the vision messages list
-		vision_messages: List[Dict[str, Any]] = [{'type': 'text', 'text': prompt_str}]
-
-		# Integrate message preparation logic here
-		images_used = 0
-		for step in input_workflow.steps:
-			step_messages: List[Dict[str, Any]] = []  # Messages for this specific step
-
-			# 1. Text representation (JSON dump)
-			step_dict = step.model_dump(mode='json', exclude_none=True)
-			screenshot_data = step_dict.pop('screenshot', None)  # Pop potential screenshot
-			step_messages.append({'type': 'text', 'text': json.dumps(step_dict, indent=2)})
-
-			# 2. Optional screenshot
-			attach_image = use_screenshots and images_used < max_images
-			step_type = getattr(step, 'type', step_dict.get('type'))
-
-			if attach_image and step_type != 'input':  # Don't attach for inputs
-				# Re-retrieve screenshot data if it wasn't popped (e.g., nested under 'data')
-				# This assumes screenshot might still be in the original step model or dict
-				# A bit redundant, ideally screenshot handling is consistent
-				screenshot = screenshot_data or getattr(step, 'screenshot', None) or step_dict.get('data', {}).get('screenshot')
-
-				if screenshot:
-					if isinstance(screenshot, str) and screenshot.startswith('data:'):
-						screenshot = screenshot.split(',', 1)[-1]
-
-					# Validate base64 payload
-					try:
-						base64.b64decode(cast(str, screenshot), validate=True)
-						meta = f"<Screenshot for event type '{step_type}'>"
-						step_messages.append({'type': 'text', 'text': meta})
-						step_messages.append(
-							{
-								'type': 'image_url',
-								'image_url': {'url': f'data:image/png;base64,{screenshot}'},
-							}
-						)
-						images_used += 1  # Increment image count *only* if successfully added
-					except (TypeError, ValueError, Exception) as e:
-						logger.warning(
-							f"Invalid or missing screenshot for step type '{step_type}' "
-							f'@ {step_dict.get("timestamp", "")}. Error: {e}'
-						)
-						# Don't add image messages if invalid
-
-			# Add the messages for this step to the main list
-			vision_messages.extend(step_messages)
-
-		logger.info(f'Prepared {len(vision_messages)} total message parts, including {images_used} images.')
+		segments = split_at_navigations(input_workflow.steps) if segmented else []
+		if len(segments) > 1:
+			workflow_data = await self._generate_segmented_workflow(
+				segments,
+				goal,
+				prompt_str,
+				use_screenshots,
+				max_images,
+				max_concurrency,
+				prebuild,
+				cache_settings,
+				use_cache,
+			)
+		elif prebuild:
+			workflow_data = await self._generate_patched_workflow(input_workflow.steps, goal, [], use_screenshots, max_images)
+		else:
+			workflow_data = await self._generate_workflow(input_workflow.steps, [prompt_str], use_screenshots, max_images)
 
-		# Invoke the LLM (structured output preferred)
-		try:
-			# Invoke the LLM (structured output preferred)
-			# Need to handle cases where structured output isn't truly supported
-			if hasattr(self.llm_structured, 'output_schema'):  # Check if it seems like structured output model
-				llm_response = await self.llm_structured.ainvoke([HumanMessage(content=cast(Any, vision_messages))])
-				# If structured output worked, llm_response is the Pydantic object
-				if isinstance(llm_response, WorkflowDefinitionSchema):
-					workflow_data = llm_response
-				else:
-					# It might have returned a message or dict, try parsing its content
-					content = getattr(llm_response, 'content', str(llm_response))
-					workflow_data = self._parse_llm_output_to_workflow(str(content))
-			else:
-				# Fallback to basic LLM call and manual parsing
-				llm_response = await self.llm_structured.ainvoke([HumanMessage(content=cast(Any, vision_messages))])
-				llm_content = str(getattr(llm_response, 'content', llm_response))  # Get string content
-				workflow_data = self._parse_llm_output_to_workflow(llm_content)
-
-		except OutputParserException as ope:
-			logger.error(f'LLM output parsing failed (OutputParserException): {ope}')
-			# Try to parse the raw output as a fallback
-			raw_output = getattr(ope, 'llm_output', str(ope))
-			logger.info('Attempting to parse raw output as fallback...')
-			try:
-				workflow_data = self._parse_llm_output_to_workflow(raw_output)
-			except ValueError as ve_fallback:
-				raise ValueError(
-					f'LLM structured output failed, and fallback parsing also failed. Error: {ve_fallback}'
-				) from ve_fallback
-		except Exception as e:
-			logger.exception(f'An error occurred during LLM invocation or processing: {e}')
-			raise  # Re-raise other unexpected errors
+		workflow_data = self._restore_recorded_fields(input_workflow, workflow_data)
+		if compile_extractions:
+			workflow_data = await self.compile_extractions(workflow_data)
+		if optimize:
+			workflow_data, _ = optimize_workflow(workflow_data)
 
+		if cache_key is not None and self.build_cache is not None:
+			self.build_cache.set(cache_key, workflow_data.model_dump_json())
 		# Return the workflow data object directly
 		return workflow_data
 
 	# path handlers
-	async def build_workflow_from_path(self, path: Path, user_goal: str) -> WorkflowDefinitionSchema:
+	async def build_workflow_from_path(
+		self,
+		path: Path,
+		user_goal: str,
+		optimize: bool = False,
+		compile_extractions: bool = False,
+		segmented: bool = False,
+		prebuild: bool = False,
+		use_cache: bool = True,
+	) -> WorkflowDefinitionSchema:
 		"""Build a workflow from a JSON file path."""
 		with open(path, 'r') as f:
 			workflow_data = json.load(f)
 
 		workflow_data_schema = WorkflowDefinitionSchema.model_validate(workflow_data)
-		return await self.build_workflow(workflow_data_schema, user_goal)
+		return await self.build_workflow(
+			workflow_data_schema,
+			user_goal,
+			optimize=optimize,
+			compile_extractions=compile_extractions,
+			segmented=segmented,
+			prebuild=prebuild,
+			use_cache=use_cache,
+		)
 
 	async def save_workflow_to_path(self, workflow: WorkflowDefinitionSchema, path: Path):
 		"""Save a workflow to a JSON file path."""
@@ -0,0 +1,17 @@
+import json
+
+from workflow_use.builder.service import builder_output_schema
+from workflow_use.schema.views import WorkflowDefinitionSchema
+
+
+def test_builder_schema_leaves_out_recorded_fields_and_compiled_steps():
+	schema = builder_output_schema()
+	text = json.dumps(schema)
+
+	for hidden in ('domSnapshot', 'fallbackSelectors', 'resource_blocking', 'RecordExtractionStep', 'ExtractionField'):
+		assert hidden not in text
+	assert set(schema['$defs']) >= {'ClickStep', 'InputStep', 'AgentTaskWorkflowStep', 'WorkflowInputSchemaDefinition'}
+	assert all(
+		option['$ref'].removeprefix('#/$defs/') in schema['$defs'] for option in schema['properties']['steps']['items']['anyOf']
+	)
+	assert len(text) < len(json.dumps(WorkflowDefinitionSchema.model_json_schema()))
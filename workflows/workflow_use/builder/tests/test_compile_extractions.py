@@ -0,0 +1,21 @@
+from workflow_use.builder.service import snapshot_after_step
+
+
+def test_extraction_uses_snapshot_of_next_step_on_same_tab(make_steps):
+	steps = make_steps(
+		{'type': 'click', 'cssSelector': '#search', 'tabId': 1, 'domSnapshot': 'form'},
+		{'type': 'extract_page_content', 'goal': 'results'},
+		{'type': 'click', 'cssSelector': '#other-tab', 'tabId': 2, 'domSnapshot': 'other'},
+		{'type': 'click', 'cssSelector': '#next', 'tabId': 1, 'domSnapshot': 'results'},
+	)
+
+	assert snapshot_after_step(steps, 1) == 'results'
+
+
+def test_extraction_without_later_snapshot_is_not_compiled(make_steps):
+	steps = make_steps(
+		{'type': 'click', 'cssSelector': '#search', 'tabId': 1, 'domSnapshot': 'form'},
+		{'type': 'extract_page_content', 'goal': 'results'},
+	)
+
+	assert snapshot_after_step(steps, 1) is None
@@ -0,0 +1,107 @@
+from workflow_use.builder.prebuild import apply_build_patch, prebuild_workflow
+from workflow_use.builder.views import BuildPatch, PatchAgentStep, PatchExtraction, PatchInput
+from workflow_use.schema.views import AgentTaskWorkflowStep, ClickStep, InputStep, NavigationStep
+
+
+def _navigation(url: str) -> dict:
+	return {'type': 'navigation', 'url': url}
+
+
+def _input(selector: str, value: str) -> dict:
+	return {'type': 'input', 'cssSelector': selector, 'value': value}
+
+
+def _click(selector: str) -> dict:
+	return {'type': 'click', 'cssSelector': selector}
+
+
+def _patch(**fields) -> BuildPatch:
+	return BuildPatch(name='patched', description='patched workflow', **fields)
+
+
+def test_input_is_substituted_into_value_and_url(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop.com/search?q=red%20shoes'), _input('#q', 'red shoes')))
+	patch = _patch(inputs=[PatchInput(name='query', recorded_value='red shoes', step_indexes=[0, 1])])
+
+	workflow, issues = apply_build_patch(prebuilt, patch)
+
+	navigation, input_step = workflow.steps
+	assert isinstance(navigation, NavigationStep) and isinstance(input_step, InputStep)
+	assert issues == []
+	assert navigation.url == 'https://shop.com/search?q={query}'
+	assert input_step.value == '{query}'
+	assert [(d.name, d.type, d.required) for d in workflow.input_schema] == [('query', 'string', True)]
+
+
+def test_short_value_only_replaces_whole_path_segments_and_query_values(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop1.com/p1/1?id=1&page=10')))
+	patch = _patch(inputs=[PatchInput(name='id', recorded_value='1', step_indexes=[0])])
+
+	workflow, issues = apply_build_patch(prebuilt, patch)
+
+	navigation = workflow.steps[0]
+	assert isinstance(navigation, NavigationStep)
+	assert issues == []
+	assert navigation.url == 'https://shop1.com/p1/{id}?id={id}&page=10'
+
+
+def test_value_not_found_is_reported_and_unused_input_dropped(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop.com/'), _input('#q', 'shoes')))
+	patch = _patch(inputs=[PatchInput(name='query', recorded_value='boots', step_indexes=[1])])
+
+	workflow, issues = apply_build_patch(prebuilt, patch)
+
+	input_step = workflow.steps[1]
+	assert isinstance(input_step, InputStep)
+	assert input_step.value == 'shoes'
+	assert workflow.input_schema == []
+	assert any("'boots' not found" in issue for issue in issues)
+	assert any("'query' is not used" in issue for issue in issues)
+
+
+def test_agent_step_replaces_range_and_extraction_is_inserted(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop.com/'), _click('#a'), _click('#b'), _click('#c')))
+	patch = _patch(
+		agent_steps=[PatchAgentStep(first_step=1, last_step=2, task='Pick a product')],
+		extractions=[PatchExtraction(after_step=3, goal='Read the price', output='price')],
+	)
+
+	workflow, issues = apply_build_patch(prebuilt, patch)
+
+	assert issues == []
+	assert [step.type for step in workflow.steps] == ['navigation', 'agent', 'click', 'extract_page_content']
+	agent, click = workflow.steps[1], workflow.steps[2]
+	assert isinstance(agent, AgentTaskWorkflowStep) and isinstance(click, ClickStep)
+	assert agent.task == 'Pick a product'
+	assert click.cssSelector == '#c'
+	assert workflow.steps[3].output == 'price'
+
+
+def test_out_of_range_and_overlapping_entries_are_skipped(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop.com/'), _click('#a'), _click('#b')))
+	patch = _patch(
+		agent_steps=[
+			PatchAgentStep(first_step=0, last_step=1, task='first'),
+			PatchAgentStep(first_step=1, last_step=2, task='overlapping'),
+			PatchAgentStep(first_step=2, last_step=7, task='out of range'),
+		],
+		drop_steps=[9],
+	)
+
+	workflow, issues = apply_build_patch(prebuilt, patch)
+
+	assert [step.type for step in workflow.steps] == ['agent', 'click']
+	agent = workflow.steps[0]
+	assert isinstance(agent, AgentTaskWorkflowStep)
+	assert agent.task == 'first'
+	assert len(issues) == 3
+
+
+def test_dropping_every_step_keeps_the_recorded_steps(make_steps):
+	prebuilt = prebuild_workflow(make_steps(_navigation('https://shop.com/'), _click('#a')))
+
+	workflow, issues = apply_build_patch(prebuilt, _patch(drop_steps=[0, 1]))
+
+	assert [step.type for step in workflow.steps] == ['navigation', 'click']
+	assert workflow.name == 'patched'
+	assert any('removes every step' in issue for issue in issues)
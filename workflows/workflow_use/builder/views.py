@@ -0,0 +1,42 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PatchInput(BaseModel):
+	"""A recorded value that becomes a workflow input."""
+
+	name: str = Field(..., description='snake_case name of the input.')
+	type: Literal['string', 'number', 'bool'] = 'string'
+	required: bool = True
+	recorded_value: str = Field(..., description='The value exactly as it appears in the steps.')
+	step_indexes: List[int] = Field(..., description='Steps whose value, selected option or URL contains the recorded value.')
+
+
+class PatchAgentStep(BaseModel):
+	"""A range of steps replaced by an agent task."""
+
+	first_step: int
+	last_step: int = Field(..., description='Index of the last replaced step (inclusive).')
+	task: str = Field(..., description='Task from the user perspective, may reference inputs as {input_name}.')
+	description: str = ''
+	max_steps: Optional[int] = None
+
+
+class PatchExtraction(BaseModel):
+	"""A page extraction inserted after a step."""
+
+	after_step: int
+	goal: str
+	output: Optional[str] = Field(default=None, description='Context key the extracted data is stored under.')
+
+
+class BuildPatch(BaseModel):
+	"""The decisions the builder LLM makes about a pre-built workflow, everything else is converted by rules."""
+
+	name: str
+	description: str
+	inputs: List[PatchInput] = Field(default_factory=list)
+	agent_steps: List[PatchAgentStep] = Field(default_factory=list)
+	extractions: List[PatchExtraction] = Field(default_factory=list)
+	drop_steps: List[int] = Field(default_factory=list, description='Steps that are side effects of other steps.')
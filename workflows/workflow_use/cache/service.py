@@ -0,0 +1,361 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol
+from urllib.parse import urlparse
+
+from workflow_use.cache.views import CacheStats, SelectorOutcome
+
+logger = logging.getLogger(__name__)
+
+
+def get_default_cache_dir() -> Path:
+	"""Directory for on-disk caches, overridable with WORKFLOW_USE_CACHE_DIR."""
+	return Path(os.getenv('WORKFLOW_USE_CACHE_DIR', './tmp/cache'))
+
+
+class CacheBackend(Protocol):
+	"""Minimal interface a cache backend has to implement, DiskCache is the default one."""
+
+	def get(self, key: str) -> Optional[str]: ...
+
+	def set(self, key: str, value: str) -> None: ...
+
+	def stats(self) -> CacheStats: ...
+
+
+class DiskCache:
+	"""
+	Small persistent key/value store backed by SQLite.
+
+	Entries expire after ``ttl_s`` and the least recently used entries are
+	evicted once the stored values exceed ``max_size_bytes``. SQLite's WAL mode
+	and locking make the cache safe to share between concurrent runs and
+	processes; read-modify-write goes through :py:meth:`update`, which runs in a
+	single write transaction.
+	"""
+
+	def __init__(self, path: str | Path, *, ttl_s: float | None = None, max_size_bytes: int | None = None) -> None:
+		self.path = Path(path)
+		self.ttl_s = ttl_s
+		self.max_size_bytes = max_size_bytes
+
+		self._conn: Optional[sqlite3.Connection] = None
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+	# --- Connection ---
+	def _connection(self) -> sqlite3.Connection:
+		if self._conn is None:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+			conn.execute('PRAGMA journal_mode=WAL')
+			conn.execute('PRAGMA synchronous=NORMAL')
+			conn.execute(
+				'CREATE TABLE IF NOT EXISTS entries ('
+				'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+				'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+			)
+			conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries(accessed_at)')
+			conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries(created_at)')
+			self._conn = conn
+		return self._conn
+
+	def close(self) -> None:
+		with self._lock:
+			if self._conn is not None:
+				self._conn.close()
+				self._conn = None
+
+	# --- Public API ---
+	def get(self, key: str) -> Optional[str]:
+		with self._lock:
+			conn = self._connection()
+			now = time.time()
+			row = conn.execute('SELECT value, created_at FROM entries WHERE key = ?', (key,)).fetchone()
+			if row is None or self._is_expired(row[1], now):
+				if row is not None:
+					conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+				self._misses += 1
+				return None
+			conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+			self._hits += 1
+			return row[0]
+
+	def set(self, key: str, value: str) -> None:
+		with self._lock:
+			conn = self._connection()
+			conn.execute('BEGIN IMMEDIATE')
+			try:
+				self._write(conn, key, value, time.time())
+				self._evict(conn)
+				conn.execute('COMMIT')
+			except BaseException:
+				conn.execute('ROLLBACK')
+				raise
+
+	def update(self, key: str, func: Callable[[Optional[str]], Optional[str]]) -> Optional[str]:
+		"""Atomically replace the value of *key* with ``func(current_value)``. Returning None deletes the entry."""
+		with self._lock:
+			conn = self._connection()
+			conn.execute('BEGIN IMMEDIATE')
+			try:
+				now = time.time()
+				row = conn.execute('SELECT value, created_at FROM entries WHERE key = ?', (key,)).fetchone()
+				current = row[0] if row is not None and not self._is_expired(row[1], now) else None
+				new_value = func(current)
+				if new_value is None:
+					conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+				else:
+					self._write(conn, key, new_value, now)
+					self._evict(conn)
+				conn.execute('COMMIT')
+				return new_value
+			except BaseException:
+				conn.execute('ROLLBACK')
+				raise
+
+	def delete(self, key: str) -> None:
+		with self._lock:
+			self._connection().execute('DELETE FROM entries WHERE key = ?', (key,))
+
+	def clear(self) -> None:
+		with self._lock:
+			self._connection().execute('DELETE FROM entries')
+
+	def stats(self) -> CacheStats:
+		with self._lock:
+			entries, size = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+		return CacheStats(
+			entries=entries,
+			size_bytes=size,
+			hits=self._hits,
+			misses=self._misses,
+			evictions=self._evictions,
+		)
+
+	# --- Internals ---
+	def _is_expired(self, created_at: float, now: float) -> bool:
+		return self.ttl_s is not None and now - created_at > self.ttl_s
+
+	@staticmethod
+	def _write(conn: sqlite3.Connection, key: str, value: str, now: float) -> None:
+		conn.execute(
+			'INSERT INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?) '
+			'ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, '
+			'created_at = excluded.created_at, accessed_at = excluded.accessed_at',
+			(key, value, len(value.encode('utf-8')), now, now),
+		)
+
+	def _evict(self, conn: sqlite3.Connection) -> None:
+		"""Drop expired entries, then least recently used ones until the cache fits into max_size_bytes."""
+		if self.ttl_s is not None:
+			cursor = conn.execute('DELETE FROM entries WHERE created_at < ?', (time.time() - self.ttl_s,))
+			self._evictions += max(cursor.rowcount, 0)
+
+		if self.max_size_bytes is None:
+			return
+		(total,) = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()
+		excess = total - self.max_size_bytes
+		if excess <= 0:
+			return
+
+		keys_to_delete = []
+		for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed_at ASC'):
+			if excess <= 0:
+				break
+			keys_to_delete.append((key,))
+			excess -= size
+		conn.executemany('DELETE FROM entries WHERE key = ?', keys_to_delete)
+		self._evictions += len(keys_to_delete)
+
+
+# --- Selector outcome cache ---
+
+# Entries that keep failing are dropped so a stale promotion never costs more than a few lookups
+MAX_SELECTOR_FAILURES = 3
+
+
+class SelectorCache:
+	"""
+	Remembers which selector candidate resolved each workflow step, keyed by
+	workflow name and version, step index and page origin, so later runs try
+	the candidate that actually worked first.
+	"""
+
+	def __init__(
+		self,
+		path: str | Path | None = None,
+		*,
+		ttl_s: float | None = 30 * 24 * 3600,
+		max_size_bytes: int | None = 8 * 1024 * 1024,
+	) -> None:
+		self.store = DiskCache(path or get_default_cache_dir() / 'selectors.sqlite', ttl_s=ttl_s, max_size_bytes=max_size_bytes)
+
+	@staticmethod
+	def make_key(workflow_name: str, workflow_version: str, step_index: int, url: str) -> str:
+		parsed = urlparse(url)
+		origin = f'{parsed.scheme}://{parsed.netloc}' if parsed.netloc else url
+		return f'{workflow_name}@{workflow_version}#{step_index}|{origin}'
+
+	def get(self, key: str) -> Optional[SelectorOutcome]:
+		try:
+			value = self.store.get(key)
+			return SelectorOutcome.model_validate_json(value) if value else None
+		except Exception as e:
+			logger.debug(f'Selector cache read failed: {e}')
+			return None
+
+	def record_success(self, key: str, selector: str, kind: str, elapsed_ms: float) -> None:
+		def _apply(current: Optional[str]) -> str:
+			outcome = SelectorOutcome.model_validate_json(current) if current else None
+			if outcome is None or outcome.selector != selector:
+				outcome = SelectorOutcome(selector=selector, kind=kind)  # type: ignore[arg-type]
+			outcome.successes += 1
+			outcome.failures = 0
+			outcome.elapsed_ms = elapsed_ms
+			outcome.updated_at = time.time()
+			return outcome.model_dump_json()
+
+		self._safe_update(key, _apply)
+
+	def record_failure(self, key: str, selector: str) -> None:
+		def _apply(current: Optional[str]) -> Optional[str]:
+			if not current:
+				return None
+			outcome = SelectorOutcome.model_validate_json(current)
+			if outcome.selector != selector:
+				return current
+			outcome.failures += 1
+			outcome.updated_at = time.time()
+			return None if outcome.failures >= MAX_SELECTOR_FAILURES else outcome.model_dump_json()
+
+		self._safe_update(key, _apply)
+
+	def _safe_update(self, key: str, func: Callable[[Optional[str]], Optional[str]]) -> None:
+		# The cache is an optimization, it must never break a run
+		try:
+			self.store.update(key, func)
+		except Exception as e:
+			logger.debug(f'Selector cache write failed: {e}')
+
+
+# --- LLM extraction cache ---
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _llm_identity(llm: Any) -> str:
+	"""Stable description of the model and the settings that change its output."""
+	try:
+		params = dict(llm._identifying_params)
+	except Exception:
+		params = {}
+	params['_type'] = type(llm).__name__
+	params['temperature'] = getattr(llm, 'temperature', None)
+	return json.dumps(params, sort_keys=True, default=str)
+
+
+class ExtractionCache:
+	"""
+	Content-addressed cache for page extraction LLM responses.
+
+	The key is a hash of the model (and its settings), the prompt template, the
+	extraction goal and the whitespace-normalized page content, so a repeated
+	extraction of an unchanged page returns the stored response instead of
+	calling the LLM again.
+	"""
+
+	def __init__(
+		self,
+		backend: CacheBackend | None = None,
+		*,
+		path: str | Path | None = None,
+		ttl_s: float | None = 7 * 24 * 3600,
+		max_size_bytes: int | None = 64 * 1024 * 1024,
+	) -> None:
+		self.backend: CacheBackend = backend or DiskCache(
+			path or get_default_cache_dir() / 'extractions.sqlite', ttl_s=ttl_s, max_size_bytes=max_size_bytes
+		)
+
+	@staticmethod
+	def make_key(llm: Any, template: str, goal: str, content: str) -> str:
+		normalized = _WHITESPACE_PATTERN.sub(' ', content).strip()
+		digest = hashlib.sha256()
+		for part in (_llm_identity(llm), template, goal, normalized):
+			digest.update(part.encode('utf-8'))
+			digest.update(b'\0')
+		return f'extract:{digest.hexdigest()}'
+
+	def get(self, key: str) -> Optional[str]:
+		try:
+			return self.backend.get(key)
+		except Exception as e:
+			logger.debug(f'Extraction cache read failed: {e}')
+			return None
+
+	def set(self, key: str, value: str) -> None:
+		try:
+			self.backend.set(key, value)
+		except Exception as e:
+			logger.debug(f'Extraction cache write failed: {e}')
+
+	def stats(self) -> CacheStats:
+		return self.backend.stats()
+
+
+# --- Workflow build cache ---
+
+
+class BuildCache:
+	"""
+	Cache for workflows built from recordings, and for the outputs of single recording segments.
+
+	The key is a hash of the model (and its settings) and of every input of the build (normalized recording, goal,
+	prompt version, screenshot settings and build options), so rebuilding an unchanged recording is instant and a
+	segmented build only calls the LLM for the segments that changed.
+	"""
+
+	def __init__(
+		self,
+		backend: CacheBackend | None = None,
+		*,
+		path: str | Path | None = None,
+		ttl_s: float | None = 30 * 24 * 3600,
+		max_size_bytes: int | None = 64 * 1024 * 1024,
+	) -> None:
+		self.backend: CacheBackend = backend or DiskCache(
+			path or get_default_cache_dir() / 'builds.sqlite', ttl_s=ttl_s, max_size_bytes=max_size_bytes
+		)
+
+	@staticmethod
+	def make_key(llm: Any, *parts: str) -> str:
+		digest = hashlib.sha256()
+		for part in (_llm_identity(llm), *parts):
+			digest.update(part.encode('utf-8'))
+			digest.update(b'\0')
+		return f'build:{digest.hexdigest()}'
+
+	def get(self, key: str) -> Optional[str]:
+		try:
+			return self.backend.get(key)
+		except Exception as e:
+			logger.debug(f'Build cache read failed: {e}')
+			return None
+
+	def set(self, key: str, value: str) -> None:
+		try:
+			self.backend.set(key, value)
+		except Exception as e:
+			logger.debug(f'Build cache write failed: {e}')
+
+	def stats(self) -> CacheStats:
+		return self.backend.stats()
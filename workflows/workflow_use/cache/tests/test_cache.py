@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from workflow_use.cache.service import MAX_SELECTOR_FAILURES, DiskCache, SelectorCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	"""Replaces time.time with a clock the test advances by hand."""
+	now = [1_000.0]
+	monkeypatch.setattr(time, 'time', lambda: now[0])
+	return now
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+	cache = DiskCache(tmp_path / 'cache.sqlite', ttl_s=60)
+	cache.set('key', 'value')
+
+	clock[0] += 59
+	assert cache.get('key') == 'value'
+	clock[0] += 2
+	assert cache.get('key') is None
+
+	stats = cache.stats()
+	assert (stats.entries, stats.hits, stats.misses) == (0, 1, 1)
+	cache.close()
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+	cache = DiskCache(tmp_path / 'cache.sqlite', max_size_bytes=10)
+	cache.set('a', 'aaaa')
+	clock[0] += 1
+	cache.set('b', 'bbbb')
+	clock[0] += 1
+	assert cache.get('a') == 'aaaa'
+	clock[0] += 1
+
+	cache.set('c', 'cccc')
+
+	assert (cache.get('a'), cache.get('b'), cache.get('c')) == ('aaaa', None, 'cccc')
+	stats = cache.stats()
+	assert (stats.entries, stats.size_bytes, stats.evictions) == (2, 8, 1)
+	cache.close()
+
+
+def test_selector_is_dropped_after_repeated_failures(tmp_path):
+	cache = SelectorCache(tmp_path / 'selectors.sqlite')
+	key = SelectorCache.make_key('login', '1.0', 2, 'https://example.com/login?next=/')
+	assert key == SelectorCache.make_key('login', '1.0', 2, 'https://example.com/account')
+
+	cache.record_success(key, '#submit', 'css', 12.0)
+	cache.record_failure(key, '#other')
+	for _ in range(MAX_SELECTOR_FAILURES - 1):
+		cache.record_failure(key, '#submit')
+	outcome = cache.get(key)
+	assert outcome is not None and (outcome.selector, outcome.failures) == ('#submit', MAX_SELECTOR_FAILURES - 1)
+
+	# A success resets the count
+	cache.record_success(key, '#submit', 'css', 8.0)
+	outcome = cache.get(key)
+	assert outcome is not None and (outcome.successes, outcome.failures) == (2, 0)
+
+	for _ in range(MAX_SELECTOR_FAILURES):
+		cache.record_failure(key, '#submit')
+	assert cache.get(key) is None
+	cache.store.close()
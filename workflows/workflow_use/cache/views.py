@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class CacheStats(BaseModel):
+	"""Counters of a DiskCache (hits/misses/evictions are counted per process)."""
+
+	entries: int = 0
+	size_bytes: int = 0
+	hits: int = 0
+	misses: int = 0
+	evictions: int = 0
+
+
+class SelectorOutcome(BaseModel):
+	"""Which selector candidate last resolved a step's element, and how well it has been doing."""
+
+	selector: str
+	kind: Literal['original', 'css', 'text', 'xpath']
+	elapsed_ms: float = Field(default=0.0, description='Resolution time of the last successful lookup.')
+	successes: int = 0
+	failures: int = 0
+	updated_at: float = 0.0
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, List, Sequence
+
+from browser_use.agent.views import ActionResult, AgentHistoryList
+
+from workflow_use.checkpoint.views import RunCheckpoint
+from workflow_use.schema.views import WorkflowStep
+
+logger = logging.getLogger(__name__)
+
+
+def get_default_checkpoint_dir() -> Path:
+	"""Directory run checkpoints are written to, overridable with WORKFLOW_USE_CHECKPOINT_DIR."""
+	return Path(os.getenv('WORKFLOW_USE_CHECKPOINT_DIR', './tmp/checkpoints'))
+
+
+def steps_fingerprint(steps: Sequence[WorkflowStep]) -> str:
+	payload = json.dumps([step.model_dump(mode='json', exclude_none=True) for step in steps], sort_keys=True)
+	return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def serialize_step_result(result: ActionResult | AgentHistoryList) -> dict[str, Any]:
+	"""Serialize a step result for a checkpoint.
+
+	Agent histories hold live model output types and cannot be restored, they are summarized
+	into one ActionResult carrying everything the agent extracted.
+	"""
+	if isinstance(result, AgentHistoryList):
+		contents = [r.extracted_content for item in result.history for r in item.result if r.extracted_content]
+		result = ActionResult(
+			is_done=result.is_done(),
+			success=result.is_successful(),
+			extracted_content='\n\n'.join(contents) if contents else None,
+			include_in_memory=True,
+		)
+	return result.model_dump(mode='json')
+
+
+def restore_step_results(serialized: List[dict[str, Any]]) -> List[ActionResult | AgentHistoryList]:
+	return [ActionResult.model_validate(item) for item in serialized]
+
+
+class CheckpointStore:
+	"""Stores one JSON checkpoint file per run id.
+
+	Checkpoints hold session secrets in plaintext: the browser's cookies and localStorage and the run inputs. The
+	files are only readable by the current user (0600), keep the directory out of backups and shared folders.
+	"""
+
+	def __init__(self, directory: str | Path | None = None) -> None:
+		self.directory = Path(directory) if directory else get_default_checkpoint_dir()
+
+	def path_for(self, run_id: str) -> Path:
+		if not re.fullmatch(r'[A-Za-z0-9_.-]+', run_id):
+			raise ValueError(f'Invalid run id: {run_id!r}')
+		return self.directory / f'{run_id}.checkpoint.json'
+
+	def save(self, checkpoint: RunCheckpoint) -> None:
+		checkpoint.updated_at = time.time()
+		path = self.path_for(checkpoint.run_id)
+		path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+		# Write-then-rename, a crash while saving must not destroy the previous checkpoint
+		tmp_path = path.with_suffix('.tmp')
+		tmp_path.unlink(missing_ok=True)
+		fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+		with os.fdopen(fd, 'w', encoding='utf-8') as f:
+			f.write(checkpoint.model_dump_json())
+		os.replace(tmp_path, path)
+
+	def load(self, run_id: str) -> RunCheckpoint:
+		path = self.path_for(run_id)
+		if not path.exists():
+			raise FileNotFoundError(f'No checkpoint found for run {run_id} in {self.directory}')
+		return RunCheckpoint.model_validate_json(path.read_text(encoding='utf-8'))
+
+	def delete(self, run_id: str) -> None:
+		self.path_for(run_id).unlink(missing_ok=True)
+
+	def list(self) -> List[RunCheckpoint]:
+		if not self.directory.exists():
+			return []
+		checkpoints = []
+		for path in self.directory.glob('*.checkpoint.json'):
+			try:
+				checkpoints.append(RunCheckpoint.model_validate_json(path.read_text(encoding='utf-8')))
+			except Exception as e:
+				logger.debug(f'Skipping unreadable checkpoint {path}: {e}')
+		return sorted(checkpoints, key=lambda checkpoint: checkpoint.updated_at, reverse=True)
+
+
+async def capture_browser_state(browser_session: Any) -> tuple[dict[str, Any] | None, str | None]:
+	"""Return the storage state (cookies + localStorage) and URL of the session's current page."""
+	storage_state = None
+	current_url = None
+	try:
+		if browser_session.browser_context is not None:
+			storage_state = await browser_session.browser_context.storage_state()
+		current_url = (await browser_session.get_current_page()).url
+	except Exception as e:
+		logger.debug(f'Could not capture browser state for checkpoint: {e}')
+	return storage_state, current_url
+
+
+async def restore_browser_state(browser_session: Any, storage_state: dict[str, Any] | None, current_url: str | None) -> None:
+	"""Restore cookies and localStorage into a started session and reopen the page the run was on."""
+	page = await browser_session.get_current_page()
+	if storage_state:
+		cookies = storage_state.get('cookies') or []
+		if cookies:
+			await browser_session.browser_context.add_cookies(cookies)
+		# localStorage can only be written from a document of the same origin
+		for origin in storage_state.get('origins') or []:
+			items = origin.get('localStorage') or []
+			if not items:
+				continue
+			try:
+				await page.goto(origin['origin'])
+				await page.evaluate(
+					'(items) => { for (const { name, value } of items) localStorage.setItem(name, value); }',
+					items,
+				)
+			except Exception as e:
+				logger.warning(f'Could not restore localStorage of {origin.get("origin")}: {e}')
+	if current_url and current_url != 'about:blank':
+		await page.goto(current_url)
+		await page.wait_for_load_state()
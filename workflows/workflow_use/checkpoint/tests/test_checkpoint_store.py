@@ -0,0 +1,24 @@
+import stat
+
+from workflow_use.checkpoint.service import CheckpointStore
+from workflow_use.checkpoint.views import RunCheckpoint
+
+
+def test_checkpoint_is_only_readable_by_the_owner(tmp_path):
+	store = CheckpointStore(tmp_path / 'checkpoints')
+	checkpoint = RunCheckpoint(
+		run_id='run-1',
+		workflow_name='login',
+		workflow_version='1.0',
+		steps_fingerprint='abc',
+		inputs={'password': 'secret'},
+		storage_state={'cookies': [{'name': 'session', 'value': 'token'}], 'origins': []},
+	)
+
+	store.save(checkpoint)
+	store.save(checkpoint)
+
+	path = store.path_for('run-1')
+	assert stat.S_IMODE(path.stat().st_mode) == 0o600
+	assert store.load('run-1').storage_state == checkpoint.storage_state
+	assert [path.name for path in store.directory.iterdir()] == ['run-1.checkpoint.json']
@@ -0,0 +1,24 @@
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RunCheckpoint(BaseModel):
+	"""State of a workflow run after its last completed step."""
+
+	run_id: str
+	workflow_name: str
+	workflow_version: str
+	steps_fingerprint: str = Field(..., description='Hash of the steps the run was started with, resuming needs the same steps.')
+	inputs: Dict[str, Any] = Field(default_factory=dict)
+	next_step_index: int = Field(default=0, description='Index of the first step that has not completed yet.')
+	context: Dict[str, Any] = Field(default_factory=dict)
+	step_results: List[Dict[str, Any]] = Field(default_factory=list, description='Serialized ActionResult per completed step.')
+	storage_state: Optional[Dict[str, Any]] = Field(
+		default=None, description='Playwright storage state (cookies and localStorage).'
+	)
+	current_url: Optional[str] = None
+	status: Literal['running', 'failed', 'completed'] = 'running'
+	error: Optional[str] = None
+	updated_at: float = Field(default_factory=time.time)
@@ -0,0 +1,17 @@
+from typing import Callable, List
+
+import pytest
+
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowStep
+
+
+@pytest.fixture
+def make_steps() -> Callable[..., List[WorkflowStep]]:
+	"""Validate step dicts the same way the steps of a workflow file are loaded."""
+
+	def make(*steps: dict) -> List[WorkflowStep]:
+		return WorkflowDefinitionSchema.model_validate(
+			{'name': 'w', 'description': '', 'version': '1.0', 'input_schema': [], 'steps': list(steps)}
+		).steps
+
+	return make
@@ -1,12 +1,12 @@
-import asyncio
+import json
 import logging
 
 from browser_use import Browser
 from browser_use.agent.views import ActionResult
 from browser_use.controller.service import Controller
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import PromptTemplate
 
+from workflow_use.cache.service import ExtractionCache, SelectorCache
 from workflow_use.controller.utils import get_best_element_handle, truncate_selector
 from workflow_use.controller.views import (
 	ClickElementDeterministicAction,
@@ -14,9 +14,12 @@ from workflow_use.controller.views import (
 	KeyPressDeterministicAction,
 	NavigationAction,
 	PageExtractionAction,
+	RecordExtractionAction,
 	ScrollDeterministicAction,
 	SelectDropdownOptionDeterministicAction,
+	StepContext,
 )
+from workflow_use.extraction.service import ContentPipeline, extract_records_from_page
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +57,25 @@ DISABLED_DEFAULT_ACTIONS = [
 
 
 class WorkflowController(Controller):
-	def __init__(self, *args, **kwargs):
+	def __init__(
+		self,
+		*args,
+		use_selector_cache: bool = False,
+		selector_cache: SelectorCache | None = None,
+		use_extraction_cache: bool = False,
+		extraction_cache: ExtractionCache | None = None,
+		content_pipeline: ContentPipeline | None = None,
+		**kwargs,
+	):
 		# Pass the list of actions to exclude to the base class constructor
 		super().__init__(*args, exclude_actions=DISABLED_DEFAULT_ACTIONS, **kwargs)
+		# Opt-in: remembers which selector resolved each step in ./tmp/cache/selectors.sqlite (opened on first use)
+		self.selector_cache = selector_cache or (SelectorCache() if use_selector_cache else None)
+		# Opt-in, the responses can hold personal data: extractions of unchanged pages and goals are answered from
+		# ./tmp/cache/extractions.sqlite instead of the LLM
+		self.extraction_cache = extraction_cache or (ExtractionCache() if use_extraction_cache else None)
+		# Prunes, deduplicates and chunks page content so extraction prompts stay within a token budget
+		self.content_pipeline = content_pipeline or ContentPipeline()
 		self.__register_actions()
 
 	def __register_actions(self):
@@ -78,7 +97,9 @@ class WorkflowController(Controller):
 			'Click element by all available selectors',
 			param_model=ClickElementDeterministicAction,
 		)
-		async def click(params: ClickElementDeterministicAction, browser_session: Browser) -> ActionResult:
+		async def click(
+			params: ClickElementDeterministicAction, browser_session: Browser, context: StepContext | None = None
+		) -> ActionResult:
 			"""Click the first element matching *params.cssSelector* with fallback mechanisms."""
 			page = await browser_session.get_current_page()
 			original_selector = params.cssSelector
@@ -89,6 +110,8 @@ class WorkflowController(Controller):
 					params.cssSelector,
 					params,
 					timeout_ms=DEFAULT_ACTION_TIMEOUT_MS,
+					cache=self.selector_cache,
+					step_context=context,
 				)
 				await locator.click(force=True)
 
@@ -109,6 +132,7 @@ class WorkflowController(Controller):
 			params: InputTextDeterministicAction,
 			browser_session: Browser,
 			has_sensitive_data: bool = False,
+			context: StepContext | None = None,
 		) -> ActionResult:
 			"""Fill text into the element located with *params.cssSelector*."""
 			page = await browser_session.get_current_page()
@@ -120,6 +144,8 @@ class WorkflowController(Controller):
 					params.cssSelector,
 					params,
 					timeout_ms=DEFAULT_ACTION_TIMEOUT_MS,
+					cache=self.selector_cache,
+					step_context=context,
 				)
 
 				# Check if it's a SELECT element
@@ -130,11 +156,10 @@ class WorkflowController(Controller):
 						include_in_memory=True,
 					)
 
-				# Add a small delay and click to ensure the element is focused
+				# Click to ensure the element is focused; playwright already waits for the element to be
+				# actionable and the page is settled by the workflow's readiness engine afterwards
 				await locator.fill(params.value)
-				await asyncio.sleep(0.5)
 				await locator.click(force=True)
-				await asyncio.sleep(0.5)
 
 				msg = f'⌨️  Input "{params.value}" into element with CSS selector: {truncate_selector(selector_used)} (original: {truncate_selector(original_selector)})'
 				logger.info(msg)
@@ -149,7 +174,9 @@ class WorkflowController(Controller):
 			'Select dropdown option by all available selectors and visible text',
 			param_model=SelectDropdownOptionDeterministicAction,
 		)
-		async def select_change(params: SelectDropdownOptionDeterministicAction, browser_session: Browser) -> ActionResult:
+		async def select_change(
+			params: SelectDropdownOptionDeterministicAction, browser_session: Browser, context: StepContext | None = None
+		) -> ActionResult:
 			"""Select dropdown option whose visible text equals *params.value*."""
 			page = await browser_session.get_current_page()
 			original_selector = params.cssSelector
@@ -160,6 +187,8 @@ class WorkflowController(Controller):
 					params.cssSelector,
 					params,
 					timeout_ms=DEFAULT_ACTION_TIMEOUT_MS,
+					cache=self.selector_cache,
+					step_context=context,
 				)
 
 				await locator.select_option(label=params.selectedText)
@@ -177,13 +206,17 @@ class WorkflowController(Controller):
 			'Press key on element by all available selectors',
 			param_model=KeyPressDeterministicAction,
 		)
-		async def key_press(params: KeyPressDeterministicAction, browser_session: Browser) -> ActionResult:
+		async def key_press(
+			params: KeyPressDeterministicAction, browser_session: Browser, context: StepContext | None = None
+		) -> ActionResult:
 			"""Press *params.key* on the element identified by *params.cssSelector*."""
 			page = await browser_session.get_current_page()
 			original_selector = params.cssSelector
 
 			try:
-				locator, selector_used = await get_best_element_handle(page, params.cssSelector, params, timeout_ms=5000)
+				locator, selector_used = await get_best_element_handle(
+					page, params.cssSelector, params, timeout_ms=5000, cache=self.selector_cache, step_context=context
+				)
 
 				await locator.press(params.key)
 
@@ -215,27 +248,51 @@ class WorkflowController(Controller):
 			params: PageExtractionAction, browser_session: Browser, page_extraction_llm: BaseChatModel
 		):
 			page = await browser_session.get_current_page()
-			import markdownify
-
-			strip = ['a', 'img']
-
-			content = markdownify.markdownify(await page.content(), strip=strip)
-
-			# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
-			for iframe in page.frames:
-				if iframe.url != page.url and not iframe.url.startswith('data:'):
-					content += f'\n\nIFRAME {iframe.url}:\n'
-					content += markdownify.markdownify(await iframe.content())
+			content = await self.content_pipeline.collect(page, page_extraction_llm)
+			logger.info(
+				f'Page content: {content.tokens} tokens in {len(content.chunks)} chunk(s), '
+				f'{content.iframe_count} iframe(s), {content.duplicate_blocks} duplicate block(s) dropped'
+			)
 
 			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
-			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
 			try:
-				output = await page_extraction_llm.ainvoke(template.format(goal=params.goal, page=content))
-				msg = f'📄  Extracted from page\n: {output.content}\n'
+				output = await self.content_pipeline.extract(
+					content, params.goal, page_extraction_llm, prompt, cache=self.extraction_cache
+				)
+				msg = f'📄  Extracted from page\n: {output}\n'
+				if content.truncated_chunks:
+					msg += (
+						f'Note: the page was cut off, the last {content.truncated_chunks} of '
+						f'{len(content.chunks) + content.truncated_chunks} chunks were not extracted\n'
+					)
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 			except Exception as e:
 				logger.debug(f'Error extracting content: {e}')
-				msg = f'📄  Extracted from page\n: {content}\n'
+				msg = f'📄  Extracted from page\n: {content.text}\n'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg)
+
+		# Extract records ------------------------------------------------------------
+		@self.registry.action(
+			'Extract a list of records from the page with CSS selectors, without an LLM',
+			param_model=RecordExtractionAction,
+		)
+		async def extract_records(params: RecordExtractionAction, browser_session: Browser) -> ActionResult:
+			"""Read every element matching *params.record_selector* into a JSON record of *params.fields*."""
+			page = await browser_session.get_current_page()
+			try:
+				if not params.allow_empty:
+					# Lists rendered after the page load are waited for, not reported as empty
+					await page.wait_for_selector(params.record_selector, state='attached', timeout=5000)
+				records = await extract_records_from_page(page, params.record_selector, params.fields, params.limit)
+			except Exception as e:
+				error_msg = (
+					f'Failed to extract records. Record selector: {truncate_selector(params.record_selector)}. Error: {str(e)}'
+				)
+				logger.error(error_msg)
+				raise Exception(error_msg)
+
+			logger.info(f'📋  Extracted {len(records)} record(s) with selector: {truncate_selector(params.record_selector)}')
+			# Stored as JSON in the workflow context when the step has an output
+			return ActionResult(extracted_content=json.dumps(records, ensure_ascii=False), include_in_memory=True)
@@ -1,5 +1,11 @@
+import asyncio
 import logging
 import re
+import time
+
+from workflow_use.cache.service import SelectorCache
+from workflow_use.controller.views import SelectorResolution, StepContext
+from workflow_use.tracing.service import trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -9,43 +15,314 @@ def truncate_selector(selector: str, max_length: int = 35) -> str:
 	return selector if len(selector) <= max_length else f'{selector[:max_length]}...'
 
 
-async def get_best_element_handle(page, selector, params=None, timeout_ms=500):
-	"""Find element using stability-ranked selector strategies."""
-	original_selector = selector
-
-	# Generate stability-ranked fallback selectors
-	fallbacks = generate_stable_selectors(selector, params)
-
-	# Try all selectors with exponential backoff for timeouts
-	selectors_to_try = [original_selector] + fallbacks
+# Checks every candidate in a single round trip and polls until one of them matches exactly one visible
+# element. Returns the index of the best-ranked (lowest index) match, or -1 on timeout. Candidates the
+# browser's native engines cannot evaluate are reported in `unsupported`.
+PROBE_SELECTORS_JS = """
+({ candidates, timeoutMs }) => new Promise((resolve) => {
+	const start = performance.now();
+	const unsupported = new Set();
+	const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+	const isVisible = (el) => {
+		const rect = el.getBoundingClientRect();
+		return rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+	};
+	const query = (candidate, index) => {
+		try {
+			if (candidate.kind === 'xpath') {
+				const snapshot = document.evaluate(candidate.selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+				const nodes = [];
+				for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+				return nodes;
+			}
+			const nodes = Array.from(document.querySelectorAll(candidate.selector));
+			if (candidate.kind === 'text') {
+				const text = normalize(candidate.text);
+				return nodes.filter((el) => normalize(el.textContent).includes(text));
+			}
+			return nodes;
+		} catch (e) {
+			unsupported.add(index);
+			return [];
+		}
+	};
+	const tick = () => {
+		for (let i = 0; i < candidates.length; i++) {
+			const matches = query(candidates[i], i);
+			if (matches.length === 1 && isVisible(matches[0])) {
+				resolve({ index: i, unsupported: [...unsupported] });
+				return;
+			}
+		}
+		if (performance.now() - start >= timeoutMs) {
+			resolve({ index: -1, unsupported: [...unsupported] });
+			return;
+		}
+		setTimeout(tick, 50);
+	};
+	tick();
+})
+"""
+
+# Fills a run of form fields in one round trip. Every target is resolved first (with the same "exactly one
+# visible match" rule as the probe) and nothing is touched unless all of them resolve, so the caller can fall
+# back to filling the fields one by one. Values are set through the native setters followed by bubbling
+# input/change events, which is what frameworks with controlled inputs (React, Vue, Angular) listen to.
+FILL_FIELDS_JS = """
+({ fields }) => {
+	const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+	const isVisible = (el) => {
+		const rect = el.getBoundingClientRect();
+		return rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+	};
+	const query = (candidate) => {
+		try {
+			if (candidate.kind === 'xpath') {
+				const snapshot = document.evaluate(candidate.selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+				const nodes = [];
+				for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+				return nodes;
+			}
+			const nodes = Array.from(document.querySelectorAll(candidate.selector));
+			if (candidate.kind === 'text') {
+				const text = normalize(candidate.text);
+				return nodes.filter((el) => normalize(el.textContent).includes(text));
+			}
+			return nodes;
+		} catch (e) {
+			return [];
+		}
+	};
+	const fail = (index, reason) => ({ ok: false, failed: index, reason });
+
+	const targets = [];
+	for (let i = 0; i < fields.length; i++) {
+		const field = fields[i];
+		let element = null;
+		let found = -1;
+		for (let c = 0; c < field.candidates.length; c++) {
+			const matches = query(field.candidates[c]);
+			if (matches.length === 1 && isVisible(matches[0])) {
+				element = matches[0];
+				found = c;
+				break;
+			}
+		}
+		if (!element) return fail(i, 'element not found');
+		if (field.kind === 'focus') {
+			targets.push({ element, found });
+			continue;
+		}
+		if (element.disabled || element.readOnly) return fail(i, 'element is not editable');
+		const tag = element.tagName;
+		if (field.kind === 'select') {
+			if (tag !== 'SELECT') return fail(i, 'element is not a select');
+			const option = Array.from(element.options).find(
+				(o) => normalize(o.label) === normalize(field.value) || normalize(o.text) === normalize(field.value)
+			);
+			if (!option) return fail(i, 'option not found');
+			targets.push({ element, found, option });
+			continue;
+		}
+		if (tag === 'INPUT' && ['checkbox', 'radio', 'file'].includes(element.type)) return fail(i, `unsupported input type ${element.type}`);
+		if (!(tag === 'INPUT' || tag === 'TEXTAREA' || tag === 'SELECT' || element.isContentEditable)) return fail(i, 'element is not editable');
+		targets.push({ element, found });
+	}
+
+	const ignored = [];
+	for (let i = 0; i < fields.length; i++) {
+		const field = fields[i];
+		const { element, option } = targets[i];
+		if (field.kind === 'focus') {
+			element.focus();
+			continue;
+		}
+		// Per-step execution ignores text input into selects as well
+		if (field.kind === 'input' && element.tagName === 'SELECT') {
+			ignored.push(i);
+			continue;
+		}
+		element.focus();
+		if (field.kind === 'select') {
+			element.value = option.value;
+			option.selected = true;
+		} else if (element.isContentEditable) {
+			element.textContent = field.value;
+		} else {
+			const prototype = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+			Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, field.value);
+		}
+		element.dispatchEvent(new Event('input', { bubbles: true }));
+		element.dispatchEvent(new Event('change', { bubbles: true }));
+		element.blur();
+	}
+
+	// Read the values back: masked fields or handlers that ignore untrusted events may have changed or reset them
+	const mismatched = [];
+	for (let i = 0; i < fields.length; i++) {
+		const field = fields[i];
+		const { element, option } = targets[i];
+		if (field.kind === 'focus' || ignored.includes(i)) continue;
+		let kept;
+		if (field.kind === 'select') kept = element.value === option.value;
+		else if (element.isContentEditable) kept = element.textContent === field.value;
+		else kept = element.value === field.value;
+		if (!kept) mismatched.push(i);
+	}
+	return { ok: true, indexes: targets.map((target) => target.found), ignored, mismatched };
+}
+"""
+
+HAS_TEXT_PATTERN = re.compile(r"""^(?P<tag>[a-zA-Z][a-zA-Z0-9-]*):has-text\((?P<quote>['"])(?P<text>.*)(?P=quote)\)$""")
+
+
+def build_selector_candidates(selector, params=None):
+	"""Return all selectors to try for an element, ordered from the original selector to the least stable fallback."""
+	# Recorded fallbacks (e.g. the full selector a minimal one replaced) come right after the selector itself
+	fallback_selectors = list(getattr(params, 'fallbackSelectors', None) or [])
+	candidates = [selector] + fallback_selectors + generate_stable_selectors(selector, params)
+	for fallback_selector in fallback_selectors:
+		candidates.extend(generate_stable_selectors(fallback_selector, params))
 
-	for try_selector in selectors_to_try:
-		try:
-			logger.info(f'Trying selector: {truncate_selector(try_selector)}')
-			locator = page.locator(try_selector)
-			await locator.wait_for(state='visible', timeout=timeout_ms)
-			logger.info(f'Found element with selector: {truncate_selector(try_selector)}')
-			return locator, try_selector
-		except Exception as e:
-			logger.error(f'Selector failed: {truncate_selector(try_selector)} with error: {e}')
-
-	# Try XPath as last resort
 	if params and getattr(params, 'xpath', None):
-		xpath = params.xpath
-		try:
-			# Generate stable XPath alternatives
-			xpath_alternatives = [xpath] + generate_stable_xpaths(xpath, params)
-
-			for try_xpath in xpath_alternatives:
-				xpath_selector = f'xpath={try_xpath}'
-				logger.info(f'Trying XPath: {truncate_selector(xpath_selector)}')
-				locator = page.locator(xpath_selector)
-				await locator.wait_for(state='visible', timeout=timeout_ms)
-				return locator, xpath_selector
-		except Exception as e:
-			logger.error(f'All XPaths failed with error: {e}')
-
-	raise Exception(f'Failed to find element. Original: {original_selector}')
+		for xpath in [params.xpath] + generate_stable_xpaths(params.xpath, params):
+			candidates.append(f'xpath={xpath}')
+
+	return list(dict.fromkeys(candidates))
+
+
+def _to_probe_candidate(selector):
+	"""Translate a playwright selector into something the in-page probe can evaluate natively."""
+	if selector.startswith('xpath='):
+		return {'kind': 'xpath', 'selector': selector[len('xpath=') :]}
+	has_text = HAS_TEXT_PATTERN.match(selector)
+	if has_text:
+		return {'kind': 'text', 'selector': has_text.group('tag'), 'text': has_text.group('text')}
+	return {'kind': 'css', 'selector': selector}
+
+
+def _selector_kind(candidate, original_selector):
+	if candidate == original_selector:
+		return 'original'
+	if candidate.startswith('xpath='):
+		return 'xpath'
+	if HAS_TEXT_PATTERN.match(candidate):
+		return 'text'
+	return 'css'
+
+
+async def resolve_element(
+	page,
+	selector,
+	params=None,
+	timeout_ms=500,
+	cache: SelectorCache | None = None,
+	step_context: StepContext | None = None,
+) -> SelectorResolution:
+	"""Resolve the best-ranked visible element for *selector* and its fallbacks.
+
+	All candidates are checked together in one in-page probe, so a stale original selector no longer
+	costs a full timeout before a fallback is tried. Selectors the probe cannot evaluate natively are
+	retried one by one through playwright. With a *cache* and *step_context*, the candidate that
+	resolved this step last time is ranked first and the outcome is recorded.
+	"""
+	start = time.perf_counter()
+	if step_context is not None and step_context.selector_candidates and step_context.selector_candidates[0] == selector:
+		candidates = list(step_context.selector_candidates)
+	else:
+		candidates = build_selector_candidates(selector, params)
+
+	cache_key = None
+	cached = None
+	if cache is not None and step_context is not None:
+		cache_key = cache.make_key(step_context.workflow_name, step_context.workflow_version, step_context.step_index, page.url)
+		# SQLite calls can wait on other writers, keep them off the event loop
+		cached = await asyncio.to_thread(cache.get, cache_key)
+		# Only promote candidates of this run, a cached selector built from other inputs could hit the wrong element
+		if cached is not None and cached.selector in candidates:
+			candidates.remove(cached.selector)
+			candidates.insert(0, cached.selector)
+
+	try:
+		with trace_span('selector probe', 'selector', selector=selector, candidates=len(candidates)) as span:
+			probe = await page.evaluate(
+				PROBE_SELECTORS_JS,
+				{'candidates': [_to_probe_candidate(candidate) for candidate in candidates], 'timeoutMs': timeout_ms},
+			)
+			span.set(index=probe['index'], cached=cached is not None)
+	except Exception as e:
+		# E.g. the page navigated while probing, fall back to checking every candidate through playwright
+		logger.warning(f'Selector probe failed, trying selectors one by one: {e}')
+		probe = {'index': -1, 'unsupported': list(range(len(candidates)))}
+
+	index = probe['index']
+	if index == -1:
+		for unsupported_index in probe['unsupported']:
+			try_selector = candidates[unsupported_index]
+			try:
+				with trace_span('selector attempt', 'selector', selector=try_selector):
+					locator = page.locator(try_selector)
+					await locator.wait_for(state='visible', timeout=timeout_ms)
+				index = unsupported_index
+				break
+			except Exception as e:
+				logger.error(f'Selector failed: {truncate_selector(try_selector)} with error: {e}')
+
+	elapsed_ms = (time.perf_counter() - start) * 1000
+	if index == -1:
+		if cache is not None and cache_key is not None and cached is not None:
+			await asyncio.to_thread(cache.record_failure, cache_key, cached.selector)
+		raise Exception(f'Failed to find element. Original: {selector} (tried {len(candidates)} selectors in {elapsed_ms:.0f}ms)')
+
+	resolution = SelectorResolution(
+		locator=page.locator(candidates[index]),
+		selector=candidates[index],
+		candidate_index=index,
+		candidate_count=len(candidates),
+		elapsed_ms=elapsed_ms,
+	)
+	if cache is not None and cache_key is not None:
+		await asyncio.to_thread(
+			cache.record_success, cache_key, resolution.selector, _selector_kind(resolution.selector, selector), elapsed_ms
+		)
+	logger.info(
+		f'Found element with selector: {truncate_selector(resolution.selector)} '
+		f'(candidate {index + 1}/{len(candidates)}, {elapsed_ms:.0f}ms)'
+	)
+	return resolution
+
+
+async def fill_fields(page, fields):
+	"""Fill *fields* (``{'kind': 'input' | 'select' | 'focus', 'candidates': [...], 'value': ...}``) in one round trip.
+
+	Returns:
+		``{'ok': True, 'selectors': [...], 'ignored': [...], 'mismatched': [...]}`` with the selector each field
+		resolved with and the fields that did not keep their value after the fill, or
+		``{'ok': False, 'failed': index, 'reason': ...}`` when a field could not be resolved, in which case no field was touched.
+	"""
+	payload = [
+		{
+			'kind': field['kind'],
+			'value': field.get('value'),
+			'candidates': [_to_probe_candidate(candidate) for candidate in field['candidates']],
+		}
+		for field in fields
+	]
+	outcome = await page.evaluate(FILL_FIELDS_JS, {'fields': payload})
+	if not outcome['ok']:
+		return outcome
+	return {
+		'ok': True,
+		'selectors': [field['candidates'][index] for field, index in zip(fields, outcome['indexes'])],
+		'ignored': outcome['ignored'],
+		'mismatched': outcome['mismatched'],
+	}
+
+
+async def get_best_element_handle(page, selector, params=None, timeout_ms=500, cache=None, step_context=None):
+	"""Find element using stability-ranked selector strategies."""
+	resolution = await resolve_element(page, selector, params, timeout_ms=timeout_ms, cache=cache, step_context=step_context)
+	return resolution.locator, resolution.selector
 
 
 def generate_stable_selectors(selector, params=None):
@@ -1,6 +1,8 @@
-from typing import Literal, Optional
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from workflow_use.schema.views import ExtractionField
 
 
 # Shared config allowing extra fields so recorder payloads pass through
@@ -20,6 +22,7 @@ class StepMeta(_BaseExtra):
 # Common optional fields present in recorder events
 class RecorderBase(StepMeta):
 	xpath: Optional[str] = None
+	fallbackSelectors: Optional[List[str]] = None
 	elementTag: Optional[str] = None
 	elementText: Optional[str] = None
 	frameUrl: Optional[str] = None
@@ -79,3 +82,34 @@ class PageExtractionAction(_BaseExtra):
 
 	type: Literal['extract_page_content']
 	goal: str
+
+
+class RecordExtractionAction(_BaseExtra):
+	"""Parameters for extracting records from the page with CSS selectors."""
+
+	type: Literal['extract_records']
+	record_selector: str
+	fields: List[ExtractionField]
+	limit: Optional[int] = None
+	allow_empty: bool = False
+
+
+class SelectorResolution(BaseModel):
+	"""Outcome of resolving a step's element against its ranked selector candidates."""
+
+	locator: Any
+	selector: str
+	candidate_index: int
+	candidate_count: int
+	elapsed_ms: float
+
+
+class StepContext(BaseModel):
+	"""Identifies the workflow step an action runs for; passed to controller actions through ``context``."""
+
+	workflow_name: str
+	workflow_version: str
+	step_index: int
+	selector_candidates: Optional[List[str]] = Field(
+		default=None, description="The step's selector followed by its fallbacks, precomputed when the workflow is compiled."
+	)
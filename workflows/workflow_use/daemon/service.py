@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+from browser_use.browser.profile import BrowserProfile
+from patchright.async_api import async_playwright as patchright_async_playwright
+
+from workflow_use.daemon.views import DaemonInfo
+from workflow_use.pool.service import BrowserPool, _PoolSlot
+from workflow_use.pool.views import BrowserPoolConfig
+
+logger = logging.getLogger(__name__)
+
+CDP_STARTUP_TIMEOUT_S = 15.0
+CDP_PROBE_TIMEOUT_S = 0.5
+
+
+def get_default_daemon_file() -> Path:
+	"""File a running browser daemon is announced in, overridable with WORKFLOW_USE_DAEMON_FILE."""
+	return Path(os.getenv('WORKFLOW_USE_DAEMON_FILE', './tmp/browser-daemon.json'))
+
+
+def _free_port() -> int:
+	with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+		sock.bind(('127.0.0.1', 0))
+		return sock.getsockname()[1]
+
+
+def _cdp_version(cdp_url: str, timeout_s: float = CDP_PROBE_TIMEOUT_S) -> dict[str, Any]:
+	with urllib.request.urlopen(f'{cdp_url.rstrip("/")}/json/version', timeout=timeout_s) as response:
+		return json.loads(response.read())
+
+
+def _pid_alive(pid: int) -> bool:
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:
+		return True
+	return True
+
+
+def read_daemon_info(path: str | Path | None = None) -> DaemonInfo | None:
+	"""Return the announced daemon if it is still alive and its CDP endpoint answers, else ``None``.
+
+	Announcements of daemons that died without cleaning up are removed.
+	"""
+	path = Path(path) if path else get_default_daemon_file()
+	if not path.exists():
+		return None
+	try:
+		info = DaemonInfo.model_validate_json(path.read_text(encoding='utf-8'))
+	except Exception as e:
+		logger.debug(f'Ignoring unreadable daemon file {path}: {e}')
+		return None
+	try:
+		if not _pid_alive(info.pid):
+			raise ProcessLookupError(f'daemon process {info.pid} is gone')
+		_cdp_version(info.cdp_url)
+	except Exception as e:
+		logger.info(f'Removing stale browser daemon file {path}: {e}')
+		path.unlink(missing_ok=True)
+		return None
+	return info
+
+
+def stop_daemon(path: str | Path | None = None) -> DaemonInfo | None:
+	"""Ask the running daemon to shut down, returns its info or ``None`` when none is running."""
+	info = read_daemon_info(path)
+	if info is not None:
+		os.kill(info.pid, signal.SIGTERM)
+	return info
+
+
+class BrowserDaemon:
+	"""
+	Long-lived Chromium that later CLI invocations attach to over CDP.
+
+	Launching Chromium takes seconds, attaching to a running one and opening a fresh
+	context takes milliseconds. Every client gets its own browser context, so runs
+	stay isolated exactly like leases of a BrowserPool.
+	"""
+
+	def __init__(self, browser_profile: BrowserProfile | None = None, port: int = 0, info_path: str | Path | None = None) -> None:
+		self.browser_profile = browser_profile or BrowserProfile()
+		self.port = port
+		self.info_path = Path(info_path) if info_path else get_default_daemon_file()
+		self._playwright: Any = None
+		self._browser: Any = None
+
+	async def start(self) -> DaemonInfo:
+		existing = read_daemon_info(self.info_path)
+		if existing is not None:
+			raise RuntimeError(f'A browser daemon is already running (pid {existing.pid}, {existing.cdp_url})')
+
+		port = self.port or _free_port()
+		self._playwright = await patchright_async_playwright().start()
+		self.browser_profile.detect_display_configuration()
+		launch_kwargs = self.browser_profile.kwargs_for_launch().model_dump()
+		launch_kwargs['args'] = [*launch_kwargs.get('args', []), f'--remote-debugging-port={port}']
+		self._browser = await self._playwright.chromium.launch(**launch_kwargs)
+
+		cdp_url = f'http://127.0.0.1:{port}'
+		version = await self._wait_for_cdp(cdp_url)
+		info = DaemonInfo(
+			pid=os.getpid(), cdp_url=cdp_url, ws_endpoint=version.get('webSocketDebuggerUrl'), started_at=time.time()
+		)
+		self.info_path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = self.info_path.with_suffix('.tmp')
+		tmp_path.write_text(info.model_dump_json(), encoding='utf-8')
+		os.replace(tmp_path, self.info_path)
+		logger.info(f'Browser daemon listening on {cdp_url} (announced in {self.info_path})')
+		return info
+
+	async def _wait_for_cdp(self, cdp_url: str) -> dict[str, Any]:
+		deadline = time.monotonic() + CDP_STARTUP_TIMEOUT_S
+		while True:
+			try:
+				return await asyncio.to_thread(_cdp_version, cdp_url)
+			except Exception:
+				if time.monotonic() > deadline:
+					raise RuntimeError(f'Chromium did not open its DevTools endpoint on {cdp_url}')
+				await asyncio.sleep(0.1)
+
+	async def serve(self) -> None:
+		"""Run until SIGINT/SIGTERM or until the browser is closed."""
+		await self.start()
+		stop = asyncio.Event()
+		loop = asyncio.get_running_loop()
+		for sig in (signal.SIGINT, signal.SIGTERM):
+			try:
+				loop.add_signal_handler(sig, stop.set)
+			except NotImplementedError:  # Windows, Ctrl+C still raises KeyboardInterrupt
+				pass
+		self._browser.on('disconnected', lambda _: stop.set())
+		try:
+			await stop.wait()
+		finally:
+			await self.close()
+
+	async def close(self) -> None:
+		try:
+			info = DaemonInfo.model_validate_json(self.info_path.read_text(encoding='utf-8'))
+			if info.pid == os.getpid():
+				self.info_path.unlink(missing_ok=True)
+		except Exception:
+			pass
+		if self._browser is not None:
+			try:
+				await self._browser.close()
+			except Exception as e:
+				logger.debug(f'Error closing daemon browser: {e}')
+			self._browser = None
+		if self._playwright is not None:
+			await self._playwright.stop()
+			self._playwright = None
+		logger.info('Browser daemon stopped')
+
+
+class DaemonBrowserPool(BrowserPool):
+	"""
+	BrowserPool whose only browser is the daemon's Chromium, attached over CDP instead of launched.
+
+	Leases behave like any pool lease: a fresh context per run (never the daemon's default context),
+	closed on release. Closing the pool only disconnects, the daemon's browser keeps running for the
+	next invocation.
+	"""
+
+	def __init__(self, cdp_url: str, browser_profile: BrowserProfile | None = None) -> None:
+		super().__init__(BrowserPoolConfig(size=1), browser_profile)
+		self.cdp_url = cdp_url
+
+	async def _launch_browser(self, slot: _PoolSlot) -> None:
+		# close() of a browser obtained with connect_over_cdp disconnects without killing it
+		slot.browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+		slot.runs = 0
+		self._launched += 1
+		logger.info(f'Attached to browser daemon at {self.cdp_url}')
+
+
+def daemon_browser_pool(path: str | Path | None = None) -> DaemonBrowserPool | None:
+	"""A DaemonBrowserPool for the running daemon, or ``None`` when no daemon is running."""
+	info = read_daemon_info(path)
+	return DaemonBrowserPool(info.cdp_url) if info is not None else None
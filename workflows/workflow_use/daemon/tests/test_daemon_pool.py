@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from workflow_use.daemon.service import BrowserDaemon, DaemonBrowserPool
+
+
+async def _leases_share_cookies(tmp_path) -> bool:
+	daemon = BrowserDaemon(info_path=tmp_path / 'browser-daemon.json')
+	try:
+		info = await daemon.start()
+	except Exception as e:
+		await daemon.close()
+		pytest.skip(f'Chromium could not be launched: {e}')
+
+	pool = DaemonBrowserPool(info.cdp_url)
+	try:
+		async with pool.lease() as session:
+			assert session.browser_context is not None
+			await session.browser_context.add_cookies([{'name': 'run', 'value': '1', 'url': 'https://example.com'}])
+		async with pool.lease() as session:
+			assert session.browser_context is not None
+			cookies = await session.browser_context.cookies('https://example.com')
+		return bool(cookies)
+	finally:
+		await pool.close()
+		await daemon.close()
+
+
+def test_daemon_leases_do_not_share_cookies(tmp_path):
+	"""Every lease gets its own context, not the default context of the daemon's browser."""
+	assert not asyncio.run(_leases_share_cookies(tmp_path))
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class DaemonInfo(BaseModel):
+	"""Written by a running browser daemon so CLI invocations can find and attach to it."""
+
+	pid: int = Field(..., description='Process id of the daemon (not of Chromium).')
+	cdp_url: str = Field(..., description='HTTP endpoint of the Chrome DevTools Protocol, e.g. http://127.0.0.1:9222')
+	ws_endpoint: str | None = Field(default=None, description='Browser-level DevTools websocket URL.')
+	started_at: float
@@ -0,0 +1,490 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import markdownify
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+
+from workflow_use.cache.service import ExtractionCache
+from workflow_use.extraction.views import ContentPipelineConfig, PageContent, RecordExtractionSpec
+from workflow_use.schema.views import ExtractionField
+from workflow_use.tracing.service import trace_span
+
+logger = logging.getLogger(__name__)
+
+# Rough ratio used when the LLM cannot count tokens itself
+CHARS_PER_TOKEN = 4
+
+# Returns the document's HTML without scripts, styles, navigation and invisible nodes. The live DOM is only read,
+# the pruning happens on a clone (querySelectorAll returns live and cloned elements in the same order).
+PRUNE_PAGE_JS = """
+() => {
+	const PRUNED_TAGS = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'SVG', 'CANVAS', 'NAV', 'LINK', 'META', 'IFRAME']);
+	const root = document.documentElement;
+	if (!root) return '';
+	const live = [root, ...root.querySelectorAll('*')];
+	const clone = root.cloneNode(true);
+	const cloned = [clone, ...clone.querySelectorAll('*')];
+	const head = document.head;
+	const pruned = new Set();
+	for (let i = 0; i < live.length; i++) {
+		const el = live[i];
+		if (el.parentElement && pruned.has(el.parentElement)) {
+			// Removed together with its ancestor
+			pruned.add(el);
+			continue;
+		}
+		let prune =
+			PRUNED_TAGS.has(el.tagName.toUpperCase()) ||
+			el.hidden ||
+			el.getAttribute('aria-hidden') === 'true' ||
+			el.getAttribute('role') === 'navigation';
+		if (!prune && el !== root && el !== head && !(head && head.contains(el))) {
+			const style = window.getComputedStyle(el);
+			prune = style.display === 'none' || style.visibility === 'hidden';
+		}
+		if (prune) {
+			pruned.add(el);
+			if (cloned[i]) cloned[i].remove();
+		}
+	}
+	return clone.outerHTML;
+}
+"""
+
+# Reads the raw values of an extract_records step in one round trip, coercion happens in python (coerce_field).
+# Texts are whitespace-normalized, href/src are resolved to absolute URLs.
+EXTRACT_RECORDS_JS = """
+({ recordSelector, fields, limit }) => {
+	const URL_ATTRIBUTES = new Set(['href', 'src']);
+	const read = (el, attribute) => {
+		if (!attribute) return (el.innerText ?? el.textContent ?? '').replace(/\\s+/g, ' ').trim();
+		const value = el.getAttribute(attribute);
+		if (value !== null && URL_ATTRIBUTES.has(attribute)) {
+			try {
+				return new URL(value, document.baseURI).href;
+			} catch (e) {}
+		}
+		return value;
+	};
+	let records = Array.from(document.querySelectorAll(recordSelector));
+	if (limit) records = records.slice(0, limit);
+	return records.map((record) => {
+		const row = {};
+		for (const field of fields) {
+			const targets = field.selector ? Array.from(record.querySelectorAll(field.selector)) : [record];
+			const values = targets.map((el) => read(el, field.attribute));
+			row[field.name] = field.multiple ? values : values.length ? values[0] : null;
+		}
+		return row;
+	});
+}
+"""
+
+# Values read as False for boolean fields, anything else that is present is True
+FALSE_VALUES = frozenset({'', 'false', 'no', 'off', '0', 'n', 'none', 'null'})
+# HTML the record extraction compiler sees, the rest (scripts, styles, most attributes) only costs tokens
+MAX_COMPILE_HTML_CHARS = 60000
+COMPILE_KEPT_ATTRIBUTES = frozenset({'id', 'class', 'name', 'href', 'src', 'alt', 'title', 'role', 'type', 'value'})
+COMPILE_PRUNED_TAGS = ('script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'link', 'meta', 'head')
+
+RECORD_EXTRACTION_COMPILER_PROMPT = """You are given the HTML of a web page and an extraction goal. Instead of extracting the data yourself,
+write the CSS selectors a program will use to extract it from this page every time it changes.
+
+- `record_selector` must match exactly one element per record (e.g. a table row or a product card), nothing else.
+- Every field's `selector` is relative to the record element (omit it to read the record itself).
+- Omit `attribute` to read the element's visible text, set it to read an attribute instead (e.g. "href" for links).
+- Set `type` to "number", "integer" or "boolean" for values that are not text, and `multiple` for lists of values.
+- Prefer ids, stable class names and semantic tags over positions (no :nth-child unless needed).
+
+Extraction goal: {goal}
+
+Page HTML:
+{html}"""
+
+_NUMBER_PATTERN = re.compile(r'[-+]?\d[\d.,\s]*')
+_BLOCK_SEPARATOR = re.compile(r'\n\s*\n')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_CODE_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def count_tokens(text: str, llm: BaseChatModel | None = None) -> int:
+	"""Count tokens with the LLM's tokenizer, falling back to a character based estimate."""
+	if llm is not None:
+		try:
+			return llm.get_num_tokens(text)
+		except Exception as e:
+			logger.debug(f'Token counting with {type(llm).__name__} failed, estimating: {e}')
+	return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def deduplicate_blocks(text: str) -> Tuple[str, int]:
+	"""Drop markdown blocks (paragraphs, list groups, table rows...) that already appeared earlier in *text*."""
+	seen: set[str] = set()
+	blocks: List[str] = []
+	duplicates = 0
+	for block in _BLOCK_SEPARATOR.split(text):
+		normalized = _WHITESPACE_PATTERN.sub(' ', block).strip()
+		if not normalized:
+			continue
+		digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+		if digest in seen:
+			duplicates += 1
+			continue
+		seen.add(digest)
+		blocks.append(block.strip('\n'))
+	return '\n\n'.join(blocks), duplicates
+
+
+def split_into_chunks(text: str, max_tokens: int, total_tokens: int) -> List[str]:
+	"""Split *text* at block boundaries into chunks of at most ~*max_tokens* tokens."""
+	if total_tokens <= max_tokens:
+		return [text]
+
+	max_chars = max(1, int(max_tokens * len(text) / max(total_tokens, 1)))
+	chunks: List[str] = []
+	current: List[str] = []
+	current_len = 0
+	for block in _BLOCK_SEPARATOR.split(text):
+		# Blocks bigger than a whole chunk are cut at line breaks where possible
+		while len(block) > max_chars:
+			cut = block.rfind('\n', 0, max_chars)
+			cut = cut if cut > 0 else max_chars
+			pieces, block = block[:cut], block[cut:].lstrip('\n')
+			if current:
+				chunks.append('\n\n'.join(current))
+				current, current_len = [], 0
+			chunks.append(pieces)
+		if current and current_len + len(block) + 2 > max_chars:
+			chunks.append('\n\n'.join(current))
+			current, current_len = [], 0
+		if block:
+			current.append(block)
+			current_len += len(block) + 2
+	if current:
+		chunks.append('\n\n'.join(current))
+	return chunks
+
+
+def parse_json_response(text: str) -> Optional[Any]:
+	"""Parse an LLM response that should be JSON, tolerating markdown code fences. Returns None if it is not JSON."""
+	try:
+		return json.loads(_CODE_FENCE_PATTERN.sub('', text.strip()))
+	except (json.JSONDecodeError, TypeError):
+		return None
+
+
+def _is_empty(value: Any) -> bool:
+	return value is None or value == '' or value == [] or value == {}
+
+
+def merge_json_values(a: Any, b: Any) -> Any:
+	"""Merge two partial JSON results: objects are merged key by key, lists concatenated, the first non-empty scalar wins."""
+	if isinstance(a, dict) and isinstance(b, dict):
+		merged = dict(a)
+		for key, value in b.items():
+			merged[key] = merge_json_values(merged[key], value) if key in merged else value
+		return merged
+	if isinstance(a, list) and isinstance(b, list):
+		merged_list = list(a)
+		seen = {json.dumps(item, sort_keys=True, default=str) for item in a}
+		for item in b:
+			marker = json.dumps(item, sort_keys=True, default=str)
+			if marker not in seen:
+				seen.add(marker)
+				merged_list.append(item)
+		return merged_list
+	return b if _is_empty(a) else a
+
+
+def reduce_json_values(values: List[Any]) -> Any:
+	"""Reduce partial JSON results of the same schema into one.
+
+	Objects are reduced key by key, lists are concatenated (without exact duplicates) and
+	scalars are reconciled by majority vote over the non-empty values, ties going to the
+	earliest value.
+	"""
+	present = [value for value in values if not _is_empty(value)]
+	if not present:
+		return values[0] if values else None
+	if all(isinstance(value, dict) for value in present):
+		keys: List[str] = []
+		for value in present:
+			keys.extend(key for key in value if key not in keys)
+		return {key: reduce_json_values([value[key] for value in present if key in value]) for key in keys}
+	if all(isinstance(value, list) for value in present):
+		merged: Any = []
+		for value in present:
+			merged = merge_json_values(merged, value)
+		return merged
+
+	votes: dict[str, int] = {}
+	first_seen: dict[str, Any] = {}
+	for value in present:
+		marker = json.dumps(value, sort_keys=True, default=str)
+		votes[marker] = votes.get(marker, 0) + 1
+		first_seen.setdefault(marker, value)
+	best = max(votes, key=lambda marker: votes[marker])  # max keeps the first marker on ties
+	return first_seen[best]
+
+
+def merge_extractions(responses: List[str]) -> str:
+	"""Merge the responses of chunk extractions into one, as JSON when every chunk answered in JSON."""
+	parsed = [parse_json_response(response) for response in responses]
+	if all(value is not None for value in parsed):
+		merged: Any = parsed[0]
+		for value in parsed[1:]:
+			merged = merge_json_values(merged, value)
+		return json.dumps(merged, ensure_ascii=False)
+	return '\n\n'.join(response.strip() for response in responses)
+
+
+class ContentPipeline:
+	"""
+	Turns a page into token-budgeted markdown and runs the extraction LLM over it.
+
+	Stages: prune boilerplate and invisible nodes in-page, fetch the main frame and
+	all iframes concurrently, convert to markdown, drop repeated blocks, count tokens
+	and split content over the budget into chunks that are extracted in parallel
+	and merged.
+	"""
+
+	def __init__(self, config: ContentPipelineConfig | None = None) -> None:
+		self.config = config or ContentPipelineConfig()
+
+	async def _frame_html(self, frame: Any) -> str:
+		if self.config.prune_hidden:
+			try:
+				return await frame.evaluate(PRUNE_PAGE_JS)
+			except Exception as e:
+				logger.debug(f'Pruning {frame.url} failed, using the raw HTML: {e}')
+		return await frame.content()
+
+	async def collect(self, page: Any, llm: BaseChatModel | None = None) -> PageContent:
+		"""Collect the markdown content of *page* and its iframes (including cross-origin ones)."""
+		iframes = [frame for frame in page.frames if frame.url != page.url and not frame.url.startswith('data:')]
+		with trace_span('collect page content', 'extraction', iframes=len(iframes)):
+			htmls = await asyncio.gather(
+				self._frame_html(page), *(self._frame_html(frame) for frame in iframes), return_exceptions=True
+			)
+
+		main_html = htmls[0]
+		if isinstance(main_html, BaseException):
+			raise main_html
+		parts = [markdownify.markdownify(main_html, strip=['a', 'img'])]
+		for frame, html in zip(iframes, htmls[1:]):
+			if isinstance(html, BaseException):
+				logger.debug(f'Skipping iframe {frame.url}: {html}')
+				continue
+			parts.append(f'IFRAME {frame.url}:\n' + markdownify.markdownify(html, strip=['a', 'img']))
+		text = '\n\n'.join(parts)
+
+		duplicates = 0
+		if self.config.deduplicate_blocks:
+			text, duplicates = deduplicate_blocks(text)
+
+		tokens = count_tokens(text, llm)
+		chunks = split_into_chunks(text, self.config.max_tokens_per_chunk, tokens)
+		truncated = max(len(chunks) - self.config.max_chunks, 0) if self.config.max_chunks is not None else 0
+		if truncated:
+			logger.warning(f'Page content has {len(chunks)} chunks, only the first {self.config.max_chunks} are extracted')
+			chunks = chunks[: self.config.max_chunks]
+
+		return PageContent(
+			text=text,
+			tokens=tokens,
+			chunks=chunks,
+			iframe_count=len(iframes),
+			duplicate_blocks=duplicates,
+			truncated_chunks=truncated,
+		)
+
+	async def extract(
+		self,
+		content: PageContent,
+		goal: str,
+		llm: BaseChatModel,
+		prompt: str,
+		cache: ExtractionCache | None = None,
+	) -> str:
+		"""Run *prompt* (with ``{goal}`` and ``{page}`` variables) over every chunk and merge the responses."""
+		template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
+		semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+		async def extract_chunk(chunk: str) -> str:
+			cache_key = cache.make_key(llm, prompt, goal, chunk) if cache is not None else None
+			if cache is not None and cache_key is not None:
+				cached = await asyncio.to_thread(cache.get, cache_key)
+				if cached is not None:
+					logger.debug('Chunk extraction served from extraction cache')
+					return cached
+
+			async with semaphore:
+				with trace_span('extract chunk', 'llm', chars=len(chunk)):
+					output = await llm.ainvoke(template.format(goal=goal, page=chunk))
+			response = output.content if isinstance(output.content, str) else json.dumps(output.content)
+			if cache is not None and cache_key is not None:
+				await asyncio.to_thread(cache.set, cache_key, response)
+			return response
+
+		responses = await asyncio.gather(*(extract_chunk(chunk) for chunk in content.chunks))
+		if len(responses) == 1:
+			return responses[0]
+		return merge_extractions(list(responses))
+
+
+def _parse_number(text: str) -> Optional[float]:
+	match = _NUMBER_PATTERN.search(text)
+	if match is None:
+		return None
+	number = re.sub(r'\s', '', match.group()).rstrip('.,')
+	if ',' in number and '.' in number:
+		# Whichever separator comes last is the decimal one ("1,234.50" / "1.234,50")
+		thousands = ',' if number.rfind(',') < number.rfind('.') else '.'
+		number = number.replace(thousands, '').replace(',', '.')
+	elif ',' in number:
+		# "1,234" groups thousands, "12,5" is a decimal comma
+		head, _, tail = number.rpartition(',')
+		number = number.replace(',', '') if len(tail) == 3 and head else number.replace(',', '.')
+	elif number.count('.') > 1:
+		number = number.replace('.', '')
+	try:
+		return float(number)
+	except ValueError:
+		return None
+
+
+def coerce_value(value: Optional[str], field: ExtractionField) -> Any:
+	"""Coerce one raw value read from the page to *field*'s type, None when it cannot be read as that type."""
+	if field.type == 'boolean':
+		if value is None:
+			return False
+		# A present boolean attribute (e.g. checked="") is True
+		return bool(field.attribute and value == '') or ' '.join(value.split()).lower() not in FALSE_VALUES
+	if value is None:
+		return None
+	text = ' '.join(value.split())
+	if field.type == 'string':
+		return text
+	number = _parse_number(text)
+	if number is None:
+		return None
+	return int(number) if field.type == 'integer' else number
+
+
+def coerce_records(rows: List[Dict[str, Any]], fields: List[ExtractionField]) -> List[Dict[str, Any]]:
+	"""Coerce the raw values read by EXTRACT_RECORDS_JS (or extract_records_from_html) to the fields' types."""
+	records = []
+	for row in rows:
+		record = {}
+		for field in fields:
+			raw = row.get(field.name)
+			if field.multiple:
+				record[field.name] = [coerce_value(value, field) for value in raw or []]
+			else:
+				record[field.name] = coerce_value(raw, field)
+		records.append(record)
+	return records
+
+
+async def extract_records_from_page(
+	page: Any, record_selector: str, fields: List[ExtractionField], limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+	"""Extract records from a live page in one evaluate call."""
+	rows = await page.evaluate(
+		EXTRACT_RECORDS_JS,
+		{
+			'recordSelector': record_selector,
+			'fields': [field.model_dump(include={'name', 'selector', 'attribute', 'multiple'}) for field in fields],
+			'limit': limit,
+		},
+	)
+	return coerce_records(rows, fields)
+
+
+def extract_records_from_html(
+	html: str | BeautifulSoup, record_selector: str, fields: List[ExtractionField], limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+	"""Offline counterpart of extract_records_from_page, e.g. for recorded DOM snapshots (URLs are not resolved)."""
+	document = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, 'html.parser')
+
+	def read(element: Tag, attribute: Optional[str]) -> Optional[str]:
+		if not attribute:
+			return ' '.join(element.get_text(' ').split())
+		value = element.get(attribute)
+		return ' '.join(value) if isinstance(value, list) else value
+
+	records = soupsieve.select(record_selector, document, limit=limit or 0)
+	rows = []
+	for record in records:
+		row: Dict[str, Any] = {}
+		for field in fields:
+			targets = soupsieve.select(field.selector, record) if field.selector else [record]
+			values = [read(target, field.attribute) for target in targets]
+			row[field.name] = values if field.multiple else values[0] if values else None
+		rows.append(row)
+	return coerce_records(rows, fields)
+
+
+def prune_html_for_compiler(html: str, max_chars: int = MAX_COMPILE_HTML_CHARS) -> str:
+	"""Strip a page down to the tags, classes and ids the record extraction compiler needs."""
+	document = BeautifulSoup(html, 'html.parser')
+	for element in document.find_all(COMPILE_PRUNED_TAGS):
+		element.decompose()
+	for element in document.find_all(True):
+		element.attrs = {
+			name: value
+			for name, value in element.attrs.items()
+			if name in COMPILE_KEPT_ATTRIBUTES or name.startswith(('data-', 'aria-'))
+		}
+	pruned = _WHITESPACE_PATTERN.sub(' ', str(document.body or document)).strip()
+	return pruned[:max_chars]
+
+
+def check_record_extraction(html: str, spec: RecordExtractionSpec, min_coverage: float = 0.5) -> Optional[str]:
+	"""Check *spec* against *html*, returning why it is unusable or None if it extracts the data.
+
+	Every non-boolean field must have a value in at least *min_coverage* of the records.
+	"""
+	try:
+		records = extract_records_from_html(html, spec.record_selector, spec.fields, spec.limit)
+	except (soupsieve.SelectorSyntaxError, NotImplementedError) as e:
+		return f'invalid selector: {e}'
+	if not records:
+		return f'record selector {spec.record_selector!r} matches nothing'
+	for field in spec.fields:
+		if field.type == 'boolean':
+			continue
+		present = sum(1 for record in records if not _is_empty(record[field.name]))
+		if present < min_coverage * len(records):
+			return f'field {field.name!r} is empty in {len(records) - present} of {len(records)} records'
+	return None
+
+
+async def compile_record_extraction(llm: BaseChatModel, html: str, goal: str) -> Optional[RecordExtractionSpec]:
+	"""Ask *llm* once for selectors that extract *goal* from *html*, None if it does not produce working ones."""
+	prompt = RECORD_EXTRACTION_COMPILER_PROMPT.format(goal=goal, html=prune_html_for_compiler(html))
+	try:
+		with trace_span('compile record extraction', 'llm', goal=goal):
+			try:
+				structured = llm.with_structured_output(RecordExtractionSpec, method='function_calling')
+				response = await structured.ainvoke(prompt)
+			except NotImplementedError:
+				output = await llm.ainvoke(prompt)
+				response = parse_json_response(output.content if isinstance(output.content, str) else '')
+		spec = RecordExtractionSpec.model_validate(response)
+	except Exception as e:
+		logger.warning(f'Compiling extraction {goal!r} failed: {e}')
+		return None
+
+	problem = check_record_extraction(html, spec)
+	if problem:
+		logger.warning(f'Compiled selectors for extraction {goal!r} rejected: {problem}')
+		return None
+	return spec
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from workflow_use.schema.views import ExtractionField
+
+
+class ContentPipelineConfig(BaseModel):
+	"""Limits of the page content pipeline used by extract_page_content."""
+
+	max_tokens_per_chunk: int = Field(default=16000, description='Content above this many tokens is split into chunks.')
+	max_chunks: Optional[int] = Field(
+		default=None,
+		description='Optional hard cap on the extracted chunks. Chunks beyond it are dropped and the extraction result says so, '
+		'by default every chunk is extracted.',
+	)
+	max_concurrency: int = Field(default=4, description='How many chunk extractions run in parallel.')
+	prune_hidden: bool = Field(
+		default=True, description='Drop nav/script/style and invisible nodes before converting to markdown.'
+	)
+	deduplicate_blocks: bool = Field(
+		default=True, description='Drop repeated markdown blocks (menus, cookie banners, footers...).'
+	)
+
+
+class PageContent(BaseModel):
+	"""Markdown content of a page (and its iframes) ready for LLM extraction."""
+
+	text: str
+	tokens: int
+	chunks: List[str]
+	iframe_count: int = 0
+	duplicate_blocks: int = 0
+	truncated_chunks: int = 0
+
+
+class RecordExtractionSpec(BaseModel):
+	"""Selectors of an extract_records step, as compiled from an extraction goal."""
+
+	record_selector: str = Field(..., description='CSS selector matching one element per record.')
+	fields: List[ExtractionField] = Field(..., min_length=1)
+	limit: Optional[int] = None
@@ -0,0 +1,189 @@
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from browser_use.agent.views import AgentHistoryList
+
+from workflow_use.healing.views import StepPatch, WorkflowPatch
+from workflow_use.schema.views import (
+	ClickStep,
+	DeterministicWorkflowStep,
+	InputStep,
+	NavigationStep,
+	ScrollStep,
+	SelectChangeStep,
+	WorkflowDefinitionSchema,
+	WorkflowStep,
+)
+
+logger = logging.getLogger(__name__)
+
+# Agent actions that only read the page or wait, they need no deterministic counterpart
+IGNORED_AGENT_ACTIONS = {'done', 'wait', 'get_dropdown_options', 'extract_content'}
+
+
+def get_default_patch_dir() -> Path:
+	"""Directory self-healing patches are written to, overridable with WORKFLOW_USE_PATCH_DIR."""
+	return Path(os.getenv('WORKFLOW_USE_PATCH_DIR', './tmp/patches'))
+
+
+def _selector_for(element: Any) -> Optional[str]:
+	if element is None:
+		return None
+	if element.css_selector:
+		return element.css_selector
+	if element.xpath:
+		return f'xpath=//{element.xpath}'
+	return None
+
+
+def _templatize(value: str, placeholders: Dict[str, str]) -> str:
+	"""Turn a concrete value back into its ``{input}`` placeholder so the patch works for other inputs."""
+	return placeholders.get(value, value)
+
+
+def steps_from_agent_history(
+	history: AgentHistoryList,
+	failed_step: WorkflowStep,
+	placeholders: Dict[str, str] | None = None,
+) -> Optional[List[DeterministicWorkflowStep]]:
+	"""Convert the actions of a successful agent run into deterministic workflow steps.
+
+	Args:
+		history: History of the agent fallback.
+		failed_step: The (unresolved) step the agent replaced, its description is carried over.
+		placeholders: Maps concrete input values to their ``{name}`` placeholder.
+
+	Returns:
+		The replacement steps, or None when the trajectory cannot be replayed deterministically
+		(unsuccessful run, unsupported action or element without a selector).
+	"""
+	if not history.is_successful():
+		return None
+	placeholders = placeholders or {}
+	description = failed_step.description
+
+	steps: List[DeterministicWorkflowStep] = []
+	for item in history.history:
+		if item.model_output is None:
+			continue
+		for action_index, action in enumerate(item.model_output.action):
+			# Actions after a page change are not executed and have no result
+			if action_index >= len(item.result):
+				break
+			if item.result[action_index].error:
+				continue
+
+			action_dump = action.model_dump(exclude_none=True)
+			if not action_dump:
+				continue
+			action_name, params = next(iter(action_dump.items()))
+			if action_name in IGNORED_AGENT_ACTIONS:
+				continue
+
+			interacted = item.state.interacted_element
+			element = interacted[action_index] if action_index < len(interacted) else None
+			selector = _selector_for(element)
+			common: Dict[str, Any] = {'description': description}
+			if element is not None:
+				common.update(xpath=element.xpath, elementTag=element.tag_name)
+
+			if action_name == 'go_to_url':
+				steps.append(
+					NavigationStep(type='navigation', url=_templatize(params['url'], placeholders), description=description)
+				)
+			elif action_name == 'click_element_by_index' and selector:
+				steps.append(ClickStep(type='click', cssSelector=selector, **common))
+			elif action_name == 'input_text' and selector:
+				steps.append(
+					InputStep(type='input', cssSelector=selector, value=_templatize(params['text'], placeholders), **common)
+				)
+			elif action_name == 'select_dropdown_option' and selector:
+				steps.append(
+					SelectChangeStep(
+						type='select_change',
+						cssSelector=selector,
+						selectedText=_templatize(params['text'], placeholders),
+						**common,
+					)
+				)
+			elif action_name in ('scroll_down', 'scroll_up') and params.get('amount') is not None:
+				amount = params['amount'] if action_name == 'scroll_down' else -params['amount']
+				steps.append(ScrollStep(type='scroll', scrollX=0, scrollY=amount, description=description))
+			else:
+				logger.info(f"Agent action '{action_name}' has no deterministic equivalent, not creating a patch")
+				return None
+
+	return steps or None
+
+
+def _same_step(a: WorkflowStep, b: WorkflowStep) -> bool:
+	return a.model_dump(exclude_none=True) == b.model_dump(exclude_none=True)
+
+
+def apply_patches(steps: List[WorkflowStep], patches: List[StepPatch]) -> tuple[List[WorkflowStep], int]:
+	"""Apply *patches* in creation order, locating every replaced step by content.
+
+	Returns:
+		The patched step list and the number of patches that were applied. Patches whose
+		original step no longer exists (e.g. the workflow was edited) are skipped.
+	"""
+	patched = list(steps)
+	applied = 0
+	for patch in sorted(patches, key=lambda p: p.created_at):
+		index = patch.step_index
+		if not (0 <= index < len(patched) and _same_step(patched[index], patch.original_step)):
+			index = next((i for i, step in enumerate(patched) if _same_step(step, patch.original_step)), -1)
+		if index == -1:
+			logger.debug(f'Skipping patch for step {patch.step_index + 1}, its original step is not in the workflow')
+			continue
+		patched[index : index + 1] = patch.replacement_steps
+		applied += 1
+	return patched, applied
+
+
+class PatchStore:
+	"""Stores self-healing patches as one JSON file per workflow name and version."""
+
+	def __init__(self, directory: str | Path | None = None) -> None:
+		self.directory = Path(directory) if directory else get_default_patch_dir()
+
+	def path_for(self, workflow_name: str, workflow_version: str) -> Path:
+		slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', f'{workflow_name}@{workflow_version}')
+		return self.directory / f'{slug}.patch.json'
+
+	def load(self, workflow_name: str, workflow_version: str) -> WorkflowPatch:
+		path = self.path_for(workflow_name, workflow_version)
+		if not path.exists():
+			return WorkflowPatch(workflow_name=workflow_name, workflow_version=workflow_version)
+		return WorkflowPatch.model_validate_json(path.read_text(encoding='utf-8'))
+
+	def add(self, workflow_name: str, workflow_version: str, patch: StepPatch) -> Path:
+		"""Store *patch*, replacing an older patch for the same original step."""
+		workflow_patch = self.load(workflow_name, workflow_version)
+		workflow_patch.patches = [p for p in workflow_patch.patches if not _same_step(p.original_step, patch.original_step)]
+		workflow_patch.patches.append(patch)
+		return self._write(workflow_patch)
+
+	def clear(self, workflow_name: str, workflow_version: str) -> None:
+		self.path_for(workflow_name, workflow_version).unlink(missing_ok=True)
+
+	def _write(self, workflow_patch: WorkflowPatch) -> Path:
+		path = self.path_for(workflow_patch.workflow_name, workflow_patch.workflow_version)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# Write-then-rename so concurrent runs never read a half written file
+		tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+		tmp_path.write_text(workflow_patch.model_dump_json(indent=2, exclude_none=True), encoding='utf-8')
+		os.replace(tmp_path, path)
+		return path
+
+
+def apply_stored_patches(
+	schema: WorkflowDefinitionSchema, store: PatchStore | None = None
+) -> tuple[WorkflowDefinitionSchema, int]:
+	"""Return a copy of *schema* with all patches stored for it applied."""
+	store = store or PatchStore()
+	steps, applied = apply_patches(schema.steps, store.load(schema.name, schema.version).patches)
+	return schema.model_copy(update={'steps': steps}), applied
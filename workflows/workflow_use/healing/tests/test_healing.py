@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+from typing import Any, cast
+
+from browser_use.agent.views import AgentHistoryList
+
+from workflow_use.healing.service import apply_patches, steps_from_agent_history
+from workflow_use.healing.views import StepPatch
+from workflow_use.schema.views import ClickStep, InputStep, NavigationStep
+
+
+class _Action:
+	def __init__(self, **action: Any):
+		self.action = action
+
+	def model_dump(self, exclude_none: bool = False) -> dict:
+		return self.action
+
+
+def _element(css_selector: str) -> SimpleNamespace:
+	return SimpleNamespace(css_selector=css_selector, xpath='html/body/input', tag_name='input')
+
+
+def _item(actions: list, elements: list, errors: list | None = None) -> SimpleNamespace:
+	errors = errors or [None] * len(actions)
+	return SimpleNamespace(
+		model_output=SimpleNamespace(action=actions),
+		result=[SimpleNamespace(error=error) for error in errors],
+		state=SimpleNamespace(interacted_element=elements),
+	)
+
+
+def _history(*items: SimpleNamespace, successful: bool = True) -> AgentHistoryList:
+	return cast(AgentHistoryList, SimpleNamespace(history=list(items), is_successful=lambda: successful))
+
+
+def test_agent_actions_become_templated_steps(make_steps):
+	(failed_step,) = make_steps({'type': 'click', 'cssSelector': '#gone', 'description': 'Search'})
+	history = _history(
+		_item([_Action(go_to_url={'url': 'https://x/search'})], [None]),
+		_item(
+			[_Action(input_text={'index': 3, 'text': 'shoes'}), _Action(click_element_by_index={'index': 4})],
+			[_element('#query'), _element('#submit')],
+		),
+		_item([_Action(done={'text': 'ok'})], [None]),
+	)
+
+	steps = steps_from_agent_history(history, failed_step, {'shoes': '{query}'})
+
+	assert steps is not None
+	navigation, type_query, submit = steps
+	assert isinstance(navigation, NavigationStep) and navigation.url == 'https://x/search'
+	assert isinstance(type_query, InputStep) and (type_query.cssSelector, type_query.value) == ('#query', '{query}')
+	assert isinstance(submit, ClickStep) and submit.cssSelector == '#submit'
+	assert {step.description for step in steps} == {'Search'}
+
+
+def test_failed_actions_are_skipped_and_unsupported_ones_give_no_patch(make_steps):
+	(failed_step,) = make_steps({'type': 'click', 'cssSelector': '#gone'})
+	clicks = _item(
+		[_Action(click_element_by_index={'index': 1}), _Action(click_element_by_index={'index': 2})],
+		[_element('#wrong'), _element('#right')],
+		errors=['not clickable', None],
+	)
+
+	steps = steps_from_agent_history(_history(clicks), failed_step)
+	assert steps is not None and [getattr(step, 'cssSelector') for step in steps] == ['#right']
+
+	assert steps_from_agent_history(_history(clicks, _item([_Action(open_tab={'url': 'x'})], [None])), failed_step) is None
+	assert steps_from_agent_history(_history(clicks, successful=False), failed_step) is None
+
+
+def test_patches_follow_their_step_and_skip_removed_ones(make_steps):
+	steps = make_steps(
+		{'type': 'navigation', 'url': 'https://x'},
+		{'type': 'click', 'cssSelector': '#a'},
+		{'type': 'click', 'cssSelector': '#b'},
+	)
+	replace_a, replace_b = make_steps({'type': 'click', 'cssSelector': '#a2'}, {'type': 'click', 'cssSelector': '#b2'})
+	(removed,) = make_steps({'type': 'click', 'cssSelector': '#removed'})
+	patches = [
+		# Created when #b was the second step, a step was inserted before it since
+		StepPatch(step_index=1, original_step=steps[2], replacement_steps=[replace_b], created_at=2),
+		StepPatch(step_index=1, original_step=steps[1], replacement_steps=[replace_a, replace_b], created_at=1),
+		StepPatch(step_index=0, original_step=removed, replacement_steps=[replace_a], created_at=3),
+	]
+
+	patched, applied = apply_patches(steps, patches)
+
+	assert applied == 2
+	assert [getattr(step, 'cssSelector', None) for step in patched] == [None, '#a2', '#b2', '#b2']
+	assert [getattr(step, 'cssSelector', None) for step in steps] == [None, '#a', '#b']
@@ -0,0 +1,26 @@
+import time
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+from workflow_use.schema.views import DeterministicWorkflowStep, WorkflowStep
+
+SelfHealMode = Literal['off', 'propose', 'apply']
+
+
+class StepPatch(BaseModel):
+	"""Replaces one workflow step with the deterministic steps an agent fallback used to get past it."""
+
+	step_index: int = Field(..., description='Index of the replaced step when the patch was created (hint only).')
+	original_step: WorkflowStep = Field(..., description='The step that failed, as written in the workflow.')
+	replacement_steps: List[DeterministicWorkflowStep] = Field(..., min_length=1)
+	agent_steps: int = Field(default=0, description='Number of agent iterations the fallback needed.')
+	created_at: float = Field(default_factory=time.time)
+
+
+class WorkflowPatch(BaseModel):
+	"""All step patches collected for one workflow version."""
+
+	workflow_name: str
+	workflow_version: str
+	patches: List[StepPatch] = Field(default_factory=list)
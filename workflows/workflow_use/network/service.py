@@ -0,0 +1,103 @@
+import fnmatch
+import logging
+import re
+from typing import Any, List, Optional
+
+from workflow_use.network.views import (
+	DEFAULT_RESOURCE_BYTES,
+	RESOURCE_BLOCKING_PRESETS,
+	TYPICAL_RESOURCE_BYTES,
+	ResourceBlockingStats,
+)
+from workflow_use.schema.views import ResourceBlocking, ResourceBlockingProfile
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_profile(blocking: ResourceBlocking | None) -> ResourceBlockingProfile | None:
+	"""Turn a preset name or custom profile into a profile, ``None`` when nothing would be blocked."""
+	if blocking is None:
+		return None
+	profile = RESOURCE_BLOCKING_PRESETS[blocking] if isinstance(blocking, str) else blocking
+	if not profile.resource_types and not profile.url_patterns:
+		return None
+	return profile
+
+
+def _compile_patterns(patterns: List[str]) -> Optional[re.Pattern[str]]:
+	if not patterns:
+		return None
+	return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns))
+
+
+class ResourceBlocker:
+	"""
+	Aborts requests matching the active ResourceBlockingProfile of a browser context.
+
+	The route is installed once per run, switching profiles between steps only swaps
+	the compiled rules, so per-step profiles cost nothing extra.
+	"""
+
+	def __init__(self) -> None:
+		self.stats = ResourceBlockingStats()
+		self._context: Any = None
+		self._profile: ResourceBlockingProfile | None = None
+		self._types: frozenset[str] = frozenset()
+		self._block_urls: Optional[re.Pattern[str]] = None
+		self._allow_urls: Optional[re.Pattern[str]] = None
+
+	@property
+	def profile(self) -> ResourceBlockingProfile | None:
+		return self._profile
+
+	def set_profile(self, profile: ResourceBlockingProfile | None) -> None:
+		if profile is self._profile:
+			return
+		self._profile = profile
+		self._types = frozenset(profile.resource_types) if profile else frozenset()
+		self._block_urls = _compile_patterns(profile.url_patterns) if profile else None
+		self._allow_urls = _compile_patterns(profile.allow_url_patterns) if profile else None
+
+	def should_block(self, url: str, resource_type: str) -> bool:
+		if self._profile is None:
+			return False
+		if self._allow_urls is not None and self._allow_urls.match(url):
+			return False
+		if resource_type in self._types:
+			return True
+		return self._block_urls is not None and self._block_urls.match(url) is not None
+
+	async def attach(self, browser_context: Any) -> None:
+		"""Route every request of *browser_context* through the blocker."""
+		if self._context is browser_context:
+			return
+		await self.detach()
+		await browser_context.route('**/*', self._handle)
+		self._context = browser_context
+
+	async def detach(self) -> None:
+		if self._context is None:
+			return
+		try:
+			await self._context.unroute('**/*', self._handle)
+		except Exception as e:
+			# The context is usually already closed at the end of a run
+			logger.debug(f'Could not remove resource blocking route: {e}')
+		self._context = None
+
+	async def _handle(self, route: Any) -> None:
+		request = route.request
+		resource_type = request.resource_type
+		if not self.should_block(request.url, resource_type):
+			self.stats.allowed_requests += 1
+			await route.fallback()
+			return
+
+		self.stats.blocked_requests += 1
+		self.stats.blocked_by_type[resource_type] = self.stats.blocked_by_type.get(resource_type, 0) + 1
+		self.stats.estimated_blocked_bytes += TYPICAL_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES)
+		try:
+			await route.abort('blockedbyclient')
+		except Exception as e:
+			# The request may have been cancelled by the page in the meantime
+			logger.debug(f'Could not abort {request.url}: {e}')
@@ -0,0 +1,58 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+from workflow_use.schema.views import ResourceBlockingProfile
+
+_MEDIA_TYPES = ['image', 'media', 'font']
+
+_TRACKER_PATTERNS = [
+	'*google-analytics.com*',
+	'*googletagmanager.com*',
+	'*googlesyndication.com*',
+	'*googleadservices.com*',
+	'*doubleclick.net*',
+	'*connect.facebook.net*',
+	'*analytics.tiktok.com*',
+	'*bat.bing.com*',
+	'*clarity.ms*',
+	'*hotjar.com*',
+	'*segment.io*',
+	'*cdn.segment.com*',
+	'*mixpanel.com*',
+	'*amplitude.com*',
+	'*fullstory.com*',
+	'*nr-data.net*',
+	'*adnxs.com*',
+	'*criteo.com*',
+	'*taboola.com*',
+	'*outbrain.com*',
+]
+
+RESOURCE_BLOCKING_PRESETS: Dict[str, ResourceBlockingProfile] = {
+	'none': ResourceBlockingProfile(),
+	'media': ResourceBlockingProfile(resource_types=_MEDIA_TYPES),
+	'trackers': ResourceBlockingProfile(url_patterns=_TRACKER_PATTERNS),
+	'lean': ResourceBlockingProfile(resource_types=_MEDIA_TYPES, url_patterns=_TRACKER_PATTERNS),
+}
+
+# Aborted requests never report a size, blocked bytes are estimated from typical transfer sizes per resource type
+TYPICAL_RESOURCE_BYTES: Dict[str, int] = {
+	'image': 40_000,
+	'media': 500_000,
+	'font': 30_000,
+	'script': 25_000,
+	'stylesheet': 15_000,
+	'xhr': 5_000,
+	'fetch': 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 5_000
+
+
+class ResourceBlockingStats(BaseModel):
+	"""Counters of a ResourceBlocker for the current workflow run."""
+
+	blocked_requests: int = 0
+	allowed_requests: int = 0
+	blocked_by_type: Dict[str, int] = Field(default_factory=dict)
+	estimated_blocked_bytes: int = Field(default=0, description='Estimate from typical sizes per resource type.')
@@ -0,0 +1,255 @@
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from workflow_use.optimizer.views import OptimizationChange, OptimizationReport
+from workflow_use.readiness.views import DEFAULT_READINESS_POLICIES, ReadinessPolicy
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowStep
+
+logger = logging.getLogger(__name__)
+
+# Rough duration of the action itself, the readiness wait of the step type is added on top
+ACTION_ESTIMATE_MS: Dict[str, int] = {
+	'navigation': 800,
+	'click': 150,
+	'input': 150,
+	'select_change': 150,
+	'key_press': 100,
+	'scroll': 50,
+}
+DEFAULT_ACTION_ESTIMATE_MS = 100
+
+# Steps that target an element by selector, playwright scrolls that element into view before acting on it
+ELEMENT_STEP_TYPES = ('click', 'input', 'select_change', 'key_press')
+FILL_STEP_TYPES = ('input', 'select_change')
+# Steps that neither change the URL nor the state of the page
+READ_ONLY_STEP_TYPES = ('scroll', 'extract_page_content', 'extract_records')
+
+# (original index, step), the original index is what the report refers to
+_Entry = Tuple[int, WorkflowStep]
+Rule = Callable[[List[_Entry], List[OptimizationChange]], List[_Entry]]
+
+
+def estimate_step_ms(step_type: str) -> int:
+	"""Rough replay time of a step of *step_type*: the action plus its typical readiness wait."""
+	policy = DEFAULT_READINESS_POLICIES.get(step_type, ReadinessPolicy())
+	return ACTION_ESTIMATE_MS.get(step_type, DEFAULT_ACTION_ESTIMATE_MS) + policy.dom_quiet_ms + policy.network_idle_ms
+
+
+def _change(rule: str, action: str, entry: _Entry, detail: str) -> OptimizationChange:
+	index, step = entry
+	return OptimizationChange(
+		rule=rule,
+		action=action,  # type: ignore[arg-type]
+		step_index=index,
+		step_type=step.type,
+		detail=detail,
+		estimated_saved_ms=estimate_step_ms(step.type),
+	)
+
+
+def _removable(step: WorkflowStep) -> bool:
+	# Later steps may reference a step's output in a placeholder
+	return not step.output
+
+
+def _same_tab(a: WorkflowStep, b: WorkflowStep) -> bool:
+	return getattr(a, 'tabId', None) == getattr(b, 'tabId', None)
+
+
+def _normalize_url(url: str) -> str:
+	return url.rstrip('/')
+
+
+def drop_focus_clicks(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop clicks that only focus the field the next input/select step fills, that step clicks the field itself."""
+	kept: List[_Entry] = []
+	for position, entry in enumerate(entries):
+		step = entry[1]
+		next_step = entries[position + 1][1] if position + 1 < len(entries) else None
+		if (
+			step.type == 'click'
+			and _removable(step)
+			and next_step is not None
+			and next_step.type in FILL_STEP_TYPES
+			and getattr(next_step, 'cssSelector', None) == step.cssSelector  # type: ignore[union-attr]
+			and _same_tab(step, next_step)
+		):
+			changes.append(_change('focus_click', 'drop', entry, f'focuses {step.cssSelector} before {next_step.type}'))  # type: ignore[union-attr]
+			continue
+		kept.append(entry)
+	return kept
+
+
+def drop_focus_key_presses(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop Tab presses that only move the focus to the field the next input/select step fills by selector.
+
+	A Tab right after a filled field is kept: it commits autocomplete/typeahead choices and triggers blur validation.
+	"""
+	kept: List[_Entry] = []
+	for position, entry in enumerate(entries):
+		step = entry[1]
+		previous = kept[-1][1] if kept else None
+		after_fill = previous is not None and previous.type in FILL_STEP_TYPES and _same_tab(previous, step)
+		if step.type == 'key_press' and getattr(step, 'key', None) == 'Tab' and _removable(step) and not after_fill:
+			# Look past further Tab presses for the step the focus ends up on
+			cursor = position + 1
+			while (
+				cursor < len(entries)
+				and entries[cursor][1].type == 'key_press'
+				and getattr(entries[cursor][1], 'key', None) == 'Tab'
+			):
+				cursor += 1
+			if cursor < len(entries) and entries[cursor][1].type in FILL_STEP_TYPES and _same_tab(step, entries[cursor][1]):
+				changes.append(_change('focus_key_press', 'drop', entry, f'Tab before {entries[cursor][1].type}'))
+				continue
+		kept.append(entry)
+	return kept
+
+
+def drop_duplicate_key_presses(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop key presses recorded twice: same key, element and timestamp as the previous step."""
+	kept: List[_Entry] = []
+	for entry in entries:
+		step = entry[1]
+		previous = kept[-1][1] if kept else None
+		if (
+			step.type == 'key_press'
+			and _removable(step)
+			and previous is not None
+			and previous.type == 'key_press'
+			and step.timestamp is not None  # type: ignore[union-attr]
+			and (previous.key, previous.cssSelector, previous.timestamp) == (step.key, step.cssSelector, step.timestamp)  # type: ignore[union-attr]
+		):
+			changes.append(_change('duplicate_key_press', 'drop', entry, f'{step.key} recorded twice'))  # type: ignore[union-attr]
+			continue
+		kept.append(entry)
+	return kept
+
+
+def drop_redundant_navigations(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop navigations to the URL the previous navigation already opened when no step in between changed the page."""
+	kept: List[_Entry] = []
+	current_url: Optional[str] = None
+	for entry in entries:
+		step = entry[1]
+		if step.type == 'navigation':
+			url = _normalize_url(step.url)  # type: ignore[union-attr]
+			if url == current_url and _removable(step):
+				changes.append(_change('redundant_navigation', 'drop', entry, f'already on {step.url}'))  # type: ignore[union-attr]
+				continue
+			current_url = url
+		elif step.type not in READ_ONLY_STEP_TYPES:
+			# Reloading after an interaction resets the page state, that navigation is not redundant
+			current_url = None
+		kept.append(entry)
+	return kept
+
+
+def merge_scrolls(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Merge consecutive scrolls into one (scrolls are replayed as relative offsets) and drop scrolls by (0, 0)."""
+	kept: List[_Entry] = []
+	for entry in entries:
+		step = entry[1]
+		if step.type != 'scroll' or not _removable(step):
+			kept.append(entry)
+			continue
+		if step.scrollX == 0 and step.scrollY == 0:  # type: ignore[union-attr]
+			changes.append(_change('noop_scroll', 'drop', entry, 'scrolls by (0, 0)'))
+			continue
+		previous = kept[-1] if kept else None
+		if previous is not None and previous[1].type == 'scroll' and _removable(previous[1]) and _same_tab(previous[1], step):
+			merged = previous[1].model_copy(
+				update={
+					'scrollX': previous[1].scrollX + step.scrollX,  # type: ignore[union-attr]
+					'scrollY': previous[1].scrollY + step.scrollY,  # type: ignore[union-attr]
+				}
+			)
+			kept[-1] = (previous[0], merged)
+			changes.append(_change('merged_scroll', 'merge', entry, f'merged into step {previous[0] + 1}'))
+			continue
+		kept.append(entry)
+	return kept
+
+
+def drop_scrolls_before_navigation(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop scrolls directly followed by a navigation, the new page starts at the top anyway."""
+	kept: List[_Entry] = []
+	for position, entry in enumerate(entries):
+		step = entry[1]
+		next_step = entries[position + 1][1] if position + 1 < len(entries) else None
+		if step.type == 'scroll' and _removable(step) and next_step is not None and next_step.type == 'navigation':
+			changes.append(_change('scroll_before_navigation', 'drop', entry, 'followed by a navigation'))
+			continue
+		kept.append(entry)
+	return kept
+
+
+def drop_scrolls_into_view(entries: List[_Entry], changes: List[OptimizationChange]) -> List[_Entry]:
+	"""Drop scrolls directly followed by a step on an element, playwright scrolls that element into view.
+
+	Not part of the default rules: on pages that lazy-load content while scrolling the element may only
+	exist after the scroll.
+	"""
+	kept: List[_Entry] = []
+	for position, entry in enumerate(entries):
+		step = entry[1]
+		next_step = entries[position + 1][1] if position + 1 < len(entries) else None
+		if (
+			step.type == 'scroll'
+			and _removable(step)
+			and next_step is not None
+			and next_step.type in ELEMENT_STEP_TYPES
+			and getattr(next_step, 'cssSelector', None)
+		):
+			changes.append(_change('scroll_into_view', 'drop', entry, f'{next_step.type} scrolls its element into view'))
+			continue
+		kept.append(entry)
+	return kept
+
+
+DEFAULT_RULES: Dict[str, Rule] = {
+	'focus_click': drop_focus_clicks,
+	'focus_key_press': drop_focus_key_presses,
+	'duplicate_key_press': drop_duplicate_key_presses,
+	'merge_scrolls': merge_scrolls,
+	'scroll_before_navigation': drop_scrolls_before_navigation,
+	'redundant_navigation': drop_redundant_navigations,
+}
+AGGRESSIVE_RULES: Dict[str, Rule] = {**DEFAULT_RULES, 'scroll_into_view': drop_scrolls_into_view}
+
+# Removing a step can make its neighbours redundant, the rules run until nothing changes
+MAX_PASSES = 5
+
+
+def optimize_steps(
+	steps: Sequence[WorkflowStep], rules: Dict[str, Rule] | None = None
+) -> Tuple[List[WorkflowStep], OptimizationReport]:
+	"""Apply the rewrite *rules* (by default DEFAULT_RULES) to *steps* until none of them applies anymore."""
+	rules = DEFAULT_RULES if rules is None else rules
+	entries: List[_Entry] = list(enumerate(steps))
+	changes: List[OptimizationChange] = []
+	for _ in range(MAX_PASSES):
+		applied = len(changes)
+		for rule in rules.values():
+			entries = rule(entries, changes)
+		if len(changes) == applied:
+			break
+
+	# A workflow needs at least one step
+	if not entries and steps:
+		entries = [(0, steps[0])]
+		changes = [change for change in changes if change.step_index != 0]
+
+	changes.sort(key=lambda change: change.step_index)
+	report = OptimizationReport(steps_before=len(steps), steps_after=len(entries), changes=changes)
+	return [step for _, step in entries], report
+
+
+def optimize_workflow(
+	workflow: WorkflowDefinitionSchema, rules: Dict[str, Rule] | None = None
+) -> Tuple[WorkflowDefinitionSchema, OptimizationReport]:
+	"""Return a copy of *workflow* without its redundant steps, and a report of what was removed."""
+	steps, report = optimize_steps(workflow.steps, rules)
+	if report.changes:
+		logger.info(f'Optimized workflow {workflow.name}: {report.summary()}')
+	return workflow.model_copy(update={'steps': steps}), report
@@ -0,0 +1,22 @@
+from workflow_use.optimizer.service import optimize_steps
+
+
+def _tab() -> dict:
+	return {'type': 'key_press', 'key': 'Tab', 'cssSelector': 'body'}
+
+
+def _input(selector: str) -> dict:
+	return {'type': 'input', 'cssSelector': selector, 'value': 'x'}
+
+
+def test_tab_leaving_a_filled_field_is_kept(make_steps):
+	steps, _ = optimize_steps(make_steps(_input('#city'), _tab(), _input('#zip')))
+
+	assert [step.type for step in steps] == ['input', 'key_press', 'input']
+
+
+def test_tab_only_moving_focus_to_next_field_is_dropped(make_steps):
+	steps, report = optimize_steps(make_steps({'type': 'click', 'cssSelector': '#start'}, _tab(), _input('#name')))
+
+	assert [step.type for step in steps] == ['click', 'input']
+	assert [change.rule for change in report.changes] == ['focus_key_press']
@@ -0,0 +1,45 @@
+from typing import Dict, List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class OptimizationChange(BaseModel):
+	"""One rewrite applied to the steps of a workflow."""
+
+	rule: str = Field(..., description='Name of the rule that applied the rewrite.')
+	action: Literal['drop', 'merge']
+	step_index: int = Field(..., description='Index of the dropped (or merged away) step in the original workflow.')
+	step_type: str
+	detail: str = ''
+	estimated_saved_ms: int = Field(default=0, description='Rough replay time of the removed step, including its readiness wait.')
+
+
+class OptimizationReport(BaseModel):
+	"""Summary of an optimizer pass over a workflow."""
+
+	steps_before: int
+	steps_after: int
+	changes: List[OptimizationChange] = Field(default_factory=list)
+
+	@property
+	def steps_removed(self) -> int:
+		return self.steps_before - self.steps_after
+
+	@property
+	def estimated_saved_ms(self) -> int:
+		return sum(change.estimated_saved_ms for change in self.changes)
+
+	def by_rule(self) -> Dict[str, int]:
+		counts: Dict[str, int] = {}
+		for change in self.changes:
+			counts[change.rule] = counts.get(change.rule, 0) + 1
+		return counts
+
+	def summary(self) -> str:
+		if not self.changes:
+			return f'No redundant steps found ({self.steps_before} steps).'
+		rules = ', '.join(f'{rule}: {count}' for rule, count in self.by_rule().items())
+		return (
+			f'Removed {self.steps_removed}/{self.steps_before} steps ({rules}), '
+			f'estimated ~{self.estimated_saved_ms / 1000:.1f}s saved per run.'
+		)
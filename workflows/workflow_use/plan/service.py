@@ -0,0 +1,205 @@
+import logging
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from browser_use.controller.registry.views import ActionModel
+from pydantic import BaseModel, ValidationError
+
+from workflow_use.controller.utils import build_selector_candidates
+from workflow_use.schema.views import AgenticWorkflowStep, WorkflowStep
+
+logger = logging.getLogger(__name__)
+
+# Step fields the fallback selector list is derived from
+SELECTOR_FIELDS = ('cssSelector', 'fallbackSelectors', 'xpath', 'elementTag', 'elementText')
+
+# Step types a fused form fill executes, Tab presses between them only move the focus and are fused as well
+FUSABLE_STEP_TYPES = ('input', 'select_change')
+MIN_FUSED_FILLS = 2
+
+_FORMATTER = Formatter()
+
+
+class CompiledTemplate:
+	"""A ``str.format`` template parsed once, filled without raising when context keys are missing."""
+
+	__slots__ = ('template', 'names')
+
+	def __init__(self, template: str, names: frozenset[str]) -> None:
+		self.template = template
+		self.names = names
+
+	@classmethod
+	def parse(cls, value: str) -> Optional['CompiledTemplate']:
+		"""Compile *value*, or return ``None`` when it is used verbatim (no braces or not a valid template)."""
+		if '{' not in value or '}' not in value:
+			return None
+		try:
+			fields = [field_name for _, field_name, _, _ in _FORMATTER.parse(value) if field_name is not None]
+		except ValueError:
+			return None
+		names = set()
+		for field_name in fields:
+			# '{user.name}' / '{rows[0]}' look up 'user' / 'rows' in the context
+			root = field_name.split('.', 1)[0].split('[', 1)[0]
+			if not root or root.isdigit():
+				# Positional fields can never be filled from the context
+				return None
+			names.add(root)
+		return cls(value, frozenset(names))
+
+	def fill(self, context: Dict[str, Any]) -> str:
+		# Like the previous per-step resolution, a template with unknown placeholders is kept as is
+		if not self.names <= context.keys():
+			return self.template
+		try:
+			return self.template.format_map(context)
+		except (KeyError, AttributeError, IndexError, TypeError):
+			return self.template
+
+
+def _contains_placeholder(value: Any) -> bool:
+	if isinstance(value, str):
+		return CompiledTemplate.parse(value) is not None
+	if isinstance(value, BaseModel):
+		return any(_contains_placeholder(getattr(value, name)) for name in type(value).model_fields)
+	if isinstance(value, dict):
+		return any(_contains_placeholder(item) for item in value.values())
+	if isinstance(value, (list, tuple)):
+		return any(_contains_placeholder(item) for item in value)
+	return False
+
+
+class CompiledStep:
+	"""
+	Everything about a step that does not depend on the run's inputs, computed once per workflow:
+	its placeholder templates, its cached action model and (for static selectors) its fallback selector list.
+	"""
+
+	__slots__ = ('index', 'step', 'templates', 'nested_fields', 'action_model', 'static_action', 'selector_candidates')
+
+	def __init__(
+		self,
+		index: int,
+		step: WorkflowStep,
+		templates: Dict[str, CompiledTemplate],
+		nested_fields: List[str],
+		action_model: type[ActionModel] | None,
+		selector_candidates: Optional[List[str]],
+	) -> None:
+		self.index = index
+		self.step = step
+		self.templates = templates
+		self.nested_fields = nested_fields
+		self.action_model = action_model
+		self.selector_candidates = selector_candidates
+		# Steps without placeholders always produce the same action, it is built once
+		self.static_action: ActionModel | None = None
+		if action_model is not None and not templates and not nested_fields:
+			try:
+				self.static_action = action_model(**{step.type: step.model_dump()})
+			except ValidationError:
+				# Reported (and possibly handled by the agent fallback) when the step runs
+				pass
+
+	def resolve(self, context: Dict[str, Any], resolve_value: Callable[[Any], Any]) -> WorkflowStep:
+		"""Fill the step's placeholders from *context*, nested values are handed to *resolve_value*."""
+		if not self.templates and not self.nested_fields:
+			return self.step
+		update: Dict[str, Any] = {}
+		for name, template in self.templates.items():
+			value = template.fill(context)
+			if value is not template.template:
+				update[name] = value
+		for name in self.nested_fields:
+			original = getattr(self.step, name)
+			value = resolve_value(original)
+			if value is not original:
+				update[name] = value
+		return self.step.model_copy(update=update) if update else self.step
+
+	def action(self, step_resolved: WorkflowStep) -> ActionModel:
+		assert self.action_model is not None, f'Step {self.index + 1} ({self.step.type}) has no controller action'
+		if step_resolved is self.step and self.static_action is not None:
+			return self.static_action
+		return self.action_model(**{step_resolved.type: step_resolved.model_dump()})
+
+
+class ExecutionPlan:
+	"""Compiled steps of a workflow, so running a step is a table lookup plus a template fill."""
+
+	def __init__(self, steps: List[CompiledStep], fill_groups: Dict[int, range] | None = None) -> None:
+		self.steps = steps
+		# Start index -> indexes of a run of steps that can be filled in one in-page operation
+		self.fill_groups = fill_groups or {}
+
+	def __getitem__(self, step_index: int) -> CompiledStep:
+		return self.steps[step_index]
+
+	def __len__(self) -> int:
+		return len(self.steps)
+
+
+def compile_step(index: int, step: WorkflowStep, action_models: Dict[str, type[ActionModel]]) -> CompiledStep:
+	templates: Dict[str, CompiledTemplate] = {}
+	nested_fields: List[str] = []
+	# Only declared fields are resolved, extra fields captured from the recording are passed through as is
+	for name in type(step).model_fields:
+		value = getattr(step, name)
+		if isinstance(value, str):
+			template = CompiledTemplate.parse(value)
+			if template is not None:
+				templates[name] = template
+		elif _contains_placeholder(value):
+			nested_fields.append(name)
+
+	selector_candidates = None
+	css_selector = getattr(step, 'cssSelector', None)
+	if css_selector and not any(name in templates or name in nested_fields for name in SELECTOR_FIELDS):
+		selector_candidates = build_selector_candidates(css_selector, step)
+
+	action_model = None if isinstance(step, AgenticWorkflowStep) else action_models.get(step.type)
+	return CompiledStep(index, step, templates, nested_fields, action_model, selector_candidates)
+
+
+def _is_focus_move(step: WorkflowStep) -> bool:
+	return step.type == 'key_press' and getattr(step, 'key', None) == 'Tab'
+
+
+def find_fill_groups(steps: Sequence[WorkflowStep]) -> Dict[int, range]:
+	"""Find runs of input/select steps (optionally separated by Tab presses) that can be fused into one fill.
+
+	A run ends after a step with an ``output``, later steps of the run could reference it in a placeholder.
+	"""
+	groups: Dict[int, range] = {}
+	index = 0
+	while index < len(steps):
+		if steps[index].type not in FUSABLE_STEP_TYPES:
+			index += 1
+			continue
+		end = index
+		cursor = index
+		while not steps[cursor].output and cursor + 1 < len(steps):
+			next_step = steps[cursor + 1]
+			if next_step.type in FUSABLE_STEP_TYPES:
+				end = cursor + 1
+			elif not _is_focus_move(next_step):
+				break
+			cursor += 1
+		fills = sum(1 for step in steps[index : end + 1] if step.type in FUSABLE_STEP_TYPES)
+		if fills >= MIN_FUSED_FILLS:
+			groups[index] = range(index, end + 1)
+		index = end + 1
+	return groups
+
+
+def compile_steps(steps: Sequence[WorkflowStep], create_action_model: Callable[[str], type[ActionModel]]) -> ExecutionPlan:
+	"""Compile *steps*, creating one action model per deterministic action type."""
+	action_models: Dict[str, type[ActionModel]] = {}
+	for step in steps:
+		if not isinstance(step, AgenticWorkflowStep) and step.type not in action_models:
+			action_models[step.type] = create_action_model(step.type)
+	return ExecutionPlan(
+		[compile_step(index, step, action_models) for index, step in enumerate(steps)],
+		find_fill_groups(steps),
+	)
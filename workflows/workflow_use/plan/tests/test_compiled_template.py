@@ -0,0 +1,32 @@
+import pytest
+
+from workflow_use.plan.service import CompiledTemplate
+
+
+@pytest.mark.parametrize('value', ['plain text', 'a } b {', '{unclosed', '{0}', 'x {} y', '{!r}'])
+def test_values_without_named_placeholders_are_used_verbatim(value):
+	assert CompiledTemplate.parse(value) is None
+
+
+def test_placeholders_are_looked_up_by_their_root_name():
+	template = CompiledTemplate.parse('{user.name} lives at {address[city]}, {user.age}')
+
+	assert template is not None
+	assert template.names == frozenset({'user', 'address'})
+
+
+def test_fill_keeps_the_template_when_a_value_is_missing_or_unusable():
+	template = CompiledTemplate.parse('Hello {name}, you are {age:d}')
+	assert template is not None
+
+	assert template.fill({'name': 'Ada', 'age': 36, 'unused': 1}) == 'Hello Ada, you are 36'
+	assert template.fill({'name': 'Ada'}) == template.template
+	assert template.fill({'name': 'Ada', 'age': None}) == template.template
+
+
+def test_fill_keeps_the_template_when_a_nested_lookup_fails():
+	template = CompiledTemplate.parse('{user.email}')
+	assert template is not None
+
+	assert template.fill({'user': {'email': 'x'}}) == '{user.email}'
+	assert template.fill({'user': type('User', (), {'email': 'ada@example.com'})}) == 'ada@example.com'
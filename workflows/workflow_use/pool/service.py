@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from browser_use import Browser
+from browser_use.browser.profile import BrowserProfile
+from patchright.async_api import async_playwright as patchright_async_playwright
+
+from workflow_use.pool.views import BrowserPoolConfig, BrowserPoolStats
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolSlot:
+	"""A single browser process owned by the pool."""
+
+	def __init__(self, index: int) -> None:
+		self.index = index
+		self.browser: Any = None  # playwright Browser, launched lazily
+		self.runs = 0
+
+
+class BrowserPool:
+	"""
+	Pool of browser processes shared by concurrent workflow runs.
+
+	Every lease gets a fresh, isolated browser context inside one of the pooled
+	browser processes, so runs never share cookies, storage or tabs while still
+	skipping the cost of launching Chromium. Browsers are health-checked on every
+	lease and recycled after ``max_runs_per_browser`` leases.
+	"""
+
+	def __init__(self, config: BrowserPoolConfig | None = None, browser_profile: BrowserProfile | None = None) -> None:
+		self.config = config or BrowserPoolConfig()
+		# Contexts are created per lease, so the pooled browsers never use a persistent user_data_dir.
+		# keep_alive=True prevents the Workflow / Agent from killing a pooled browser when they finish.
+		self.browser_profile = (browser_profile or BrowserProfile()).model_copy(
+			update={'user_data_dir': None, 'keep_alive': True}
+		)
+
+		self._playwright: Any = None
+		self._start_lock = asyncio.Lock()
+		self._idle: asyncio.Queue[_PoolSlot] = asyncio.Queue()
+		for index in range(self.config.size):
+			self._idle.put_nowait(_PoolSlot(index))
+		self._closed = False
+
+		self._launched = 0
+		self._leases = 0
+		self._recycled = 0
+		self._unhealthy = 0
+		self._total_wait_ms = 0.0
+
+	async def start(self) -> None:
+		"""Start the playwright driver. Browsers themselves are launched lazily on first lease."""
+		async with self._start_lock:
+			if self._playwright is None:
+				self._playwright = await patchright_async_playwright().start()
+				self.browser_profile.detect_display_configuration()
+
+	@asynccontextmanager
+	async def lease(self) -> AsyncIterator[Browser]:
+		"""Lease an isolated browser session for the duration of the ``async with`` block."""
+		if self._closed:
+			raise RuntimeError('BrowserPool is closed')
+		await self.start()
+
+		wait_start = time.perf_counter()
+		slot = await asyncio.wait_for(self._idle.get(), timeout=self.config.acquire_timeout_s)
+		wait_ms = (time.perf_counter() - wait_start) * 1000
+		self._total_wait_ms += wait_ms
+		self._leases += 1
+
+		session: Browser | None = None
+		try:
+			session = await self._open_session(slot)
+			logger.info(
+				f'Leased browser #{slot.index} (run {slot.runs + 1}/{self.config.max_runs_per_browser}, waited {wait_ms:.0f}ms)'
+			)
+			yield session
+		finally:
+			await self._release(slot, session)
+
+	async def close(self) -> None:
+		"""Close every pooled browser and stop the playwright driver."""
+		self._closed = True
+		slots: list[_PoolSlot] = []
+		while not self._idle.empty():
+			slots.append(self._idle.get_nowait())
+		for slot in slots:
+			await self._close_browser(slot)
+		if self._playwright is not None:
+			await self._playwright.stop()
+			self._playwright = None
+
+	def stats(self) -> BrowserPoolStats:
+		idle = self._idle.qsize()
+		return BrowserPoolStats(
+			size=self.config.size,
+			idle=idle,
+			in_use=self.config.size - idle,
+			launched=self._launched,
+			leases=self._leases,
+			recycled=self._recycled,
+			unhealthy=self._unhealthy,
+			total_wait_ms=self._total_wait_ms,
+		)
+
+	# --- Internals ---
+	async def _open_session(self, slot: _PoolSlot) -> Browser:
+		"""Create a new context in the slot's browser, relaunching the browser once if it is unhealthy."""
+		for attempt in range(2):
+			if slot.browser is None or not slot.browser.is_connected():
+				await self._launch_browser(slot)
+
+			# The context is created here: given only the browser, browser_use reuses its first context, which
+			# a browser attached over CDP always has and would then be shared by every lease
+			browser: Any = slot.browser
+			profile = self.browser_profile.model_copy()
+			session = Browser(browser_profile=profile, playwright=self._playwright, browser=browser)
+			try:
+				session.browser_context = await browser.new_context(**profile.kwargs_for_new_context().model_dump())
+				await session.start()
+				await self._health_check(session)
+				return session
+			except Exception as e:
+				self._unhealthy += 1
+				logger.warning(f'Pooled browser #{slot.index} failed health check (attempt {attempt + 1}): {e}')
+				await self._close_context(session)
+				await self._close_browser(slot)
+
+		raise RuntimeError(f'Pooled browser #{slot.index} could not be started')
+
+	async def _health_check(self, session: Browser) -> None:
+		page = await session.get_current_page()
+		await asyncio.wait_for(page.evaluate('1'), timeout=self.config.health_check_timeout_ms / 1000)
+
+	async def _launch_browser(self, slot: _PoolSlot) -> None:
+		slot.browser = await self._playwright.chromium.launch(**self.browser_profile.kwargs_for_launch().model_dump())
+		slot.runs = 0
+		self._launched += 1
+		logger.info(f'Launched pooled browser #{slot.index}')
+
+	async def _release(self, slot: _PoolSlot, session: Optional[Browser]) -> None:
+		try:
+			if session is not None:
+				await self._close_context(session)
+				slot.runs += 1
+			if slot.runs >= self.config.max_runs_per_browser:
+				logger.info(f'Recycling pooled browser #{slot.index} after {slot.runs} runs')
+				self._recycled += 1
+				await self._close_browser(slot)
+			if self._closed:
+				await self._close_browser(slot)
+		finally:
+			self._idle.put_nowait(slot)
+
+	@staticmethod
+	async def _close_context(session: Browser) -> None:
+		if session.browser_context is None:
+			return
+		try:
+			await session.browser_context.close()
+		except Exception as e:
+			logger.debug(f'Error closing pooled browser context: {e}')
+		session.browser_context = None
+		session.agent_current_page = None
+		session.human_current_page = None
+
+	@staticmethod
+	async def _close_browser(slot: _PoolSlot) -> None:
+		if slot.browser is None:
+			return
+		try:
+			await slot.browser.close()
+		except Exception as e:
+			logger.debug(f'Error closing pooled browser #{slot.index}: {e}')
+		slot.browser = None
+		slot.runs = 0
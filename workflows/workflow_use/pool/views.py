@@ -0,0 +1,32 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class BrowserPoolConfig(BaseModel):
+	"""Configuration for a BrowserPool."""
+
+	size: int = Field(default=2, ge=1, description='Maximum number of browsers (and therefore concurrent leases) in the pool.')
+	max_runs_per_browser: int = Field(
+		default=25,
+		ge=1,
+		description='Number of leases after which a browser process is closed and relaunched on next use.',
+	)
+	health_check_timeout_ms: int = Field(default=5000, ge=1, description='Timeout for the health probe run on every lease.')
+	acquire_timeout_s: Optional[float] = Field(
+		default=None,
+		description='How long lease() waits for a free browser before raising TimeoutError (None waits forever).',
+	)
+
+
+class BrowserPoolStats(BaseModel):
+	"""Counters describing the activity of a BrowserPool."""
+
+	size: int
+	idle: int
+	in_use: int
+	launched: int = 0
+	leases: int = 0
+	recycled: int = 0
+	unhealthy: int = 0
+	total_wait_ms: float = 0.0
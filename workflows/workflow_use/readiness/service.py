@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from workflow_use.readiness.views import DEFAULT_READINESS_POLICIES, ReadinessPolicy, ReadinessReport
+from workflow_use.tracing.service import trace_span
+
+logger = logging.getLogger(__name__)
+
+# Fixed waits the runtime used to pay per step before the readiness engine existed:
+# 100ms sleep + browser-use's 500ms network idle window before every step, another 500ms network idle
+# window in the look-ahead of deterministic steps and 2x500ms sleeps inside the input action.
+LEGACY_STEP_WAIT_MS = 600
+LEGACY_LOOKAHEAD_WAIT_MS = 500
+LEGACY_INPUT_WAIT_MS = 1000
+
+# Requests that never settle (streams, beacons, chat widgets...) must not block network idle
+IGNORED_RESOURCE_TYPES = {'websocket', 'eventsource', 'media', 'manifest', 'ping'}
+IGNORED_URL_PATTERNS = (
+	'analytics',
+	'tracking',
+	'telemetry',
+	'beacon',
+	'doubleclick',
+	'googletagmanager',
+	'adsystem',
+	'hotjar',
+	'intercom',
+	'livechat',
+	'zendesk',
+	'heartbeat',
+)
+
+# Resolves once no relevant DOM mutation was observed for quietMs, or after timeoutMs. Attribute churn (carousels,
+# spinners, CSS classes toggled by animations) never settles, so only attributes that gate interaction are watched,
+# and mutations of elements outside the viewport are ignored.
+WAIT_FOR_DOM_QUIET_JS = """
+({ quietMs, timeoutMs }) => new Promise((resolve) => {
+	const start = performance.now();
+	let last = start;
+	const root = document.documentElement || document;
+	const inViewport = (node) => {
+		const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+		if (!element || !element.isConnected) return false;
+		const rect = element.getBoundingClientRect();
+		return rect.bottom >= 0 && rect.right >= 0 && rect.top <= window.innerHeight && rect.left <= window.innerWidth;
+	};
+	const observer = new MutationObserver((mutations) => {
+		if (mutations.some((mutation) => inViewport(mutation.target))) last = performance.now();
+	});
+	observer.observe(root, {
+		subtree: true,
+		childList: true,
+		characterData: true,
+		attributeFilter: ['disabled', 'hidden', 'aria-busy', 'aria-hidden', 'aria-disabled'],
+	});
+	const check = () => {
+		const now = performance.now();
+		const quiet = now - last >= quietMs;
+		if (quiet || now - start >= timeoutMs) {
+			observer.disconnect();
+			resolve(quiet);
+			return;
+		}
+		setTimeout(check, Math.max(10, Math.min(quietMs - (now - last), 50)));
+	};
+	setTimeout(check, quietMs);
+})
+"""
+
+
+async def wait_for_dom_quiet(page: Any, quiet_ms: int, timeout_ms: int) -> bool:
+	"""Wait in-page until the DOM has not changed for *quiet_ms*. Returns False on timeout."""
+	if quiet_ms <= 0 or timeout_ms <= 0:
+		return True
+	try:
+		return bool(await page.evaluate(WAIT_FOR_DOM_QUIET_JS, {'quietMs': quiet_ms, 'timeoutMs': timeout_ms}))
+	except Exception as e:
+		# The execution context is destroyed when the step triggered a navigation, wait for the new document instead
+		logger.debug(f'DOM quiet probe interrupted ({e}), waiting for domcontentloaded')
+		try:
+			await page.wait_for_load_state('domcontentloaded', timeout=timeout_ms)
+		except Exception:
+			return False
+		return False
+
+
+class _NetworkTracker:
+	"""Tracks in-flight requests of a page through playwright events."""
+
+	def __init__(self, page: Any) -> None:
+		self.pending: set = set()
+		self.last_activity = time.monotonic()
+		page.on('request', self._on_request)
+		page.on('requestfinished', self._on_done)
+		page.on('requestfailed', self._on_done)
+
+	def _on_request(self, request: Any) -> None:
+		if request.resource_type in IGNORED_RESOURCE_TYPES:
+			return
+		url = request.url.lower()
+		if url.startswith(('data:', 'blob:')) or any(pattern in url for pattern in IGNORED_URL_PATTERNS):
+			return
+		self.pending.add(request)
+		self.last_activity = time.monotonic()
+
+	def _on_done(self, request: Any) -> None:
+		if request in self.pending:
+			self.pending.discard(request)
+			self.last_activity = time.monotonic()
+
+	async def wait_for_idle(self, idle_ms: int, timeout_ms: int) -> bool:
+		"""Wait until no tracked request was in flight for *idle_ms*. Returns False on timeout."""
+		if idle_ms <= 0 or timeout_ms <= 0:
+			return True
+		deadline = time.monotonic() + timeout_ms / 1000
+		while True:
+			now = time.monotonic()
+			if not self.pending and now - self.last_activity >= idle_ms / 1000:
+				return True
+			if now >= deadline:
+				return False
+			await asyncio.sleep(0.02)
+
+
+class ReadinessEngine:
+	"""
+	Event-driven replacement for fixed sleeps between workflow steps.
+
+	After every step the engine waits only as long as the step's ReadinessPolicy
+	requires: until the DOM stopped mutating (in-page MutationObserver) and no
+	tracked request is in flight. Waiting for the next step's target element is
+	done by the look-ahead in Workflow._run_deterministic_step.
+	"""
+
+	def __init__(self, policies: Dict[str, ReadinessPolicy] | None = None) -> None:
+		self.policies = {**DEFAULT_READINESS_POLICIES, **(policies or {})}
+		self._trackers: Dict[int, _NetworkTracker] = {}
+
+	def policy_for(self, step_type: str) -> ReadinessPolicy:
+		return self.policies.get(step_type, ReadinessPolicy())
+
+	def track(self, page: Any) -> None:
+		"""Start tracking network activity of *page* (idempotent). Call before running a step on it."""
+		key = id(page)
+		if key in self._trackers:
+			return
+		self._trackers[key] = _NetworkTracker(page)
+		page.on('close', lambda _: self._trackers.pop(key, None))
+
+	async def settle(self, page: Any, step_type: str) -> ReadinessReport:
+		"""Wait until *page* is ready after a step of *step_type* was executed."""
+		policy = self.policy_for(step_type)
+		start = time.perf_counter()
+		if policy.timeout_ms <= 0:
+			return ReadinessReport(waited_ms=0)
+
+		self.track(page)
+		tracker = self._trackers[id(page)]
+		with trace_span('readiness wait', 'wait', step_type=step_type) as span:
+			dom_quiet, network_idle = await asyncio.gather(
+				wait_for_dom_quiet(page, policy.dom_quiet_ms, policy.timeout_ms),
+				tracker.wait_for_idle(policy.network_idle_ms, policy.timeout_ms),
+			)
+			span.set(dom_quiet=dom_quiet, network_idle=network_idle, pending_requests=len(tracker.pending))
+		return ReadinessReport(
+			waited_ms=(time.perf_counter() - start) * 1000,
+			dom_quiet=dom_quiet,
+			network_idle=network_idle,
+			timed_out=not (dom_quiet and network_idle),
+		)
+
+
+def legacy_wait_estimate_ms(step_type: str, has_lookahead: bool) -> int:
+	"""Lower bound of the fixed waits a step of *step_type* used to cost, used to report time saved."""
+	estimate = LEGACY_STEP_WAIT_MS
+	if has_lookahead:
+		estimate += LEGACY_LOOKAHEAD_WAIT_MS
+	if step_type == 'input':
+		estimate += LEGACY_INPUT_WAIT_MS
+	return estimate
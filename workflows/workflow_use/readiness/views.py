@@ -0,0 +1,37 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class ReadinessPolicy(BaseModel):
+	"""How long to wait for the page to settle after a step of a given type."""
+
+	dom_quiet_ms: int = Field(default=100, ge=0, description='Required window without DOM mutations (0 disables the DOM check).')
+	network_idle_ms: int = Field(
+		default=0, ge=0, description='Required window without in-flight requests (0 disables the check).'
+	)
+	timeout_ms: int = Field(default=3000, ge=0, description='Upper bound for the whole readiness wait.')
+
+
+class ReadinessReport(BaseModel):
+	"""Result of a single readiness wait."""
+
+	waited_ms: float
+	dom_quiet: bool = True
+	network_idle: bool = True
+	timed_out: bool = False
+
+
+# Per step type policies. Actions that commonly trigger requests (navigation, click, key presses such as Enter)
+# also wait for the network, pure DOM interactions only wait for the DOM to stop changing.
+DEFAULT_READINESS_POLICIES: Dict[str, ReadinessPolicy] = {
+	'navigation': ReadinessPolicy(dom_quiet_ms=150, network_idle_ms=300, timeout_ms=5000),
+	'click': ReadinessPolicy(dom_quiet_ms=100, network_idle_ms=200, timeout_ms=3000),
+	'key_press': ReadinessPolicy(dom_quiet_ms=100, network_idle_ms=200, timeout_ms=3000),
+	'input': ReadinessPolicy(dom_quiet_ms=50, network_idle_ms=0, timeout_ms=1000),
+	'select_change': ReadinessPolicy(dom_quiet_ms=75, network_idle_ms=0, timeout_ms=1500),
+	'scroll': ReadinessPolicy(dom_quiet_ms=50, network_idle_ms=0, timeout_ms=1000),
+	'extract_page_content': ReadinessPolicy(dom_quiet_ms=0, network_idle_ms=0, timeout_ms=0),
+	'extract_records': ReadinessPolicy(dom_quiet_ms=0, network_idle_ms=0, timeout_ms=0),
+	'agent': ReadinessPolicy(dom_quiet_ms=100, network_idle_ms=300, timeout_ms=3000),
+}
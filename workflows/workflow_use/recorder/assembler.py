@@ -0,0 +1,75 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from workflow_use.recorder.views import (
+	HttpStepAppendEvent,
+	HttpStepReplaceEvent,
+	HttpWorkflowPatchEvent,
+	HttpWorkflowUpdateEvent,
+	WorkflowChangeEvent,
+)
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowStep
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METADATA: Dict[str, Any] = {'name': 'Recorded Workflow', 'description': '', 'version': '1.0.0', 'input_schema': []}
+
+
+class WorkflowAssembler:
+	"""Assembles the recorded workflow from the extension's sequenced step events.
+
+	Every step is validated once when it arrives, the whole workflow only when it is built. A full WORKFLOW_UPDATE
+	replaces the state and restarts the sequence. Events already applied are ignored, and after a gap or an invalid
+	index the step events are dropped until the next full update (``needs_resync``).
+	"""
+
+	def __init__(self):
+		self.reset()
+
+	def reset(self) -> None:
+		self.seq = 0
+		self.metadata: Dict[str, Any] = dict(DEFAULT_METADATA)
+		self.steps: List[WorkflowStep] = []
+		self.needs_resync = False
+
+	def apply(self, event: WorkflowChangeEvent) -> bool:
+		"""Apply *event*, returns False when the extension has to resend the whole workflow."""
+		if isinstance(event, HttpWorkflowUpdateEvent):
+			self.metadata = event.payload.model_dump(exclude={'steps'})
+			self.steps = list(event.payload.steps)
+			self.seq = event.seq or 0
+			self.needs_resync = False
+			return True
+
+		if event.seq <= self.seq:
+			logger.debug(f'Ignoring {event.type} #{event.seq}, already at #{self.seq}')
+			return True
+		if self.needs_resync:
+			return False
+		if event.seq != self.seq + 1:
+			return self._lost(f'{event.type} #{event.seq} arrived after #{self.seq}')
+
+		if isinstance(event, HttpStepAppendEvent):
+			self.steps.append(event.payload)
+		elif isinstance(event, HttpStepReplaceEvent):
+			if not 0 <= event.payload.index < len(self.steps):
+				return self._lost(f'{event.type} #{event.seq} replaces step {event.payload.index} of {len(self.steps)}')
+			self.steps[event.payload.index] = event.payload.step
+		elif isinstance(event, HttpWorkflowPatchEvent):
+			patch = event.payload.model_dump(exclude={'step_count'}, exclude_none=True)
+			self.metadata.update(patch)
+			if event.payload.step_count is not None:
+				del self.steps[event.payload.step_count :]
+		self.seq = event.seq
+		return True
+
+	def _lost(self, reason: str) -> bool:
+		logger.warning(f'Recording events out of sync ({reason}), waiting for the full workflow')
+		self.needs_resync = True
+		return False
+
+	def build(self) -> Optional[WorkflowDefinitionSchema]:
+		"""The recorded workflow, None if no step was recorded."""
+		if not self.steps:
+			return None
+		return WorkflowDefinitionSchema.model_validate({**self.metadata, 'steps': self.steps})
@@ -9,13 +9,21 @@ from browser_use.browser.profile import BrowserProfile
 from fastapi import FastAPI
 from patchright.async_api import async_playwright as patchright_async_playwright
 
+from workflow_use.recorder.assembler import WorkflowAssembler
+
 # Assuming views.py is correctly located for this import path
 from workflow_use.recorder.views import (
+	HttpDomSnapshotEvent,
+	HttpRecordingStartedEvent,
 	HttpRecordingStoppedEvent,
+	HttpStepAppendEvent,
+	HttpStepReplaceEvent,
+	HttpWorkflowPatchEvent,
 	HttpWorkflowUpdateEvent,
 	RecorderEvent,
 	WorkflowDefinitionSchema,  # This is the expected output type
 )
+from workflow_use.snapshot.service import SnapshotStore
 
 # Path Configuration (should be identical to recorder.py if run from the same context)
 SCRIPT_DIR = pathlib.Path(__file__).resolve().parent
@@ -26,8 +34,10 @@ USER_DATA_DIR = SCRIPT_DIR / 'user_data_dir'
 class RecordingService:
 	def __init__(self):
 		self.event_queue: asyncio.Queue[RecorderEvent] = asyncio.Queue()
-		self.last_workflow_update_event: Optional[HttpWorkflowUpdateEvent] = None
+		# Only the recorded steps are kept, the extension sends what changed after every event
+		self.assembler = WorkflowAssembler()
 		self.browser: Browser
+		self.snapshot_store = SnapshotStore()
 
 		self.final_workflow_output: Optional[WorkflowDefinitionSchema] = None
 		self.recording_complete_event = asyncio.Event()
@@ -57,8 +67,13 @@ class RecordingService:
 		self.event_processor_task: Optional[asyncio.Task] = None
 
 	async def _handle_event_post(self, event_data: RecorderEvent):
-		if isinstance(event_data, HttpWorkflowUpdateEvent):
-			self.last_workflow_update_event = event_data
+		if isinstance(event_data, HttpRecordingStartedEvent):
+			self.assembler.reset()
+		elif isinstance(event_data, (HttpWorkflowUpdateEvent, HttpStepAppendEvent, HttpStepReplaceEvent, HttpWorkflowPatchEvent)):
+			# Applied right away (one step per event) so the response can ask the extension to resend a lost event
+			if not self.assembler.apply(event_data):
+				return {'status': 'resync', 'message': 'Events were lost, send the whole workflow'}
+			return {'status': 'accepted', 'message': 'Workflow updated'}
 		await self.event_queue.put(event_data)
 		return {'status': 'accepted', 'message': 'Event queued for processing'}
 
@@ -68,9 +83,11 @@ class RecordingService:
 			while True:
 				event = await self.event_queue.get()
 				print(f'[Service] Event Received: {event.type}')
-				if isinstance(event, HttpWorkflowUpdateEvent):
-					# self.last_workflow_update_event is already updated in _handle_event_post
-					pass
+				if isinstance(event, HttpDomSnapshotEvent):
+					try:
+						await asyncio.to_thread(self.snapshot_store.put_encoded, event.payload.hash, event.payload.data)
+					except Exception as e:
+						print(f'[Service] Could not store DOM snapshot {event.payload.hash[:12]}: {e}')
 				elif isinstance(event, HttpRecordingStoppedEvent):
 					print('[Service] RecordingStoppedEvent received, processing final workflow...')
 					await self._capture_and_signal_final_workflow('RecordingStoppedEvent')
@@ -83,9 +100,14 @@ class RecordingService:
 	async def _capture_and_signal_final_workflow(self, trigger_reason: str):
 		processed_this_call = False
 		async with self.final_workflow_processed_lock:
-			if not self.final_workflow_processed_flag and self.last_workflow_update_event:
+			if not self.final_workflow_processed_flag and self.assembler.steps:
 				print(f'[Service] Capturing final workflow (Trigger: {trigger_reason}).')
-				self.final_workflow_output = self.last_workflow_update_event.payload
+				if self.assembler.needs_resync:
+					print('[Service] Warning: recording events were lost, the last steps may be missing.')
+				try:
+					self.final_workflow_output = self.assembler.build()
+				except Exception as e:
+					print(f'[Service] Recorded workflow is invalid: {e}')
 				self.final_workflow_processed_flag = True
 				processed_this_call = True
 
@@ -167,7 +189,7 @@ class RecordingService:
 	async def capture_workflow(self) -> Optional[WorkflowDefinitionSchema]:
 		print('[Service] Starting capture_workflow session...')
 		# Reset state for this session
-		self.last_workflow_update_event = None
+		self.assembler.reset()
 		self.final_workflow_output = None
 		self.recording_complete_event.clear()
 		self.final_workflow_processed_flag = False
@@ -0,0 +1,89 @@
+from workflow_use.recorder.assembler import WorkflowAssembler
+from workflow_use.recorder.views import HttpStepAppendEvent, HttpStepReplaceEvent, HttpWorkflowPatchEvent, HttpWorkflowUpdateEvent
+
+
+def _navigate(url: str) -> dict:
+	return {'type': 'navigation', 'url': url}
+
+
+def _append(seq: int, url: str) -> HttpStepAppendEvent:
+	return HttpStepAppendEvent.model_validate({'timestamp': 0, 'seq': seq, 'payload': _navigate(url)})
+
+
+def _update(seq, *urls: str) -> HttpWorkflowUpdateEvent:
+	workflow = {'name': 'w', 'description': '', 'version': '1.0', 'input_schema': [], 'steps': [_navigate(url) for url in urls]}
+	return HttpWorkflowUpdateEvent.model_validate({'timestamp': 0, 'seq': seq, 'payload': workflow})
+
+
+def _urls(assembler: WorkflowAssembler) -> list:
+	return [getattr(step, 'url') for step in assembler.steps]
+
+
+def test_duplicate_events_are_ignored():
+	assembler = WorkflowAssembler()
+
+	assert assembler.apply(_append(1, 'https://a'))
+	assert assembler.apply(_append(1, 'https://a'))
+	assert assembler.apply(_append(2, 'https://b'))
+
+	assert _urls(assembler) == ['https://a', 'https://b']
+	assert assembler.seq == 2
+
+
+def test_gap_drops_step_events_until_the_full_update():
+	assembler = WorkflowAssembler()
+	assembler.apply(_append(1, 'https://a'))
+
+	assert not assembler.apply(_append(3, 'https://c'))
+	assert assembler.needs_resync
+	assert not assembler.apply(_append(4, 'https://d'))
+	assert _urls(assembler) == ['https://a']
+
+	assert assembler.apply(_update(4, 'https://a', 'https://b', 'https://c', 'https://d'))
+	assert not assembler.needs_resync
+	assert assembler.apply(_append(5, 'https://e'))
+	assert _urls(assembler) == ['https://a', 'https://b', 'https://c', 'https://d', 'https://e']
+
+
+def test_replace_outside_the_steps_asks_for_a_resync():
+	assembler = WorkflowAssembler()
+	assembler.apply(_append(1, 'https://a'))
+
+	replace = {'timestamp': 0, 'seq': 2, 'payload': {'index': 0, 'step': _navigate('https://b')}}
+	assert assembler.apply(HttpStepReplaceEvent.model_validate(replace))
+	assert _urls(assembler) == ['https://b']
+
+	replace = {'timestamp': 0, 'seq': 3, 'payload': {'index': 1, 'step': _navigate('https://c')}}
+	assert not assembler.apply(HttpStepReplaceEvent.model_validate(replace))
+	assert assembler.needs_resync
+
+
+def test_patch_updates_metadata_and_truncates_to_step_count():
+	assembler = WorkflowAssembler()
+	for seq, url in enumerate(['https://a', 'https://b', 'https://c'], start=1):
+		assembler.apply(_append(seq, url))
+
+	patch = {'timestamp': 0, 'seq': 4, 'payload': {'name': 'Search', 'step_count': 1}}
+	assert assembler.apply(HttpWorkflowPatchEvent.model_validate(patch))
+
+	assert _urls(assembler) == ['https://a']
+	workflow = assembler.build()
+	assert workflow is not None
+	assert (workflow.name, workflow.description) == ('Search', '')
+
+
+def test_update_without_seq_resets_the_sequence():
+	assembler = WorkflowAssembler()
+	assembler.apply(_append(1, 'https://a'))
+	assembler.apply(_append(2, 'https://b'))
+
+	assert assembler.apply(_update(None, 'https://c'))
+
+	assert assembler.seq == 0
+	assert _urls(assembler) == ['https://c']
+	assert assembler.apply(_append(1, 'https://d'))
+	assert _urls(assembler) == ['https://c', 'https://d']
+
+
+def test_build_without_steps_returns_none():
+	assert WorkflowAssembler().build() is None
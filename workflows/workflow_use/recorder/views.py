@@ -1,8 +1,8 @@
-from typing import Literal, Union
+from typing import Annotated, List, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowInputSchemaDefinition, WorkflowStep
 
 # --- Event Payloads ---
 
@@ -11,6 +11,19 @@ class RecordingStatusPayload(BaseModel):
 	message: str
 
 
+class StepReplacePayload(BaseModel):
+	index: int
+	step: WorkflowStep
+
+
+class WorkflowPatchPayload(BaseModel):
+	name: Optional[str] = None
+	description: Optional[str] = None
+	version: Optional[str] = None
+	input_schema: Optional[List[WorkflowInputSchemaDefinition]] = None
+	step_count: Optional[int] = Field(default=None, description='Steps from this index on were removed.')
+
+
 # --- Main Event Models (mirroring HttpEvent types from message-bus-types.ts) ---
 
 
@@ -18,11 +31,43 @@ class BaseHttpEvent(BaseModel):
 	timestamp: int
 
 
+class BaseSequencedHttpEvent(BaseHttpEvent):
+	seq: int  # Increases by one with every workflow event the extension sends
+
+
+# The whole workflow, sent to start (or restart after a lost event) the sequence of step events
 class HttpWorkflowUpdateEvent(BaseHttpEvent):
 	type: Literal['WORKFLOW_UPDATE'] = 'WORKFLOW_UPDATE'
+	seq: Optional[int] = None  # Older extensions send every update in full without a sequence number
 	payload: WorkflowDefinitionSchema
 
 
+class HttpStepAppendEvent(BaseSequencedHttpEvent):
+	type: Literal['STEP_APPEND'] = 'STEP_APPEND'
+	payload: WorkflowStep
+
+
+# Sent when a recorded step changes, e.g. when keystrokes are merged into the last input step
+class HttpStepReplaceEvent(BaseSequencedHttpEvent):
+	type: Literal['STEP_REPLACE'] = 'STEP_REPLACE'
+	payload: StepReplacePayload
+
+
+class HttpWorkflowPatchEvent(BaseSequencedHttpEvent):
+	type: Literal['WORKFLOW_PATCH'] = 'WORKFLOW_PATCH'
+	payload: WorkflowPatchPayload
+
+
+class DomSnapshotPayload(BaseModel):
+	hash: str  # SHA-256 of the snapshot html
+	data: str  # Base64 of the gzipped snapshot html
+
+
+class HttpDomSnapshotEvent(BaseHttpEvent):
+	type: Literal['DOM_SNAPSHOT'] = 'DOM_SNAPSHOT'
+	payload: DomSnapshotPayload
+
+
 class HttpRecordingStartedEvent(BaseHttpEvent):
 	type: Literal['RECORDING_STARTED'] = 'RECORDING_STARTED'
 	payload: RecordingStatusPayload
@@ -33,9 +78,18 @@ class HttpRecordingStoppedEvent(BaseHttpEvent):
 	payload: RecordingStatusPayload
 
 
-# Union of all possible event types received by the recorder
-RecorderEvent = Union[
-	HttpWorkflowUpdateEvent,
-	HttpRecordingStartedEvent,
-	HttpRecordingStoppedEvent,
+WorkflowChangeEvent = Union[HttpWorkflowUpdateEvent, HttpStepAppendEvent, HttpStepReplaceEvent, HttpWorkflowPatchEvent]
+
+# Union of all possible event types received by the recorder, the type field selects the model to validate
+RecorderEvent = Annotated[
+	Union[
+		HttpWorkflowUpdateEvent,
+		HttpStepAppendEvent,
+		HttpStepReplaceEvent,
+		HttpWorkflowPatchEvent,
+		HttpDomSnapshotEvent,
+		HttpRecordingStartedEvent,
+		HttpRecordingStoppedEvent,
+	],
+	Field(discriminator='type'),
 ]
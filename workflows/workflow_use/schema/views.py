@@ -3,19 +3,47 @@ from typing import List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 
+# --- Resource blocking ---
+class ResourceBlockingProfile(BaseModel):
+	"""Requests to abort while deterministic steps run, they are not needed to replay the recorded actions."""
+
+	resource_types: List[str] = Field(
+		default_factory=list,
+		description="Playwright resource types to abort, e.g. 'image', 'media', 'font' (blocking 'stylesheet' can change element visibility).",
+	)
+	url_patterns: List[str] = Field(
+		default_factory=list,
+		description="Glob patterns of request URLs to abort, e.g. '*google-analytics.com*'.",
+	)
+	allow_url_patterns: List[str] = Field(
+		default_factory=list,
+		description='Glob patterns of request URLs that are never aborted, even when they match the rules above.',
+	)
+
+
+# A named preset (see workflow_use.network.views.RESOURCE_BLOCKING_PRESETS) or custom rules, 'none' disables blocking
+ResourceBlocking = Union[Literal['none', 'media', 'trackers', 'lean'], ResourceBlockingProfile]
+
+
 # --- Base Step Model ---
 # Common fields for all step types
 class BaseWorkflowStep(BaseModel):
-	description: Optional[str] = Field(None, description="Optional description/comment about the step's purpose.")
-	output: Optional[str] = Field(None, description='Context key to store step output under.')
+	description: Optional[str] = Field(default=None, description="Optional description/comment about the step's purpose.")
+	output: Optional[str] = Field(default=None, description='Context key to store step output under.')
 	# Allow other fields captured from raw events but not explicitly modeled
 	model_config = {'extra': 'allow'}
 
 
 # --- Timestamped Step Mixin (for deterministic actions) ---
 class TimestampedWorkflowStep(BaseWorkflowStep):
-	timestamp: Optional[int] = Field(None, description='Timestamp from recording (informational).')
-	tabId: Optional[int] = Field(None, description='Browser tab ID from recording (informational).')
+	timestamp: Optional[int] = Field(default=None, description='Timestamp from recording (informational).')
+	tabId: Optional[int] = Field(default=None, description='Browser tab ID from recording (informational).')
+	resource_blocking: Optional[ResourceBlocking] = Field(
+		default=None, description="Requests to abort while this step runs, overrides the workflow's resource_blocking."
+	)
+	domSnapshot: Optional[str] = Field(
+		default=None, description='Content hash of the DOM snapshot captured when the step was recorded (informational).'
+	)
 
 
 # --- Agent Step ---
@@ -23,7 +51,7 @@ class AgentTaskWorkflowStep(BaseWorkflowStep):
 	type: Literal['agent']
 	task: str = Field(..., description='The objective or task description for the agent.')
 	max_steps: Optional[int] = Field(
-		None,
+		default=None,
 		description='Maximum number of iterations for the agent (default handled in code).',
 	)
 	# Agent steps might also have 'params' for other configs, handled by extra='allow'
@@ -45,9 +73,13 @@ class ClickStep(TimestampedWorkflowStep):
 
 	type: Literal['click']  # As seen in examples
 	cssSelector: str = Field(..., description='CSS selector for the target element.')
-	xpath: Optional[str] = Field(None, description='XPath selector (often informational).')
-	elementTag: Optional[str] = Field(None, description='HTML tag (informational).')
-	elementText: Optional[str] = Field(None, description='Element text (informational).')
+	fallbackSelectors: Optional[List[str]] = Field(
+		default=None,
+		description='Selectors tried right after cssSelector, e.g. the full recorded selector a minimal one replaced.',
+	)
+	xpath: Optional[str] = Field(default=None, description='XPath selector (often informational).')
+	elementTag: Optional[str] = Field(default=None, description='HTML tag (informational).')
+	elementText: Optional[str] = Field(default=None, description='Element text (informational).')
 
 
 class InputStep(TimestampedWorkflowStep):
@@ -55,9 +87,13 @@ class InputStep(TimestampedWorkflowStep):
 
 	type: Literal['input']  # As seen in examples
 	cssSelector: str = Field(..., description='CSS selector for the target input element.')
+	fallbackSelectors: Optional[List[str]] = Field(
+		default=None,
+		description='Selectors tried right after cssSelector, e.g. the full recorded selector a minimal one replaced.',
+	)
 	value: str = Field(..., description='Value to input. Can use {context_var}.')
-	xpath: Optional[str] = Field(None, description='XPath selector (informational).')
-	elementTag: Optional[str] = Field(None, description='HTML tag (informational).')
+	xpath: Optional[str] = Field(default=None, description='XPath selector (informational).')
+	elementTag: Optional[str] = Field(default=None, description='HTML tag (informational).')
 
 
 class SelectChangeStep(TimestampedWorkflowStep):
@@ -65,9 +101,13 @@ class SelectChangeStep(TimestampedWorkflowStep):
 
 	type: Literal['select_change']  # Assumed type for workflow controller's select_change
 	cssSelector: str = Field(..., description='CSS selector for the target select element.')
+	fallbackSelectors: Optional[List[str]] = Field(
+		default=None,
+		description='Selectors tried right after cssSelector, e.g. the full recorded selector a minimal one replaced.',
+	)
 	selectedText: str = Field(..., description='Visible text of the option to select. Can use {context_var}.')
-	xpath: Optional[str] = Field(None, description='XPath selector (informational).')
-	elementTag: Optional[str] = Field(None, description='HTML tag (informational).')
+	xpath: Optional[str] = Field(default=None, description='XPath selector (informational).')
+	elementTag: Optional[str] = Field(default=None, description='HTML tag (informational).')
 
 
 class KeyPressStep(TimestampedWorkflowStep):
@@ -75,9 +115,13 @@ class KeyPressStep(TimestampedWorkflowStep):
 
 	type: Literal['key_press']  # As seen in examples
 	cssSelector: str = Field(..., description='CSS selector for the target element.')
+	fallbackSelectors: Optional[List[str]] = Field(
+		default=None,
+		description='Selectors tried right after cssSelector, e.g. the full recorded selector a minimal one replaced.',
+	)
 	key: str = Field(..., description="The key to press (e.g., 'Tab', 'Enter').")
-	xpath: Optional[str] = Field(None, description='XPath selector (informational).')
-	elementTag: Optional[str] = Field(None, description='HTML tag (informational).')
+	xpath: Optional[str] = Field(default=None, description='XPath selector (informational).')
+	elementTag: Optional[str] = Field(default=None, description='HTML tag (informational).')
 
 
 class ScrollStep(TimestampedWorkflowStep):
@@ -95,6 +139,28 @@ class PageExtractionStep(TimestampedWorkflowStep):
 	goal: str = Field(..., description='The goal of the page extraction.')
 
 
+class ExtractionField(BaseModel):
+	"""One value read from every record of a RecordExtractionStep."""
+
+	name: str = Field(..., description='Key of the value in each extracted record.')
+	selector: Optional[str] = Field(
+		default=None, description='CSS selector relative to the record, the record element itself if omitted.'
+	)
+	attribute: Optional[str] = Field(default=None, description="Attribute to read (e.g. 'href'), the element's text if omitted.")
+	type: Literal['string', 'number', 'integer', 'boolean'] = Field(default='string', description='Type the value is coerced to.')
+	multiple: bool = Field(default=False, description='Read all matching elements into a list instead of the first one.')
+
+
+class RecordExtractionStep(TimestampedWorkflowStep):
+	"""Extracts a list of records with CSS selectors using 'extract_records', without an LLM."""
+
+	type: Literal['extract_records']
+	record_selector: str = Field(..., description='CSS selector matching one element per record (e.g. table rows).')
+	fields: List[ExtractionField] = Field(..., min_length=1, description='Values read from every record.')
+	limit: Optional[int] = Field(default=None, description='Maximum number of records to extract.')
+	allow_empty: bool = Field(default=False, description='Succeed with an empty list when no record matches instead of failing.')
+
+
 # --- Union of all possible step types ---
 # This Union defines what constitutes a valid step in the "steps" list.
 DeterministicWorkflowStep = Union[
@@ -105,6 +171,7 @@ DeterministicWorkflowStep = Union[
 	KeyPressStep,
 	ScrollStep,
 	PageExtractionStep,
+	RecordExtractionStep,
 ]
 
 AgenticWorkflowStep = AgentTaskWorkflowStep
@@ -142,7 +209,7 @@ class WorkflowDefinitionSchema(BaseModel):
 	"""Pydantic model representing the structure of the workflow JSON file."""
 
 	workflow_analysis: Optional[str] = Field(
-		None,
+		default=None,
 		description='A chain of thought reasoning analysis of the original workflow recording.',
 	)
 
@@ -158,6 +225,10 @@ class WorkflowDefinitionSchema(BaseModel):
 		# default=WorkflowInputSchemaDefinition(),
 		description='List of input schema definitions.',
 	)
+	resource_blocking: Optional[ResourceBlocking] = Field(
+		default=None,
+		description='Requests (images, fonts, trackers...) to abort while deterministic steps run, agent steps always load everything.',
+	)
 
 	# Add loader from json file
 	@classmethod
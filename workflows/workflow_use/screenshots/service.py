@@ -0,0 +1,145 @@
+import base64
+import binascii
+import io
+import logging
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+from workflow_use.screenshots.views import PreparedScreenshot, ScreenshotConfig, ScreenshotReport
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {'jpeg': 'image/jpeg', 'webp': 'image/webp', 'png': 'image/png'}
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+	"""Estimate the prompt tokens of an image sent at high detail.
+
+	Follows OpenAI's accounting: the image is fit into 2048x2048, scaled so its shortest side is at most 768px
+	and billed 170 tokens per 512px tile plus 85.
+	"""
+	w, h = float(width), float(height)
+	scale = min(1.0, 2048 / max(w, h, 1))
+	w, h = w * scale, h * scale
+	scale = min(1.0, 768 / max(min(w, h), 1))
+	w, h = w * scale, h * scale
+	return 85 + 170 * math.ceil(w / 512) * math.ceil(h / 512)
+
+
+def decode_screenshot(data: str) -> bytes:
+	"""Decode a recorded screenshot, either plain base64 or a data URL.
+
+	Raises:
+	    ValueError: If *data* is not valid base64.
+	"""
+	if data.startswith('data:'):
+		data = data.split(',', 1)[-1]
+	try:
+		return base64.b64decode(data, validate=True)
+	except binascii.Error as e:
+		raise ValueError(f'Screenshot is not valid base64: {e}') from e
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = 8) -> np.ndarray:
+	"""Difference hash: whether each pixel of a tiny grayscale version is brighter than its right neighbour."""
+	pixels = np.asarray(image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS), dtype=np.int16)
+	return (pixels[:, 1:] > pixels[:, :-1]).flatten()
+
+
+def hash_distance(a: np.ndarray, b: np.ndarray) -> int:
+	"""Number of differing bits of two perceptual hashes."""
+	return int(np.count_nonzero(a != b))
+
+
+class ScreenshotPreprocessor:
+	"""
+	Shrinks the screenshots of a recording before they are attached to the builder prompt.
+
+	Screenshots are downscaled, re-encoded and deduplicated: consecutive steps on the same screen produce
+	near-identical images, only the first of them is kept so the image budget goes to screens that differ.
+	"""
+
+	def __init__(self, config: ScreenshotConfig | None = None) -> None:
+		self.config = config or ScreenshotConfig()
+
+	def _encode(self, image: Image.Image) -> bytes:
+		buffer = io.BytesIO()
+		if self.config.format == 'png':
+			image.save(buffer, format='PNG', optimize=True)
+		else:
+			if image.mode not in ('RGB', 'L'):
+				image = image.convert('RGB')
+			image.save(buffer, format=self.config.format.upper(), quality=self.config.quality, optimize=True)
+		return buffer.getvalue()
+
+	def prepare_one(self, step_index: int, data: str) -> Tuple[PreparedScreenshot, np.ndarray]:
+		"""Downscale and re-encode one screenshot.
+
+		Raises:
+		    ValueError: If *data* is not a decodable image.
+		"""
+		raw = decode_screenshot(data)
+		try:
+			image = Image.open(io.BytesIO(raw))
+			image.load()
+		except (UnidentifiedImageError, OSError) as e:
+			raise ValueError(f'Screenshot is not a valid image: {e}') from e
+
+		original_tokens = estimate_image_tokens(*image.size)
+		bits = perceptual_hash(image, self.config.hash_size)
+		image.thumbnail((self.config.max_width, self.config.max_height), Image.Resampling.LANCZOS)
+		encoded = self._encode(image)
+		prepared = PreparedScreenshot(
+			step_index=step_index,
+			data=base64.b64encode(encoded).decode('ascii'),
+			media_type=MEDIA_TYPES[self.config.format],
+			width=image.width,
+			height=image.height,
+			perceptual_hash=np.packbits(bits).tobytes().hex(),
+			original_bytes=len(raw),
+			encoded_bytes=len(encoded),
+			original_tokens=original_tokens,
+			tokens=estimate_image_tokens(image.width, image.height),
+		)
+		return prepared, bits
+
+	def prepare(
+		self, screenshots: Sequence[Tuple[int, str]], max_images: Optional[int] = None
+	) -> Tuple[List[PreparedScreenshot], ScreenshotReport]:
+		"""Prepare the (step index, base64) *screenshots* in step order, keeping at most *max_images* of them."""
+		report = ScreenshotReport(images_in=len(screenshots))
+		kept: List[PreparedScreenshot] = []
+		previous_bits: Optional[np.ndarray] = None
+		valid = 0
+		for step_index, data in screenshots:
+			try:
+				prepared, bits = self.prepare_one(step_index, data)
+			except ValueError as e:
+				logger.warning(f'Skipping screenshot of step {step_index}: {e}')
+				report.invalid += 1
+				continue
+
+			valid += 1
+			if max_images is None or valid <= max_images:
+				# What attaching the recorded screenshots as they are would have cost
+				report.original_bytes += prepared.original_bytes
+				report.original_tokens += prepared.original_tokens
+			if (
+				self.config.dedupe
+				and previous_bits is not None
+				and hash_distance(bits, previous_bits) <= self.config.max_hash_distance
+			):
+				report.duplicates.append(step_index)
+				continue
+			previous_bits = bits
+			if max_images is not None and len(kept) >= max_images:
+				continue
+			kept.append(prepared)
+			report.encoded_bytes += prepared.encoded_bytes
+			report.tokens += prepared.tokens
+
+		report.images_kept = len(kept)
+		return kept, report
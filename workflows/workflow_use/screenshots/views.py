@@ -0,0 +1,62 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class ScreenshotConfig(BaseModel):
+	"""How recorded screenshots are prepared before they are sent to the builder LLM."""
+
+	max_width: int = Field(default=1024, description='Screenshots are downscaled to fit within max_width x max_height.')
+	max_height: int = Field(default=1024)
+	format: Literal['jpeg', 'webp', 'png'] = Field(default='jpeg', description='Format the screenshots are re-encoded in.')
+	quality: int = Field(default=75, ge=1, le=100, description='JPEG/WebP quality.')
+	dedupe: bool = Field(default=True, description='Drop screenshots that look like the previous attached one.')
+	hash_size: int = Field(default=8, description='Side of the perceptual hash grid, the hash has hash_size**2 bits.')
+	max_hash_distance: int = Field(
+		default=4, description='Screenshots whose hashes differ in at most this many bits from the previous one are duplicates.'
+	)
+
+
+class PreparedScreenshot(BaseModel):
+	"""A screenshot ready to be attached to the builder prompt."""
+
+	step_index: int
+	data: str = Field(..., description='Base64 of the re-encoded image.')
+	media_type: str
+	width: int
+	height: int
+	perceptual_hash: str = Field(..., description='Hex of the difference hash used for deduplication.')
+	original_bytes: int
+	encoded_bytes: int
+	original_tokens: int = Field(..., description='Estimated prompt tokens of the screenshot as recorded.')
+	tokens: int = Field(..., description='Estimated prompt tokens of the prepared screenshot.')
+
+	@property
+	def data_url(self) -> str:
+		return f'data:{self.media_type};base64,{self.data}'
+
+
+class ScreenshotReport(BaseModel):
+	"""Summary of the screenshot preparation of one build."""
+
+	images_in: int = 0
+	invalid: int = 0
+	duplicates: List[int] = Field(default_factory=list, description='Step indexes whose screenshot was dropped.')
+	images_kept: int = 0
+	original_bytes: int = Field(default=0, description='Size of the screenshots that would be attached without preparation.')
+	encoded_bytes: int = 0
+	original_tokens: int = Field(default=0, description='Estimated tokens of the screenshots attached without preparation.')
+	tokens: int = Field(default=0, description='Estimated tokens of the attached screenshots.')
+
+	@property
+	def tokens_saved(self) -> int:
+		return self.original_tokens - self.tokens
+
+	def summary(self) -> str:
+		if not self.images_in:
+			return 'No screenshots to attach.'
+		return (
+			f'Attaching {self.images_kept}/{self.images_in} screenshots ({len(self.duplicates)} near-duplicates, '
+			f'{self.invalid} invalid dropped), {self.original_bytes // 1024}KB -> {self.encoded_bytes // 1024}KB, '
+			f'~{self.tokens} image tokens (~{self.tokens_saved} saved).'
+		)
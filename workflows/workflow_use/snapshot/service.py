@@ -0,0 +1,218 @@
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+from workflow_use.controller.utils import HAS_TEXT_PATTERN, build_selector_candidates
+from workflow_use.plan.service import CompiledTemplate
+from workflow_use.schema.views import WorkflowDefinitionSchema, WorkflowStep
+from workflow_use.snapshot.views import CandidateCheck, SelectorValidationReport, StepSelectorCheck
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+# Playwright-only selector syntax, can only be evaluated by a live browser
+PLAYWRIGHT_ONLY_PATTERN = re.compile(r'^(text|role|internal:[a-z-]+)=|>>|:visible|:text(-is|-matches)?\(|:nth-match\(')
+# XPaths as recorded by the extension: 'id("main")/div[2]/button[1]' or 'body/div[1]/a[1]'
+XPATH_STEP_PATTERN = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)(?:\[(?P<index>\d+)\])?$')
+XPATH_ID_PATTERN = re.compile(r'^id\("(?P<id>[^"]+)"\)$')
+# Fallback XPaths generated by generate_stable_xpaths
+XPATH_CONTAINS_PATTERN = re.compile(r"^//(?P<tag>[a-zA-Z][\w-]*)\[contains\(@(?P<attr>[\w-]+), '(?P<value>[^']*)'\)\]$")
+
+
+def get_default_snapshot_dir() -> Path:
+	"""Directory recorded DOM snapshots are stored in, overridable with WORKFLOW_USE_SNAPSHOT_DIR."""
+	return Path(os.getenv('WORKFLOW_USE_SNAPSHOT_DIR', './tmp/snapshots'))
+
+
+def snapshot_hash(html: str) -> str:
+	return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+	"""
+	Content-addressed store of the DOM snapshots captured while recording.
+
+	Every distinct snapshot is stored once as ``<sha256 of the html>.html.gz``, steps reference it by hash,
+	so recordings where most steps happen on the same page cost one file.
+	"""
+
+	def __init__(self, directory: str | Path | None = None) -> None:
+		self.directory = Path(directory) if directory else get_default_snapshot_dir()
+
+	def path_for(self, digest: str) -> Path:
+		if not SNAPSHOT_HASH_PATTERN.match(digest):
+			raise ValueError(f'Invalid snapshot hash: {digest!r}')
+		return self.directory / f'{digest}.html.gz'
+
+	def has(self, digest: str) -> bool:
+		return self.path_for(digest).exists()
+
+	def _write(self, digest: str, compressed: bytes) -> bool:
+		path = self.path_for(digest)
+		if path.exists():
+			return False
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+		tmp_path.write_bytes(compressed)
+		os.replace(tmp_path, path)
+		return True
+
+	def put(self, html: str) -> str:
+		"""Store *html* and return its hash."""
+		digest = snapshot_hash(html)
+		self._write(digest, gzip.compress(html.encode('utf-8')))
+		return digest
+
+	def put_encoded(self, digest: str, data: str) -> bool:
+		"""Store a snapshot as sent by the extension (base64 of the gzipped html), returns False if already stored.
+
+		Raises:
+		    ValueError: If the content does not match *digest*.
+		"""
+		if self.has(digest):
+			return False
+		compressed = base64.b64decode(data)
+		if snapshot_hash(gzip.decompress(compressed).decode('utf-8')) != digest:
+			raise ValueError(f'DOM snapshot content does not match its hash {digest}')
+		return self._write(digest, compressed)
+
+	def get(self, digest: str) -> Optional[str]:
+		path = self.path_for(digest)
+		if not path.exists():
+			return None
+		return gzip.decompress(path.read_bytes()).decode('utf-8')
+
+
+def _normalize_text(text: str) -> str:
+	# Same normalization as the selector probe
+	return ' '.join(text.split()).lower()
+
+
+def _count_xpath(document: BeautifulSoup, xpath: str) -> Optional[int]:
+	"""Count the matches of the XPath shapes the recorder and its fallbacks produce, ``None`` for any other XPath."""
+	contains = XPATH_CONTAINS_PATTERN.match(xpath)
+	if contains:
+		tag, attr, value = contains.group('tag', 'attr', 'value')
+		return sum(1 for element in document.find_all(tag) if value in str(element.get(attr, '')))
+
+	if xpath.startswith('//'):
+		return None
+	parts = xpath.strip('/').split('/')
+	node: Any = document
+	id_match = XPATH_ID_PATTERN.match(parts[0])
+	if id_match:
+		node = document.find(id=id_match.group('id'))
+		parts = parts[1:]
+	elif parts[0] != 'html' and document.html is not None:
+		node = document.html
+	for part in parts:
+		if node is None:
+			return 0
+		step = XPATH_STEP_PATTERN.match(part)
+		if step is None:
+			return None
+		children = [child for child in node.children if isinstance(child, Tag) and child.name == step.group('tag').lower()]
+		position = int(step.group('index') or 1) - 1
+		node = children[position] if position < len(children) else None
+	return 0 if node is None else 1
+
+
+class SelectorValidator:
+	"""
+	Checks the selectors of workflow steps against the DOM snapshots recorded with them, without a browser.
+
+	Like the selector probe at run time, the candidates are tried in order and the first one matching exactly
+	one element wins. A step whose own selector matches several elements is reported even when a fallback
+	resolves it, a changed page could make the run pick another element.
+	"""
+
+	def __init__(self, store: SnapshotStore | None = None) -> None:
+		self.store = store or SnapshotStore()
+		self._documents: Dict[str, Optional[BeautifulSoup]] = {}
+
+	def _document(self, digest: str) -> Optional[BeautifulSoup]:
+		if digest not in self._documents:
+			try:
+				html = self.store.get(digest)
+			except ValueError:
+				html = None
+			self._documents[digest] = BeautifulSoup(html, 'html.parser') if html is not None else None
+		return self._documents[digest]
+
+	def check_candidate(self, document: BeautifulSoup, selector: str) -> CandidateCheck:
+		if selector.startswith('xpath='):
+			matches = _count_xpath(document, selector[len('xpath=') :])
+		elif has_text := HAS_TEXT_PATTERN.match(selector):
+			text = _normalize_text(has_text.group('text'))
+			matches = sum(
+				1 for element in document.find_all(has_text.group('tag')) if text in _normalize_text(element.get_text())
+			)
+		elif PLAYWRIGHT_ONLY_PATTERN.search(selector):
+			matches = None
+		else:
+			try:
+				matches = len(soupsieve.select(selector, document))
+			except (soupsieve.SelectorSyntaxError, NotImplementedError):
+				return CandidateCheck(selector=selector, status='invalid')
+		if matches is None:
+			return CandidateCheck(selector=selector, status='unsupported')
+		status = 'unique' if matches == 1 else 'ambiguous' if matches > 1 else 'missing'
+		return CandidateCheck(selector=selector, status=status, matches=matches)
+
+	def check_step(self, step_index: int, step: WorkflowStep) -> Optional[StepSelectorCheck]:
+		"""Check one step, ``None`` for steps that do not target an element."""
+		selector = getattr(step, 'cssSelector', None)
+		if not selector:
+			return None
+		result = StepSelectorCheck(step_index=step_index, step_type=step.type, selector=selector, status='no_snapshot')
+		if CompiledTemplate.parse(selector) is not None:
+			result.status = 'templated'
+			return result
+		digest = getattr(step, 'domSnapshot', None)
+		document = self._document(digest) if digest else None
+		if document is None:
+			return result
+
+		result.snapshot = digest
+		for candidate in build_selector_candidates(selector, step):
+			check = self.check_candidate(document, candidate)
+			result.candidates.append(check)
+			if check.status == 'unique':
+				result.resolved_by = candidate
+				break
+
+		primary = result.candidates[0]
+		if primary.status == 'unique':
+			result.status = 'ok'
+		elif primary.status == 'ambiguous':
+			result.status = 'ambiguous'
+		else:
+			result.status = 'fallback' if result.resolved_by else 'broken'
+		return result
+
+	def validate(self, workflow: WorkflowDefinitionSchema) -> SelectorValidationReport:
+		start = time.perf_counter()
+		checks: List[StepSelectorCheck] = []
+		for step_index, step in enumerate(workflow.steps):
+			check = self.check_step(step_index, step)
+			if check is not None:
+				checks.append(check)
+		return SelectorValidationReport(
+			workflow_name=workflow.name, steps=checks, elapsed_ms=round((time.perf_counter() - start) * 1000, 2)
+		)
+
+
+def validate_workflow_selectors(
+	workflow: WorkflowDefinitionSchema, store: SnapshotStore | None = None
+) -> SelectorValidationReport:
+	"""Check every step's selector and fallbacks against the DOM snapshot recorded with it."""
+	return SelectorValidator(store).validate(workflow)
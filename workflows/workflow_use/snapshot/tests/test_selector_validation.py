@@ -0,0 +1,74 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from workflow_use.snapshot.service import SelectorValidator, SnapshotStore, _count_xpath
+
+HTML = """<html><body>
+<div id="form">
+	<input name="email" class="field wide">
+	<input name="password" class="field">
+	<button>Back</button>
+	<button class="submit">Sign in</button>
+</div>
+</body></html>"""
+
+
+@pytest.mark.parametrize(
+	'xpath, matches',
+	[
+		('html/body/div/input[2]', 1),
+		('/html/body/div/button[3]', 0),
+		('body/div/button', 1),
+		('id("form")/input[1]', 1),
+		('id("missing")/input', 0),
+		("//input[contains(@class, 'field')]", 2),
+		("//input[contains(@name, 'pass')]", 1),
+		('//input[@name="email"]', None),
+		('html/body/div/input[last()]', None),
+	],
+)
+def test_count_xpath(xpath, matches):
+	assert _count_xpath(BeautifulSoup(HTML, 'html.parser'), xpath) == matches
+
+
+@pytest.fixture
+def validator(tmp_path):
+	store = SnapshotStore(tmp_path / 'snapshots')
+	return SelectorValidator(store), store.put(HTML)
+
+
+@pytest.mark.parametrize(
+	'step, status, resolved_by',
+	[
+		({'cssSelector': 'input[name="email"]'}, 'ok', 'input[name="email"]'),
+		({'cssSelector': '#gone', 'fallbackSelectors': ['button.submit']}, 'fallback', 'button.submit'),
+		({'cssSelector': '#gone', 'xpath': 'html/body/div/button[2]'}, 'fallback', 'xpath=html/body/div/button[2]'),
+		({'cssSelector': 'button'}, 'ambiguous', None),
+		({'cssSelector': '#gone'}, 'broken', None),
+	],
+)
+def test_check_step_against_the_recorded_snapshot(validator, make_steps, step, status, resolved_by):
+	validator, digest = validator
+	(workflow_step,) = make_steps({'type': 'click', 'domSnapshot': digest, **step})
+
+	check = validator.check_step(3, workflow_step)
+
+	assert check is not None
+	assert (check.step_index, check.snapshot, check.status, check.resolved_by) == (3, digest, status, resolved_by)
+
+
+def test_check_step_without_a_usable_snapshot(validator, make_steps):
+	validator, digest = validator
+	templated, unknown, invalid, navigation = make_steps(
+		{'type': 'click', 'cssSelector': 'a[title="{title}"]', 'domSnapshot': digest},
+		{'type': 'click', 'cssSelector': 'button', 'domSnapshot': '0' * 64},
+		{'type': 'click', 'cssSelector': 'button', 'domSnapshot': '../etc/passwd'},
+		{'type': 'navigation', 'url': 'https://x'},
+	)
+
+	check = validator.check_step(0, templated)
+	assert check is not None and check.status == 'templated'
+	for step in (unknown, invalid):
+		check = validator.check_step(1, step)
+		assert check is not None and (check.status, check.snapshot) == ('no_snapshot', None)
+	assert validator.check_step(2, navigation) is None
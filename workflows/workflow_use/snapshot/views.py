@@ -0,0 +1,51 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# unique: exactly one element, ambiguous: several, missing: none,
+# invalid: not a valid selector, unsupported: needs a live browser (e.g. playwright-only syntax)
+SelectorStatus = Literal['unique', 'ambiguous', 'missing', 'invalid', 'unsupported']
+
+
+class CandidateCheck(BaseModel):
+	"""Result of matching one selector candidate against a DOM snapshot."""
+
+	selector: str
+	status: SelectorStatus
+	matches: int = 0
+
+
+class StepSelectorCheck(BaseModel):
+	"""Selector validation of one workflow step."""
+
+	step_index: int
+	step_type: str
+	selector: str
+	snapshot: Optional[str] = Field(default=None, description='Content hash of the snapshot the step was checked against.')
+	status: Literal['ok', 'fallback', 'ambiguous', 'broken', 'no_snapshot', 'templated']
+	resolved_by: Optional[str] = Field(default=None, description='First candidate that matches exactly one element.')
+	candidates: List[CandidateCheck] = Field(default_factory=list)
+
+	@property
+	def is_error(self) -> bool:
+		return self.status in ('ambiguous', 'broken')
+
+
+class SelectorValidationReport(BaseModel):
+	"""Offline selector validation of a whole workflow against its recorded DOM snapshots."""
+
+	workflow_name: str
+	steps: List[StepSelectorCheck] = Field(default_factory=list)
+	elapsed_ms: float = 0.0
+
+	@property
+	def errors(self) -> List[StepSelectorCheck]:
+		return [step for step in self.steps if step.is_error]
+
+	@property
+	def warnings(self) -> List[StepSelectorCheck]:
+		return [step for step in self.steps if step.status == 'fallback']
+
+	@property
+	def unchecked(self) -> List[StepSelectorCheck]:
+		return [step for step in self.steps if step.status in ('no_snapshot', 'templated')]
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from workflow_use.tracing.views import TraceSpan
+
+logger = logging.getLogger(__name__)
+
+_current_tracer: ContextVar[Optional['Tracer']] = ContextVar('workflow_use_tracer', default=None)
+
+
+class _Span:
+	"""Handle yielded by :py:func:`trace_span`, lets the traced code attach results to the span."""
+
+	__slots__ = ('args',)
+
+	def __init__(self, args: Dict[str, Any]) -> None:
+		self.args = args
+
+	def set(self, **args: Any) -> None:
+		self.args.update(args)
+
+
+class _NoopSpan:
+	"""Stateless span used while tracing is disabled, it is its own (reusable) context manager."""
+
+	__slots__ = ()
+
+	def set(self, **args: Any) -> None:
+		pass
+
+	def __enter__(self) -> '_NoopSpan':
+		return self
+
+	def __exit__(self, *exc_info: Any) -> None:
+		return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+	"""
+	Collects nested timing spans of a workflow run and exports them as Chrome
+	trace-event JSON (open the file in Perfetto or chrome://tracing).
+
+	Spans of concurrently running asyncio tasks (parallel chunk extraction,
+	batch rows...) are put on separate tracks so they nest correctly.
+	"""
+
+	def __init__(self, name: str = 'workflow') -> None:
+		self.name = name
+		self.spans: List[TraceSpan] = []
+		self._origin = time.perf_counter()
+		self._tracks: Dict[int, int] = {}
+
+	def _track(self) -> int:
+		try:
+			task = asyncio.current_task()
+		except RuntimeError:
+			task = None
+		key = id(task) if task is not None else 0
+		if key not in self._tracks:
+			self._tracks[key] = len(self._tracks)
+		return self._tracks[key]
+
+	@contextmanager
+	def span(self, name: str, category: str, **args: Any) -> Iterator[_Span]:
+		handle = _Span(args)
+		track = self._track()
+		start = time.perf_counter()
+		try:
+			yield handle
+		except BaseException as e:
+			handle.set(error=f'{type(e).__name__}: {e}')
+			raise
+		finally:
+			end = time.perf_counter()
+			self.spans.append(
+				TraceSpan(
+					name=name,
+					category=category,
+					start_us=(start - self._origin) * 1e6,
+					duration_us=(end - start) * 1e6,
+					track=track,
+					args=handle.args,
+				)
+			)
+
+	def to_chrome_trace(self) -> Dict[str, Any]:
+		pid = os.getpid()
+		events: List[Dict[str, Any]] = [
+			{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': self.name}},
+		]
+		for track in sorted(set(self._tracks.values())):
+			events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': track, 'args': {'name': f'task {track}'}})
+		for span in sorted(self.spans, key=lambda span: span.start_us):
+			events.append(
+				{
+					'name': span.name,
+					'cat': span.category,
+					'ph': 'X',
+					'ts': round(span.start_us, 3),
+					'dur': round(span.duration_us, 3),
+					'pid': pid,
+					'tid': span.track,
+					'args': json.loads(json.dumps(span.args, default=str)),
+				}
+			)
+		return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+	def export(self, path: str | Path) -> Path:
+		"""Write the Chrome trace-event JSON to *path*."""
+		path = Path(path)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_text(json.dumps(self.to_chrome_trace()), encoding='utf-8')
+		logger.info(f'Trace with {len(self.spans)} spans written to {path} (open it in https://ui.perfetto.dev)')
+		return path
+
+
+def get_tracer() -> Optional[Tracer]:
+	return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+	"""Make *tracer* the active tracer for the current task and every task it starts."""
+	token = _current_tracer.set(tracer)
+	try:
+		yield tracer
+	finally:
+		_current_tracer.reset(token)
+
+
+def trace_span(name: str, category: str, **args: Any):
+	"""Record a span on the active tracer. Without an active tracer this is a shared no-op context manager."""
+	tracer = _current_tracer.get()
+	if tracer is None:
+		return _NOOP_SPAN
+	return tracer.span(name, category, **args)
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class TraceSpan(BaseModel):
+	"""A finished span, timestamps are microseconds since the tracer was created."""
+
+	name: str
+	category: str
+	start_us: float
+	duration_us: float
+	track: int = Field(default=0, description='Concurrent tasks get their own track so their spans nest correctly.')
+	args: Dict[str, Any] = Field(default_factory=dict)
@@ -4,8 +4,11 @@ import asyncio
 import json
 import json as _json
 import logging
+import time
+import uuid
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, List, TypeVar
+from typing import Any, Dict, List, Optional, TypeVar
 
 from browser_use import Agent, Browser
 from browser_use.agent.views import ActionResult, AgentHistoryList
@@ -14,10 +17,28 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import StructuredTool
-from pydantic import BaseModel, create_model
-
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+from workflow_use.checkpoint.service import (
+	CheckpointStore,
+	capture_browser_state,
+	restore_browser_state,
+	restore_step_results,
+	serialize_step_result,
+	steps_fingerprint,
+)
+from workflow_use.checkpoint.views import RunCheckpoint
 from workflow_use.controller.service import WorkflowController
-from workflow_use.controller.utils import get_best_element_handle
+from workflow_use.controller.utils import build_selector_candidates, fill_fields, get_best_element_handle, truncate_selector
+from workflow_use.controller.views import StepContext
+from workflow_use.extraction.service import count_tokens, reduce_json_values, split_into_chunks
+from workflow_use.healing.service import PatchStore, apply_patches, steps_from_agent_history
+from workflow_use.healing.views import SelfHealMode, StepPatch
+from workflow_use.network.service import ResourceBlocker, resolve_profile
+from workflow_use.network.views import ResourceBlockingStats
+from workflow_use.plan.service import compile_steps
+from workflow_use.pool.service import BrowserPool
+from workflow_use.readiness.service import ReadinessEngine, legacy_wait_estimate_ms
 from workflow_use.schema.views import (
 	AgenticWorkflowStep,
 	ClickStep,
@@ -25,14 +46,17 @@ from workflow_use.schema.views import (
 	InputStep,
 	KeyPressStep,
 	NavigationStep,
+	ResourceBlocking,
+	ResourceBlockingProfile,
 	ScrollStep,
 	SelectChangeStep,
 	WorkflowDefinitionSchema,
 	WorkflowInputSchemaDefinition,
 	WorkflowStep,
 )
+from workflow_use.tracing.service import Tracer, trace_span, use_tracer
 from workflow_use.workflow.prompts import STRUCTURED_OUTPUT_PROMPT, WORKFLOW_FALLBACK_PROMPT_TEMPLATE
-from workflow_use.workflow.views import WorkflowRunOutput
+from workflow_use.workflow.views import OutputConversionConfig, WorkflowRunOutput
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +77,13 @@ class Workflow:
 		llm: BaseChatModel | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
 		fallback_to_agent: bool = True,
+		browser_pool: BrowserPool | None = None,
+		readiness: ReadinessEngine | None = None,
+		self_heal: SelfHealMode = 'off',
+		patch_store: PatchStore | None = None,
+		output_conversion: OutputConversionConfig | None = None,
+		checkpoint_store: CheckpointStore | None = None,
+		fuse_form_fills: bool = False,
 	) -> None:
 		"""Initialize a new Workflow instance from a schema object.
 
@@ -62,6 +93,18 @@ class Workflow:
 			browser: Optional Browser instance to use for browser automation
 			llm: Optional language model for fallback agent functionality
 			fallback_to_agent: Whether to fall back to agent-based execution on step failure
+			browser_pool: Optional BrowserPool; when set, every run leases an isolated browser from it
+				instead of using (and closing) *browser*
+			readiness: Optional ReadinessEngine deciding how long to wait for the page to settle after each step
+			self_heal: What to do with successful agent fallbacks: 'off', 'propose' (store them as patches
+				replacing the failed step with deterministic steps) or 'apply' (also apply stored patches on load)
+			patch_store: Optional PatchStore the self-healing patches are read from and written to
+			output_conversion: Optional OutputConversionConfig controlling single-call vs map-reduce conversion to output models
+			checkpoint_store: Optional CheckpointStore; when set, the run state is saved after every step so a failed
+				or interrupted run can be continued with :py:meth:`resume`
+			fuse_form_fills: Opt-in: fill runs of consecutive input/select steps whose fields are all on the page in
+				one in-page operation. The values are assigned by script with untrusted events, fields that cannot be
+				resolved or do not keep their value make the run fall back to per-step execution
 
 		Raises:
 			ValueError: If the workflow schema is invalid (though Pydantic handles most).
@@ -75,16 +118,43 @@ class Workflow:
 
 		self.controller = controller or WorkflowController()
 
-		self.browser = browser or Browser()
-
-		# Hack to not close it after agent kicks in
-		self.browser.browser_profile.keep_alive = True
+		# With a pool every run leases its browser, an own Browser is only created when one is needed (see _own_browser)
+		self.browser: Browser | None = browser
+		self.browser_pool = browser_pool
+		if self.browser is not None:
+			# Hack to not close it after agent kicks in
+			self.browser.browser_profile.keep_alive = True
+		elif self.browser_pool is None:
+			self._own_browser()
 
 		self.llm = llm
 		self.page_extraction_llm = page_extraction_llm
 
 		self.fallback_to_agent = fallback_to_agent
 
+		self.readiness = readiness or ReadinessEngine()
+		self._readiness_saved_ms = 0.0
+
+		self.output_conversion = output_conversion or OutputConversionConfig()
+
+		# Aborts images, fonts, trackers... declared in the schema while deterministic steps run
+		self.resource_blocker = ResourceBlocker()
+
+		self.checkpoint_store = checkpoint_store
+		self.run_id: str | None = None
+
+		self.fuse_form_fills = fuse_form_fills
+
+		self.self_heal = self_heal
+		self.patch_store = patch_store or PatchStore()
+		if self.self_heal == 'apply':
+			self._apply_stored_patches()
+
+		# Templates, fallback selectors and action models are prepared once instead of on every step
+		self._plan = compile_steps(
+			self.steps, lambda action_name: self.controller.registry.create_action_model(include_actions=[action_name])
+		)
+
 		self.context: dict[str, Any] = {}
 
 		self.inputs_def: List[WorkflowInputSchemaDefinition] = self.schema.input_schema
@@ -100,6 +170,10 @@ class Workflow:
 		browser: Browser | None = None,
 		llm: BaseChatModel | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
+		browser_pool: BrowserPool | None = None,
+		self_heal: SelfHealMode = 'off',
+		checkpoint_store: CheckpointStore | None = None,
+		fuse_form_fills: bool = False,
 	) -> Workflow:
 		"""Load a workflow from a file."""
 		with open(file_path, 'r', encoding='utf-8') as f:
@@ -111,51 +185,226 @@ class Workflow:
 			browser=browser,
 			llm=llm,
 			page_extraction_llm=page_extraction_llm,
+			browser_pool=browser_pool,
+			self_heal=self_heal,
+			checkpoint_store=checkpoint_store,
+			fuse_form_fills=fuse_form_fills,
+		)
+
+	# --- Self-healing ---
+	def _apply_stored_patches(self) -> None:
+		try:
+			patches = self.patch_store.load(self.name, self.version).patches
+		except Exception as e:
+			logger.warning(f'Could not load self-healing patches for {self.name}: {e}')
+			return
+		self.steps, applied = apply_patches(self.steps, patches)
+		if applied:
+			logger.info(f'Applied {applied} self-healing patch(es) to workflow {self.name}')
+
+	def _record_patch(self, step_index: int, history: AgentHistoryList) -> None:
+		"""Store the agent fallback for *step_index* as a patch replacing the step with deterministic steps."""
+		if self.self_heal == 'off':
+			return
+		original_step = self.steps[step_index]
+		if original_step.output:
+			# The agent's result was stored under the step's output key, replayed actions would lose it
+			return
+
+		# Map concrete input values back to their placeholders so the patch works for every input set
+		placeholders = {
+			str(value): f'{{{key}}}'
+			for key, value in self.context.items()
+			if isinstance(value, (str, int, float)) and not isinstance(value, bool) and str(value)
+		}
+		try:
+			replacement_steps = steps_from_agent_history(history, original_step, placeholders)
+			if replacement_steps is None:
+				logger.info(f'Agent fallback for step {step_index + 1} cannot be replayed deterministically, no patch created')
+				return
+			patch = StepPatch(
+				step_index=step_index,
+				original_step=original_step,
+				replacement_steps=replacement_steps,
+				agent_steps=history.number_of_steps(),
+			)
+			path = self.patch_store.add(self.name, self.version, patch)
+		except Exception as e:
+			logger.warning(f'Could not create self-healing patch for step {step_index + 1}: {e}')
+			return
+
+		when = 'on the next run' if self.self_heal == 'apply' else 'after review (cli.py apply-patches)'
+		logger.info(
+			f'Self-healing: step {step_index + 1} can be replaced by {len(replacement_steps)} deterministic step(s), '
+			f'patch stored in {path} and applied {when}'
 		)
 
 	# --- Runners ---
-	async def _run_deterministic_step(self, step: DeterministicWorkflowStep, step_index: int) -> ActionResult:
+	def _step_context(self, step_index: int) -> StepContext:
+		return StepContext(
+			workflow_name=self.name,
+			workflow_version=self.version,
+			step_index=step_index,
+			selector_candidates=self._plan[step_index].selector_candidates,
+		)
+
+	def _resolve_step(self, step_index: int) -> WorkflowStep:
+		"""Fill the placeholders of step *step_index* from the current context using the compiled plan."""
+		return self._plan[step_index].resolve(self.context, self._resolve_placeholders)
+
+	def _uses_resource_blocking(self) -> bool:
+		settings: list[ResourceBlocking | None] = [self.schema.resource_blocking]
+		settings.extend(step.resource_blocking for step in self.steps if not isinstance(step, AgenticWorkflowStep))
+		return any(resolve_profile(setting) is not None for setting in settings)
+
+	def _blocking_profile_for(self, step: WorkflowStep) -> ResourceBlockingProfile | None:
+		# Agents look at screenshots and may need any resource, they always see the full page
+		if isinstance(step, AgenticWorkflowStep):
+			return None
+		if step.resource_blocking is not None:
+			return resolve_profile(step.resource_blocking)
+		return resolve_profile(self.schema.resource_blocking)
+
+	def _own_browser(self) -> Browser:
+		"""The browser used by runs without a pool and by run_step, created on first use when a pool was given."""
+		if self.browser is None:
+			self.browser = Browser()
+			self.browser.browser_profile.keep_alive = True
+		return self.browser
+
+	async def _attach_resource_blocker(self, browser: Browser) -> None:
+		if not self._uses_resource_blocking():
+			return
+		try:
+			await self.resource_blocker.attach(browser.browser_context)
+		except Exception as e:
+			logger.warning(f'Could not enable resource blocking, loading every resource: {e}')
+
+	async def _run_deterministic_step(self, browser: Browser, step: DeterministicWorkflowStep, step_index: int) -> ActionResult:
 		"""Execute a deterministic (controller) action based on step dictionary."""
-		# Assumes WorkflowStep for deterministic type has 'action' and 'params' keys
-		action_name: str = step.type  # Expect 'action' key for deterministic steps
-		params: Dict[str, Any] = step.model_dump()  # Use params if present
+		action_name: str = step.type
+		# Cached action model, steps without placeholders even reuse the same action instance
+		action_model = self._plan[step_index].action(step)
 
-		ActionModel = self.controller.registry.create_action_model(include_actions=[action_name])
-		# Pass the params dictionary directly
-		action_model = ActionModel(**{action_name: params})
+		# Track requests fired by the action so the readiness wait can see them
+		self.readiness.track(await browser.get_current_page())
 
 		try:
-			result = await self.controller.act(action_model, self.browser, page_extraction_llm=self.page_extraction_llm)
+			with trace_span(f'action {action_name}', 'action'):
+				result = await self.controller.act(
+					action_model,
+					browser,
+					page_extraction_llm=self.page_extraction_llm,
+					context=self._step_context(step_index),
+				)
 		except Exception as e:
 			raise RuntimeError(f"Deterministic action '{action_name}' failed: {str(e)}")
 
-		# Helper function to truncate long selectors in logs
-		def truncate_selector(selector: str) -> str:
-			return selector if len(selector) <= 45 else f'{selector[:45]}...'
+		await self._settle_after_step(browser, step_index, action_name)
+		return result
+
+	async def _settle_after_step(self, browser: Browser, step_index: int, action_name: str) -> None:
+		"""Wait for the page to settle after step *step_index* and for the next step's element to show up."""
+		# Wait only as long as the page actually needs to settle after this kind of action
+		ready_start = time.perf_counter()
+		page = await browser.get_current_page()
+		report = await self.readiness.settle(page, action_name)
+		if report.timed_out:
+			logger.debug(f'Readiness wait after {action_name} timed out: {report}')
 
 		# Determine if this is not the last step, and extract next step's cssSelector if available
 		current_index = step_index
+		css_selector = None
 		if current_index < len(self.steps) - 1:
-			next_step = self.steps[current_index + 1]
-			next_step_resolved = self._resolve_placeholders(next_step)
+			next_step_resolved = self._resolve_step(current_index + 1)
 			css_selector = getattr(next_step_resolved, 'cssSelector', None)
 			if css_selector:
 				try:
-					await self.browser._wait_for_stable_network()
-					page = await self.browser.get_current_page()
-
 					logger.info(f'Waiting for element with selector: {truncate_selector(css_selector)}')
-					locator, selector_used = await get_best_element_handle(
-						page, css_selector, next_step_resolved, timeout_ms=WAIT_FOR_ELEMENT_TIMEOUT
-					)
+					with trace_span('look-ahead', 'wait', selector=css_selector):
+						locator, selector_used = await get_best_element_handle(
+							page,
+							css_selector,
+							next_step_resolved,
+							timeout_ms=WAIT_FOR_ELEMENT_TIMEOUT,
+							cache=getattr(self.controller, 'selector_cache', None),
+							step_context=self._step_context(current_index + 1),
+						)
 					logger.info(f'Element with selector found: {truncate_selector(selector_used)}')
 				except Exception as e:
 					logger.error(f'Failed to wait for element with selector: {truncate_selector(css_selector)}. Error: {e}')
 					raise Exception(f'Failed to wait for element. Selector: {css_selector}') from e
 
-		return result
+		waited_ms = (time.perf_counter() - ready_start) * 1000
+		legacy_ms = legacy_wait_estimate_ms(action_name, has_lookahead=bool(css_selector))
+		saved_ms = max(legacy_ms - waited_ms, 0)
+		self._readiness_saved_ms += saved_ms
+		logger.info(f'Step {step_index + 1} ready after {waited_ms:.0f}ms (fixed waits: ~{legacy_ms}ms, saved ~{saved_ms:.0f}ms)')
+
+	async def _run_fused_fill(self, browser: Browser, group: range) -> List[tuple[WorkflowStep, ActionResult]] | None:
+		"""Fill a run of input/select steps (and the Tab presses between them) in one in-page operation.
+
+		Returns:
+			The resolved steps with their results, or ``None`` when the steps have to run one by one: a field could
+			not be resolved (nothing was changed on the page) or a field did not keep its value after the fill.
+		"""
+		steps = [self._resolve_step(step_index) for step_index in group]
+		fields = []
+		for step_index, step in zip(group, steps):
+			# Fill groups only hold input, select and Tab key press steps (see find_fill_groups)
+			assert isinstance(step, (InputStep, SelectChangeStep, KeyPressStep))
+			candidates = self._plan[step_index].selector_candidates
+			if not candidates or candidates[0] != step.cssSelector:
+				candidates = build_selector_candidates(step.cssSelector, step)
+			if isinstance(step, InputStep):
+				fields.append({'kind': 'input', 'candidates': candidates, 'value': step.value})
+			elif isinstance(step, SelectChangeStep):
+				fields.append({'kind': 'select', 'candidates': candidates, 'value': step.selectedText})
+			else:
+				fields.append({'kind': 'focus', 'candidates': candidates})
+
+		self.resource_blocker.set_profile(self._blocking_profile_for(steps[0]))
+		page = await browser.get_current_page()
+		self.readiness.track(page)
+		label = f'steps {group.start + 1}-{group.stop}'
+		try:
+			with trace_span(f'{label} (fused fill)', 'step', fused_steps=len(group)) as span:
+				outcome = await fill_fields(page, fields)
+				if not outcome['ok']:
+					span.set(fused_steps=0, failed_step=group.start + outcome['failed'] + 1, reason=outcome['reason'])
+		except Exception as e:
+			logger.warning(f'Fused fill of {label} failed, running them one by one: {e}')
+			return None
+		if not outcome['ok']:
+			logger.info(
+				f'Step {group.start + outcome["failed"] + 1} cannot be filled in a fused fill ({outcome["reason"]}), '
+				f'running {label} one by one'
+			)
+			return None
+		if outcome['mismatched']:
+			# E.g. masked or isTrusted-checking fields, filling them again one by one overwrites the fused values
+			failed_steps = ', '.join(str(group.start + offset + 1) for offset in outcome['mismatched'])
+			logger.warning(f'Fields of step(s) {failed_steps} did not keep their fused value, running {label} one by one')
+			return None
+
+		fused: List[tuple[WorkflowStep, ActionResult]] = []
+		for offset, (step, selector) in enumerate(zip(steps, outcome['selectors'])):
+			if isinstance(step, InputStep):
+				if offset in outcome['ignored']:
+					msg = 'Ignored input into select element'
+				else:
+					msg = f'⌨️  Input "{step.value}" into element with CSS selector: {truncate_selector(selector)} (fused fill)'
+			elif isinstance(step, SelectChangeStep):
+				msg = f'Selected option "{step.selectedText}" in dropdown {truncate_selector(selector)} (fused fill)'
+			else:
+				msg = f'🔑  Moved focus to {truncate_selector(selector)} instead of pressing Tab (fused fill)'
+			fused.append((step, ActionResult(extracted_content=msg, include_in_memory=True)))
+		logger.info(f'Filled {label} in one fused operation')
 
-	async def _run_agent_step(self, step: AgenticWorkflowStep) -> AgentHistoryList:
+		await self._settle_after_step(browser, group.stop - 1, steps[-1].type)
+		return fused
+
+	async def _run_agent_step(self, browser: Browser, step: AgenticWorkflowStep) -> AgentHistoryList:
 		"""Spin-up an Agent based on step dictionary."""
 		if self.llm is None:
 			raise ValueError("An 'llm' instance must be supplied for agent-based steps")
@@ -166,13 +415,40 @@ class Workflow:
 		agent = Agent(
 			task=task,
 			llm=self.llm,
-			browser_session=self.browser,
+			browser_session=browser,
 			use_vision=True,  # Consider making this configurable via WorkflowStep schema
 		)
-		return await agent.run(max_steps=max_steps)
+		# One span per agent step, opened and closed by the agent's step hooks
+		step_spans = ExitStack()
+		step_span: Any = None
+
+		async def on_step_start(agent: Agent) -> None:
+			nonlocal step_span
+			step_spans.close()  # A step that raised never reached on_step_end
+			step_number = agent.state.n_steps
+			step_span = step_spans.enter_context(trace_span(f'agent step {step_number}', 'agent', step=step_number))
+
+		async def on_step_end(agent: Agent) -> None:
+			last = agent.state.history.history[-1] if agent.state.history.history else None
+			if last is not None and step_span is not None:
+				step_span.set(
+					actions=len(last.model_output.action) if last.model_output else 0,
+					errors=sum(1 for result in last.result if result.error),
+					url=last.state.url,
+				)
+			step_spans.close()
+
+		with trace_span('agent', 'agent', task=task[:200], max_steps=max_steps) as span:
+			try:
+				history = await agent.run(max_steps=max_steps, on_step_start=on_step_start, on_step_end=on_step_end)
+			finally:
+				step_spans.close()
+			span.set(agent_steps=history.number_of_steps(), success=history.is_successful())
+		return history
 
 	async def _fallback_to_agent(
 		self,
+		browser: Browser,
 		step_resolved: WorkflowStep,
 		step_index: int,
 		error: Exception | str | None = None,
@@ -244,7 +520,9 @@ class Workflow:
 			description='Fallback agent to handle step failure',
 		)
 
-		return await self._run_agent_step(agent_step_config)
+		self.resource_blocker.set_profile(None)
+		with trace_span('agent fallback', 'agent', step=step_index + 1, error=error_msg[:200]):
+			return await self._run_agent_step(browser, agent_step_config)
 
 	def _validate_inputs(self, inputs: dict[str, Any]) -> None:
 		"""Validate provided inputs against the workflow's input schema definition."""
@@ -357,10 +635,13 @@ class Workflow:
 
 		self.context[output_key] = value
 
-	async def _execute_step(self, step_index: int, step_resolved: WorkflowStep) -> ActionResult | AgentHistoryList:
+	async def _execute_step(
+		self, browser: Browser, step_index: int, step_resolved: WorkflowStep
+	) -> ActionResult | AgentHistoryList:
 		"""Execute the resolved step dictionary, handling type branching and fallback."""
 		# Use 'type' field from the WorkflowStep dictionary
 		result: ActionResult | AgentHistoryList
+		self.resource_blocker.set_profile(self._blocking_profile_for(step_resolved))
 
 		if isinstance(step_resolved, DeterministicWorkflowStep):
 			from browser_use.agent.views import ActionResult  # Local import ok
@@ -369,7 +650,7 @@ class Workflow:
 				# Use action key from step dictionary
 				action_name = step_resolved.type or '[No action specified]'
 				logger.info(f'Attempting deterministic action: {action_name}')
-				result = await self._run_deterministic_step(step_resolved, step_index)
+				result = await self._run_deterministic_step(browser, step_resolved, step_index)
 				if isinstance(result, ActionResult) and result.error:
 					logger.warning(f'Deterministic action reported error: {result.error}')
 					raise ValueError(f'Deterministic action {action_name} failed: {result.error}')
@@ -381,9 +662,10 @@ class Workflow:
 				if self.llm is None:
 					raise ValueError('Cannot fall back to agent: LLM instance required.')
 				if self.fallback_to_agent:
-					result = await self._fallback_to_agent(step_resolved, step_index, e)
+					result = await self._fallback_to_agent(browser, step_resolved, step_index, e)
 					if not result.is_successful():
 						raise ValueError(f'Deterministic step {step_index + 1} ({action_name}) failed even after fallback')
+					self._record_patch(step_index, result)
 				else:
 					raise ValueError(f'Deterministic step {step_index + 1} ({action_name}) failed: {e}')
 		elif isinstance(step_resolved, AgenticWorkflowStep):
@@ -391,7 +673,7 @@ class Workflow:
 			task_description = step_resolved.task
 			logger.info(f'Running agent task: {task_description}')
 			try:
-				result = await self._run_agent_step(step_resolved)
+				result = await self._run_agent_step(browser, step_resolved)
 				if not result.is_successful():
 					logger.warning(f'Agent step {step_index + 1} failed evaluation.')
 					raise ValueError(f'Agent step {step_index + 1} failed evaluation.')
@@ -400,7 +682,7 @@ class Workflow:
 					logger.warning(f'Agent step {step_index + 1} failed: {e}. Attempting fallback with agent.')
 					if self.llm is None:
 						raise ValueError('Cannot fall back to agent: LLM instance required.')
-					result = await self._fallback_to_agent(step_resolved, step_index, e)
+					result = await self._fallback_to_agent(browser, step_resolved, step_index, e)
 					if not result.is_successful():
 						raise ValueError(f'Agent step {step_index + 1} failed even after fallback')
 				else:
@@ -452,16 +734,68 @@ class Workflow:
 		# Combine all extracted contents
 		combined_text = '\n\n'.join(extracted_contents)
 
+		config = self.output_conversion
+		if config.mode != 'single':
+			tokens = count_tokens(combined_text, self.llm)
+			if config.mode == 'map_reduce' or tokens > config.max_tokens_per_chunk:
+				chunks = split_into_chunks(combined_text, config.max_tokens_per_chunk, tokens)
+				if len(chunks) > 1:
+					logger.info(f'Converting {tokens} tokens of extracted content in {len(chunks)} chunks (map-reduce)')
+					return await self._map_reduce_output_model(chunks, output_model)
+
 		messages: list[BaseMessage] = [
 			AIMessage(content=STRUCTURED_OUTPUT_PROMPT),
 			HumanMessage(content=combined_text),
 		]
 
 		chain = self.llm.with_structured_output(output_model)
-		chain_result: T = await chain.ainvoke(messages)  # type: ignore
+		with trace_span('structured output', 'llm', output_model=output_model.__name__):
+			chain_result: T = await chain.ainvoke(messages)  # type: ignore
 
 		return chain_result
 
+	async def _map_reduce_output_model(self, chunks: List[str], output_model: type[T]) -> T:
+		"""Convert every chunk to a partial output model concurrently, then merge the partials.
+
+		List fields are concatenated, nested objects merged field by field and scalar fields
+		reconciled by majority vote (see reduce_json_values). If the merged data does not
+		validate against *output_model*, one final LLM call turns it into a valid instance.
+		"""
+		assert self.llm is not None
+		# A chunk rarely contains every required field, so the map step uses an all-optional copy of the model
+		partial_model = create_model(
+			f'{output_model.__name__}Partial',
+			**{
+				name: (Optional[field.annotation], Field(default=None, description=field.description))  # type: ignore[valid-type]
+				for name, field in output_model.model_fields.items()
+			},
+		)
+		partial_chain = self.llm.with_structured_output(partial_model)
+		semaphore = asyncio.Semaphore(self.output_conversion.max_concurrency)
+
+		async def convert_chunk(chunk: str) -> dict[str, Any]:
+			async with semaphore:
+				with trace_span('structured output chunk', 'llm', chars=len(chunk)):
+					partial = await partial_chain.ainvoke(
+						[AIMessage(content=STRUCTURED_OUTPUT_PROMPT), HumanMessage(content=chunk)]
+					)
+			return partial.model_dump(mode='json') if isinstance(partial, BaseModel) else dict(partial)  # type: ignore[arg-type]
+
+		partials = await asyncio.gather(*(convert_chunk(chunk) for chunk in chunks))
+		merged = reduce_json_values(list(partials))
+
+		try:
+			return output_model.model_validate(merged)
+		except ValidationError as e:
+			logger.info(f'Merged partial outputs do not validate ({e.error_count()} errors), reconciling with one more call')
+			chain = self.llm.with_structured_output(output_model)
+			messages: list[BaseMessage] = [
+				AIMessage(content=STRUCTURED_OUTPUT_PROMPT),
+				HumanMessage(content=json.dumps(merged, ensure_ascii=False)),
+			]
+			with trace_span('structured output reconcile', 'llm'):
+				return await chain.ainvoke(messages)  # type: ignore
+
 	async def run_step(self, step_index: int, inputs: dict[str, Any] | None = None):
 		"""Run a *single* workflow step asynchronously and return its result.
 
@@ -488,13 +822,17 @@ class Workflow:
 			else:
 				self.context.update(runtime_inputs)
 
-		async with self.browser:
+		browser = self._own_browser()
+		async with browser:
+			await self._attach_resource_blocker(browser)
 			raw_step_cfg = self.steps[step_index]
-			step_resolved = self._resolve_placeholders(raw_step_cfg)
-			result = await self._execute_step(step_index, step_resolved)
+			step_resolved = self._resolve_step(step_index)
+			with trace_span(f'step {step_index + 1} ({raw_step_cfg.type})', 'step'):
+				result = await self._execute_step(browser, step_index, step_resolved)
 			# Persist outputs (if declared) for future steps
 			self._store_output(step_resolved, result)
-			await asyncio.sleep(5)  # Keep browser open for 5 seconds
+			# Let the effects of the step land before the browser context is left
+			await self.readiness.settle(await browser.get_current_page(), step_resolved.type)
 		# Each invocation opens a new browser context – we close the browser to
 		# release resources right away.  This keeps the single-step API
 		# self-contained.
@@ -507,6 +845,7 @@ class Workflow:
 		close_browser_at_end: bool = True,
 		cancel_event: asyncio.Event | None = None,
 		output_model: type[T] | None = None,
+		trace_path: str | Path | None = None,
 	) -> WorkflowRunOutput[T]:
 		"""Execute the workflow asynchronously using step dictionaries.
 
@@ -514,13 +853,116 @@ class Workflow:
 
 		Args:
 			inputs: Optional dictionary of workflow inputs
-			close_browser_at_end: Whether to close the browser when done
+			close_browser_at_end: Whether to close the browser when done (ignored when running on a browser_pool,
+				leased browsers are always returned to the pool)
 			cancel_event: Optional event to signal cancellation
 			output_model: Optional Pydantic model class to convert results to
+			trace_path: Optional path; when set, timing spans of the run are written there as Chrome trace-event JSON
 
 		Returns:
 			Either WorkflowRunOutput containing all step results or an instance of output_model if provided
 		"""
+		return await self._run_with_browser(inputs, close_browser_at_end, cancel_event, output_model, None, trace_path)
+
+	async def resume(
+		self,
+		run_id: str,
+		close_browser_at_end: bool = True,
+		cancel_event: asyncio.Event | None = None,
+		output_model: type[T] | None = None,
+		trace_path: str | Path | None = None,
+	) -> WorkflowRunOutput[T]:
+		"""Continue a checkpointed run from its first incomplete step.
+
+		Restores the run's inputs, context, step results, cookies and localStorage, reopens the
+		page the run was on and executes the remaining steps.
+
+		Args:
+			run_id: Id of the run to resume (logged when the run started, also in ``WorkflowRunOutput.run_id``)
+			close_browser_at_end: Whether to close the browser when done
+			cancel_event: Optional event to signal cancellation
+			output_model: Optional Pydantic model class to convert results to
+			trace_path: Optional path the Chrome trace-event JSON of the resumed run is written to
+
+		Raises:
+			ValueError: If no checkpoint store is configured or the checkpoint does not belong to this workflow
+		"""
+		if self.checkpoint_store is None:
+			raise ValueError('Cannot resume: the workflow has no checkpoint_store')
+		checkpoint = self.checkpoint_store.load(run_id)
+		if checkpoint.status == 'completed':
+			raise ValueError(f'Run {run_id} already completed')
+		if checkpoint.workflow_name != self.name or checkpoint.steps_fingerprint != steps_fingerprint(self.steps):
+			raise ValueError(f'Run {run_id} was started with different workflow steps, it cannot be resumed')
+
+		logger.info(f'Resuming run {run_id} at step {checkpoint.next_step_index + 1}/{len(self.steps)}')
+		return await self._run_with_browser(
+			checkpoint.inputs, close_browser_at_end, cancel_event, output_model, checkpoint, trace_path
+		)
+
+	async def _run_with_browser(
+		self,
+		inputs: dict[str, Any] | None,
+		close_browser_at_end: bool,
+		cancel_event: asyncio.Event | None,
+		output_model: type[T] | None,
+		checkpoint: RunCheckpoint | None,
+		trace_path: str | Path | None = None,
+	) -> WorkflowRunOutput[T]:
+		if trace_path is None:
+			return await self._lease_and_run(inputs, close_browser_at_end, cancel_event, output_model, checkpoint)
+
+		tracer = Tracer(self.name)
+		with use_tracer(tracer):
+			try:
+				with tracer.span(f'run {self.name}', 'run', resumed=checkpoint is not None):
+					return await self._lease_and_run(inputs, close_browser_at_end, cancel_event, output_model, checkpoint)
+			finally:
+				tracer.export(trace_path)
+
+	async def _lease_and_run(
+		self,
+		inputs: dict[str, Any] | None,
+		close_browser_at_end: bool,
+		cancel_event: asyncio.Event | None,
+		output_model: type[T] | None,
+		checkpoint: RunCheckpoint | None,
+	) -> WorkflowRunOutput[T]:
+		if self.browser_pool is not None:
+			# The leased browser is passed down instead of stored, concurrent runs must not see each other's browser
+			async with self.browser_pool.lease() as leased_browser:
+				return await self._run(leased_browser, inputs, False, cancel_event, output_model, checkpoint)
+
+		return await self._run(self._own_browser(), inputs, close_browser_at_end, cancel_event, output_model, checkpoint)
+
+	async def _save_checkpoint(
+		self,
+		browser: Browser,
+		checkpoint: RunCheckpoint,
+		next_step_index: int,
+		results: List[ActionResult | AgentHistoryList],
+	) -> None:
+		assert self.checkpoint_store is not None
+		checkpoint.next_step_index = next_step_index
+		checkpoint.context = json.loads(json.dumps(self.context, default=str))
+		checkpoint.step_results = [serialize_step_result(result) for result in results]
+		with trace_span('checkpoint', 'checkpoint', next_step=next_step_index + 1):
+			checkpoint.storage_state, checkpoint.current_url = await capture_browser_state(browser)
+			try:
+				await asyncio.to_thread(self.checkpoint_store.save, checkpoint)
+			except Exception as e:
+				logger.warning(f'Could not save checkpoint of run {checkpoint.run_id}: {e}')
+
+	async def _run(
+		self,
+		browser: Browser,
+		inputs: dict[str, Any] | None,
+		close_browser_at_end: bool,
+		cancel_event: asyncio.Event | None,
+		output_model: type[T] | None,
+		resume_from: RunCheckpoint | None = None,
+	) -> WorkflowRunOutput[T]:
+		"""Execute all steps on *browser*, starting after *resume_from*'s last completed step."""
 		runtime_inputs = inputs or {}
 		# 1. Validate inputs against definition
 		self._validate_inputs(runtime_inputs)
@@ -528,44 +970,115 @@ class Workflow:
 		self.context = runtime_inputs.copy()  # Start with a fresh context
 
 		results: List[ActionResult | AgentHistoryList] = []
-
-		await self.browser.start()
+		self._readiness_saved_ms = 0.0
+		self.resource_blocker.stats = ResourceBlockingStats()
+
+		start_index = 0
+		checkpoint: RunCheckpoint | None = None
+		if resume_from is not None:
+			checkpoint = resume_from
+			start_index = checkpoint.next_step_index
+			self.context = dict(checkpoint.context)
+			results = restore_step_results(checkpoint.step_results)
+			checkpoint.status, checkpoint.error = 'running', None
+		elif self.checkpoint_store is not None:
+			checkpoint = RunCheckpoint(
+				run_id=uuid.uuid4().hex[:12],
+				workflow_name=self.name,
+				workflow_version=self.version,
+				steps_fingerprint=steps_fingerprint(self.steps),
+				inputs=json.loads(json.dumps(runtime_inputs, default=str)),
+				context=json.loads(json.dumps(self.context, default=str)),
+			)
+			logger.info(f'Checkpointing run {checkpoint.run_id}, continue it after a failure with resume({checkpoint.run_id!r})')
+		self.run_id = checkpoint.run_id if checkpoint is not None else None
+
+		await browser.start()
 		try:
+			if resume_from is not None:
+				await restore_browser_state(browser, resume_from.storage_state, resume_from.current_url)
+			await self._attach_resource_blocker(browser)
+
 			for step_index, step_dict in enumerate(self.steps):  # self.steps now holds dictionaries
-				await asyncio.sleep(0.1)
-				await self.browser._wait_for_stable_network()
+				if step_index < start_index:
+					continue
+
+				# Deterministic steps settle themselves, agent results (including fallbacks) still need to
+				if results and isinstance(results[-1], AgentHistoryList):
+					await self.readiness.settle(await browser.get_current_page(), 'agent')
 
 				# Check if cancellation was requested
 				if cancel_event and cancel_event.is_set():
 					logger.info('Cancellation requested - stopping workflow execution')
 					break
 
+				# Runs of input/select steps whose fields are all on the page are filled in one round trip
+				group = self._plan.fill_groups.get(step_index) if self.fuse_form_fills else None
+				if group is not None:
+					fused = await self._run_fused_fill(browser, group)
+					if fused is not None:
+						for step_resolved, result in fused:
+							results.append(result)
+							self._store_output(step_resolved, result)
+						start_index = group.stop
+						if checkpoint is not None:
+							await self._save_checkpoint(browser, checkpoint, group.stop, results)
+						continue
+
 				# Use description from the step dictionary
 				step_description = step_dict.description or 'No description provided'
 				logger.info(f'--- Running Step {step_index + 1}/{len(self.steps)} -- {step_description} ---')
-				# Resolve placeholders using the current context (works on the dictionary)
-				step_resolved = self._resolve_placeholders(step_dict)
+				# Resolve placeholders using the current context
+				step_resolved = self._resolve_step(step_index)
 
 				# Execute step using the unified _execute_step method
-				result = await self._execute_step(step_index, step_resolved)
+				with trace_span(f'step {step_index + 1} ({step_dict.type})', 'step', description=step_description):
+					result = await self._execute_step(browser, step_index, step_resolved)
 
 				results.append(result)
 				# Persist outputs using the resolved step dictionary
 				self._store_output(step_resolved, result)
+				if checkpoint is not None:
+					await self._save_checkpoint(browser, checkpoint, step_index + 1, results)
 				logger.info(f'--- Finished Step {step_index + 1} ---\n')
 
+			logger.info(f'Readiness engine saved ~{self._readiness_saved_ms / 1000:.1f}s of fixed waits in this run')
+			blocking_stats = self.resource_blocker.stats
+			if blocking_stats.blocked_requests:
+				logger.info(
+					f'Resource blocking aborted {blocking_stats.blocked_requests} of '
+					f'{blocking_stats.blocked_requests + blocking_stats.allowed_requests} requests '
+					f'(~{blocking_stats.estimated_blocked_bytes / 1_000_000:.1f}MB): {blocking_stats.blocked_by_type}'
+				)
+
 			# Convert results to output model if requested
 			output_model_result: T | None = None
 			if output_model:
 				output_model_result = await self._convert_results_to_output_model(results, output_model)
 
+			if checkpoint is not None and checkpoint.next_step_index >= len(self.steps):
+				checkpoint.status = 'completed'
+				await asyncio.to_thread(self.checkpoint_store.save, checkpoint)  # type: ignore[union-attr]
+
+		except Exception as e:
+			if checkpoint is not None:
+				checkpoint.status, checkpoint.error = 'failed', str(e)
+				try:
+					await asyncio.to_thread(self.checkpoint_store.save, checkpoint)  # type: ignore[union-attr]
+				except Exception as save_error:
+					logger.warning(f'Could not save checkpoint of run {checkpoint.run_id}: {save_error}')
+				logger.error(
+					f'Run {checkpoint.run_id} failed at step {checkpoint.next_step_index + 1}, resume it with resume({checkpoint.run_id!r})'
+				)
+			raise
 		finally:
+			await self.resource_blocker.detach()
 			# Clean-up browser after finishing workflow
 			if close_browser_at_end:
-				self.browser.browser_profile.keep_alive = False
-				await self.browser.close()
+				browser.browser_profile.keep_alive = False
+				await browser.close()
 
-		return WorkflowRunOutput(step_results=results, output_model=output_model_result)
+		return WorkflowRunOutput(step_results=results, output_model=output_model_result, run_id=self.run_id)
 
 	# ------------------------------------------------------------------
 	# LangChain tool wrapper
@@ -0,0 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import cast
+
+from workflow_use.pool.service import BrowserPool
+from workflow_use.schema.views import WorkflowDefinitionSchema
+from workflow_use.workflow.service import Workflow
+
+
+class _FakePool:
+	def __init__(self):
+		self.leased = 0
+
+	@asynccontextmanager
+	async def lease(self):
+		self.leased += 1
+		yield f'browser {self.leased}'
+
+
+def test_concurrent_pooled_runs_use_their_own_leased_browser(monkeypatch):
+	schema = WorkflowDefinitionSchema.model_validate(
+		{
+			'name': 'w',
+			'description': '',
+			'version': '1',
+			'input_schema': [],
+			'steps': [{'type': 'navigation', 'url': 'https://x'}],
+		}
+	)
+	workflow = Workflow(schema, browser_pool=cast(BrowserPool, _FakePool()))
+	used = []
+
+	async def fake_run(browser, inputs, close_browser_at_end, cancel_event, output_model, resume_from=None):
+		used.append(browser)
+		await asyncio.sleep(0.01)
+		used.append(browser)
+
+	monkeypatch.setattr(workflow, '_run', fake_run)
+
+	async def run_twice():
+		await asyncio.gather(workflow.run(), workflow.run())
+
+	asyncio.run(run_twice())
+
+	assert workflow.browser is None
+	assert used == ['browser 1', 'browser 2', 'browser 1', 'browser 2']
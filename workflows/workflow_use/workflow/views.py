@@ -1,4 +1,4 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
 
 from browser_use.agent.views import ActionResult, AgentHistoryList
 from pydantic import BaseModel, Field
@@ -11,6 +11,7 @@ class WorkflowRunOutput(BaseModel, Generic[T]):
 
 	step_results: List[ActionResult | AgentHistoryList]
 	output_model: Optional[T] = None
+	run_id: Optional[str] = None
 
 
 class StructuredWorkflowOutput(BaseModel):
@@ -25,3 +26,15 @@ class StructuredWorkflowOutput(BaseModel):
 	status: str = Field(default='success', description='Overall status of the workflow execution')
 
 	error_message: Optional[str] = Field(default=None, description='Error message if the workflow failed')
+
+
+class OutputConversionConfig(BaseModel):
+	"""How Workflow converts the extracted content of a run into an output model."""
+
+	mode: Literal['auto', 'single', 'map_reduce'] = Field(
+		default='auto',
+		description="'single' sends all content in one call, 'map_reduce' converts chunks concurrently and merges them, "
+		"'auto' uses map_reduce only when the content exceeds max_tokens_per_chunk",
+	)
+	max_tokens_per_chunk: int = Field(default=24000, description='Token budget of a single conversion call')
+	max_concurrency: int = Field(default=4, description='How many chunks are converted in parallel')